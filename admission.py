@@ -0,0 +1,130 @@
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable, Optional
+
+from celery_worker import queue_keys, COMPLETED_COUNTER_KEY, LANES, TASK_PRIORITIES
+from metrics import ADMISSION_ESTIMATED_WAIT, ADMISSION_REJECTIONS
+
+class AdmissionRejected(Exception):
+    """Raised When The Estimated Queue Wait For a Submission Exceeds Its Priority Threshold."""
+
+    def __init__(self, lane: str, priority: str, estimated_wait: float, retry_after: int):
+        super().__init__(f"Estimated Wait of {estimated_wait:.1f}s on {lane} Exceeds The {priority} Priority Threshold")
+        self.lane = lane
+        self.priority = priority
+        self.estimated_wait = estimated_wait
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Global Admission Control Based on Broker Queue Depth And Worker Throughput.
+
+    Queue depth is read from the broker lists of each lane and throughput from the
+    per-lane completion counters maintained by the workers. Both are sampled at most
+    once per `refresh_interval`, so the check adds no Redis round trip to most requests.
+    The estimated wait for a submission only counts messages at the same or a higher
+    broker priority, and low priority traffic has the lowest threshold so it is shed first.
+
+    The throughput estimate only moves while a lane has work: an idle interval says nothing
+    about how fast workers drain a backlog, so it leaves the estimate as it was. The estimate
+    is also floored at a tenth of `default_throughput`, and Retry-After at `max_retry_after`.
+    """
+
+    def __init__(self,
+                 get_redis: Callable[[], Awaitable],
+                 max_wait: dict,
+                 refresh_interval: float = 1.0,
+                 default_throughput: float = 50.0,
+                 smoothing: float = 0.3,
+                 max_retry_after: int = 300,
+                 backlog_keys: Optional[Callable[[str], list]] = None):
+        self.get_redis = get_redis
+        self.backlog_keys = backlog_keys
+        self.max_wait = max_wait
+        self.refresh_interval = refresh_interval
+        self.default_throughput = default_throughput
+        self.smoothing = smoothing
+        self.max_retry_after = max_retry_after
+
+        self.depths = {lane: {step: 0 for step in queue_keys(lane)} for lane in LANES}
+        # Messages queued ahead of the broker (tenant sub-queues), counted at every priority
+        self.pending = {lane: 0 for lane in LANES}
+        self.throughput = {lane: None for lane in LANES}
+        self._completed = {lane: None for lane in LANES}
+        self._backlog = {lane: 0 for lane in LANES}
+        self._sampled_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> None:
+        """Samples Queue Depth And Completion Counters For Every Lane in One Pipeline."""
+        redis_client = await self.get_redis()
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for lane in LANES:
+                for key in queue_keys(lane).values():
+                    pipe.llen(key)
+                pipe.get(COMPLETED_COUNTER_KEY.format(queue=lane))
+                for key in self._backlog_keys(lane):
+                    pipe.llen(key)
+            values = await pipe.execute()
+        finally:
+            await redis_client.aclose()
+
+        now = time.monotonic()
+        elapsed = now - self._sampled_at if self._sampled_at is not None else None
+        values = iter(values)
+        for lane in LANES:
+            for step in self.depths[lane]:
+                self.depths[lane][step] = int(next(values) or 0)
+
+            completed = int(next(values) or 0)
+            previous = self._completed[lane]
+            busy = completed != previous or self._backlog[lane] > 0
+            if previous is not None and elapsed and completed >= previous and busy:
+                rate = (completed - previous) / elapsed
+                current = self.throughput[lane]
+                # Exponentially weighted moving average smooths out bursty completions
+                self.throughput[lane] = rate if current is None else self.smoothing * rate + (1 - self.smoothing) * current
+            self._completed[lane] = completed
+            self.pending[lane] = sum(int(next(values) or 0) for _ in self._backlog_keys(lane))
+            self._backlog[lane] = self.pending[lane] + sum(self.depths[lane].values())
+
+            ADMISSION_ESTIMATED_WAIT.labels(lane=lane).set(self.estimated_wait(lane, "low"))
+
+        self._sampled_at = now
+
+    def estimated_wait(self, lane: str, priority: str) -> float:
+        """Estimated Seconds Before a New Message at This Priority is Picked Up on The Lane."""
+        broker_priority = TASK_PRIORITIES[priority]
+        ahead = self.pending[lane] + sum(depth for step, depth in self.depths[lane].items() if step <= broker_priority)
+        if ahead == 0:
+            return 0.0
+
+        throughput = self.throughput[lane]
+        if throughput is None:
+            # No completions observed yet (cold start)
+            throughput = self.default_throughput
+        # Stalled or barely observed workers still count as draining slowly, not never
+        return ahead / max(throughput, self.default_throughput / 10)
+
+    async def admit(self, lane: str, priority: str) -> None:
+        """Raises AdmissionRejected if The Submission Should be Shed."""
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self.refresh()
+
+        wait = self.estimated_wait(lane, priority)
+        threshold = self.max_wait[priority]
+        if wait > threshold:
+            ADMISSION_REJECTIONS.labels(lane=lane, priority=priority).inc()
+            # Assuming no new arrivals, the backlog drains below the threshold after (wait - threshold)
+            retry_after = min(self.max_retry_after, max(1, math.ceil(wait - threshold)))
+            raise AdmissionRejected(lane, priority, wait, retry_after)
+
+    def _backlog_keys(self, lane: str) -> list:
+        return self.backlog_keys(lane) if self.backlog_keys else []
+
+    def _stale(self) -> bool:
+        return self._sampled_at is None or time.monotonic() - self._sampled_at >= self.refresh_interval
@@ -0,0 +1,29 @@
+"""Policy decision columns
+
+Revision ID: a6c4e9f1b273
+Revises: f3b9c2d7e815
+Create Date: 2026-10-19 14:58:36.410529
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c4e9f1b273'
+down_revision: Union[str, None] = 'f3b9c2d7e815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """Apply the migration: Add the decision and policy columns (catalog-only; existing rows stay NULL until re-decided)."""
+    op.add_column('moderation_results', sa.Column('decision', sa.String(), nullable=True))
+    op.add_column('moderation_results', sa.Column('policy', sa.String(), nullable=True))
+
+def downgrade():
+    """Rollback the migration: Remove the decision and policy columns."""
+    op.drop_column('moderation_results', 'policy')
+    op.drop_column('moderation_results', 'decision')
@@ -0,0 +1,107 @@
+"""Native UUID key, JSONB result and typed hot columns
+
+Revision ID: c41d9e7f2a10
+Revises: b7a2e01d1748
+Create Date: 2026-10-19 10:05:12.318204
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d9e7f2a10'
+down_revision: Union[str, None] = 'b7a2e01d1748'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger("alembic.runtime.migration")
+
+UUID_PATTERN = "^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+# Rows Whose ID is Not a UUID (e.g. Health-Check "test_id" Rows) Are Moved Here, Not Converted
+ARCHIVE_TABLE = "moderation_results_non_uuid"
+
+INDEXES = (
+    ("idx_moderation_created_at", ["created_at"]),
+    ("idx_moderation_status", ["status"]),
+    ("idx_moderation_status_created_at", ["status", "created_at"]),
+)
+
+
+def upgrade():
+    """
+    Rebuilds moderation_results in one pass instead of ALTER TYPE plus a backfill UPDATE,
+    which would rewrite the table twice and leave a dead copy of every row behind.
+
+    The table is locked against writes (reads continue) from the copy until the migration
+    commits, so no result stored meanwhile is lost with the old table. Rows whose ID is not
+    a UUID cannot live in the new table: they were never issued by the API (health-check
+    and hand-written rows) and are moved to moderation_results_non_uuid with their count
+    logged. They are no longer served by the API; downgrade moves them back.
+    """
+    op.execute("LOCK TABLE moderation_results IN EXCLUSIVE MODE")
+    op.execute(f"CREATE TABLE {ARCHIVE_TABLE} AS SELECT * FROM moderation_results WHERE text_id !~ '{UUID_PATTERN}'")
+    archived = op.get_bind().execute(sa.text(f"SELECT count(*) FROM {ARCHIVE_TABLE}")).scalar()
+    if archived:
+        log.warning("Moved %d moderation_results rows with non-UUID IDs to %s", archived, ARCHIVE_TABLE)
+
+    op.execute("CREATE TYPE moderation_source_type AS ENUM ('text', 'image')")
+    op.create_table('moderation_results_new',
+    sa.Column('text_id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('max_score', sa.REAL(), nullable=True),
+    sa.Column('source_type', postgresql.ENUM(name='moderation_source_type', create_type=False), nullable=False),
+    sa.Column('flagged', sa.Boolean(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=True),
+    sa.Column('text', sa.String(), nullable=False),
+    sa.Column('result', postgresql.JSONB(), nullable=False),
+    )
+    # Images are stored with their URL as text; responses that applied a category to an
+    # image input identify the rest
+    op.execute(f"""
+        INSERT INTO moderation_results_new
+            (text_id, created_at, max_score, source_type, flagged, status, model, text, result)
+        SELECT text_id::uuid,
+               created_at,
+               (SELECT max(score.value::real) FROM jsonb_each_text(result::jsonb -> 'results' -> 0 -> 'category_scores') AS score),
+               CASE WHEN jsonb_path_exists(result::jsonb, '$.results[0].category_applied_input_types.*[*] ? (@ == "image")')
+                         OR text ~ '^https?://[^[:space:]]+$'
+                    THEN 'image' ELSE 'text' END::moderation_source_type,
+               (result::jsonb -> 'results' -> 0 ->> 'flagged')::boolean,
+               status,
+               result::jsonb ->> 'model',
+               text,
+               result::jsonb
+        FROM moderation_results
+        WHERE text_id ~ '{UUID_PATTERN}'
+        ORDER BY created_at
+    """)
+    op.drop_table('moderation_results')
+    op.rename_table('moderation_results_new', 'moderation_results')
+
+    # Indexes are built after the load; the redundant ix_moderation_results_text_id is not recreated
+    op.create_primary_key('moderation_results_pkey', 'moderation_results', ['text_id'])
+    for name, columns in INDEXES:
+        op.create_index(name, 'moderation_results', columns, unique=False)
+    op.execute("ANALYZE moderation_results")
+
+
+def downgrade():
+    """Restores The String Key, JSON Result And The Separate Index on text_id, And The Archived Non-UUID Rows."""
+    op.drop_column('moderation_results', 'flagged')
+    op.drop_column('moderation_results', 'model')
+    op.drop_column('moderation_results', 'max_score')
+    op.drop_column('moderation_results', 'source_type')
+    op.execute("DROP TYPE moderation_source_type")
+    op.alter_column('moderation_results', 'text_id', type_=sa.String(), postgresql_using='text_id::text')
+    op.alter_column('moderation_results', 'result', type_=sa.JSON(), postgresql_using='result::json')
+    op.create_index(op.f('ix_moderation_results_text_id'), 'moderation_results', ['text_id'], unique=False)
+    op.execute(f"INSERT INTO moderation_results (text_id, text, result, status, created_at) "
+               f"SELECT text_id, text, result, status, created_at FROM {ARCHIVE_TABLE}")
+    op.drop_table(ARCHIVE_TABLE)
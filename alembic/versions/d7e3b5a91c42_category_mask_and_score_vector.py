@@ -0,0 +1,87 @@
+"""Category bitmask and score vector columns
+
+Revision ID: d7e3b5a91c42
+Revises: c41d9e7f2a10
+Create Date: 2026-10-19 11:12:40.907315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e3b5a91c42'
+down_revision: Union[str, None] = 'c41d9e7f2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Category layout at the time of this migration (bit i / vector index i), see categories.py
+CATEGORIES = (
+    "sexual",
+    "sexual/minors",
+    "harassment",
+    "harassment/threatening",
+    "hate",
+    "hate/threatening",
+    "illicit",
+    "illicit/violent",
+    "self-harm",
+    "self-harm/intent",
+    "self-harm/instructions",
+    "violence",
+    "violence/graphic",
+)
+
+# Rows updated per committed backfill batch
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade():
+    """Apply the migration: Add the category columns, backfill them from the JSONB result in batches, index flagged rows."""
+    # A constant default makes the new column a catalog-only change
+    op.add_column('moderation_results', sa.Column('category_mask', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('moderation_results', sa.Column('category_scores', postgresql.ARRAY(sa.REAL()), nullable=True))
+
+    # Backfill in keyset-paged batches on the primary key, each committed on its own, so no
+    # batch holds row locks or bloats the table for longer than BACKFILL_BATCH_SIZE rows take
+    names = "ARRAY[" + ", ".join(f"'{name}'" for name in CATEGORIES) + "]"
+    backfill = sa.text(f"""
+        WITH batch AS (
+            SELECT text_id FROM moderation_results
+            WHERE text_id > CAST(:after AS uuid)
+            ORDER BY text_id
+            LIMIT :limit
+        ), updated AS (
+            UPDATE moderation_results AS m
+            SET category_mask = (
+                    SELECT COALESCE(SUM(1 << (c.position - 1)::int), 0)::int
+                    FROM unnest({names}) WITH ORDINALITY AS c(name, position)
+                    WHERE (m.result -> 'results' -> 0 -> 'categories' ->> c.name)::boolean
+                ),
+                category_scores = ARRAY(
+                    SELECT (m.result -> 'results' -> 0 -> 'category_scores' ->> c.name)::real
+                    FROM unnest({names}) WITH ORDINALITY AS c(name, position)
+                    ORDER BY c.position
+                )
+            FROM batch
+            WHERE m.text_id = batch.text_id AND m.result -> 'results' -> 0 ? 'categories'
+        )
+        SELECT text_id::text FROM batch ORDER BY text_id DESC LIMIT 1
+    """)
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        after = "00000000-0000-0000-0000-000000000000"
+        while after is not None:
+            after = bind.execute(backfill, {"after": after, "limit": BACKFILL_BATCH_SIZE}).scalar()
+
+    op.create_index('idx_moderation_flagged_created_at_mask', 'moderation_results', ['created_at', 'category_mask'],
+                    unique=False, postgresql_where=sa.text('category_mask <> 0'))
+
+def downgrade():
+    """Rollback the migration: Remove the category columns and their index."""
+    op.drop_index('idx_moderation_flagged_created_at_mask', table_name='moderation_results')
+    op.drop_column('moderation_results', 'category_scores')
+    op.drop_column('moderation_results', 'category_mask')
@@ -0,0 +1,99 @@
+"""Range-partition moderation_results by day
+
+Revision ID: e5f1a8c3d604
+Revises: d7e3b5a91c42
+Create Date: 2026-10-19 12:31:08.552170
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f1a8c3d604'
+down_revision: Union[str, None] = 'd7e3b5a91c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Daily partitions created up front; the maintenance task keeps creating them from then on (see partitions.py)
+PRECREATE_DAYS = 7
+
+INDEXES = (
+    ("idx_moderation_created_at", ["created_at"], None),
+    ("idx_moderation_status", ["status"], None),
+    ("idx_moderation_status_created_at", ["status", "created_at"], None),
+    ("idx_moderation_flagged_created_at_mask", ["created_at", "category_mask"], "category_mask <> 0"),
+)
+
+
+def upgrade():
+    """
+    Turns moderation_results into a partitioned table without copying it: the existing
+    table is attached as one partition covering everything up to tomorrow (and expires as
+    a whole once its newest day passes the retention window), new rows go to daily partitions.
+
+    Everything ATTACH would otherwise do under its exclusive lock is prepared beforehand
+    without blocking writes: the (text_id, created_at) unique index the parent's primary key
+    needs is built CONCURRENTLY, and a validated CHECK proves both NOT NULL and the bound.
+    """
+    op.execute("UPDATE moderation_results SET created_at = now() WHERE created_at IS NULL")
+    legacy_until = op.get_bind().execute(sa.text(
+        "SELECT date_trunc('day', GREATEST(max(created_at), localtimestamp)) + interval '1 day' FROM moderation_results"
+    )).scalar()
+
+    # Outside the migration's transaction, and safe to repeat if a later step fails
+    with op.get_context().autocommit_block():
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS moderation_results_text_id_created_at "
+                   "ON moderation_results (text_id, created_at)")
+        op.execute("ALTER TABLE moderation_results DROP CONSTRAINT IF EXISTS moderation_results_legacy_bound")
+        op.execute(f"ALTER TABLE moderation_results ADD CONSTRAINT moderation_results_legacy_bound "
+                   f"CHECK (created_at IS NOT NULL AND created_at < '{legacy_until}') NOT VALID")
+        op.execute("ALTER TABLE moderation_results VALIDATE CONSTRAINT moderation_results_legacy_bound")
+
+    op.rename_table('moderation_results', 'moderation_results_legacy')
+    for name, _, _ in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name.replace('idx_moderation', 'idx_moderation_legacy')}")
+    # The validated CHECK implies NOT NULL, so neither statement scans the table; ATTACH only
+    # adopts an index for the parent's primary key if it backs a constraint on the partition
+    op.execute("ALTER TABLE moderation_results_legacy ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE moderation_results_legacy DROP CONSTRAINT moderation_results_pkey")
+    op.execute("ALTER TABLE moderation_results_legacy ADD CONSTRAINT moderation_results_legacy_pkey "
+               "PRIMARY KEY USING INDEX moderation_results_text_id_created_at")
+
+    op.execute("CREATE TABLE moderation_results (LIKE moderation_results_legacy INCLUDING DEFAULTS) "
+               "PARTITION BY RANGE (created_at)")
+    op.execute("ALTER TABLE moderation_results ALTER COLUMN created_at SET NOT NULL")
+    # The partition key has to be part of every unique constraint
+    op.create_primary_key('moderation_results_pkey', 'moderation_results', ['text_id', 'created_at'])
+
+    # The CHECK matching the bound lets ATTACH skip its own full scan; the primary key index is adopted
+    op.execute(f"ALTER TABLE moderation_results ATTACH PARTITION moderation_results_legacy "
+               f"FOR VALUES FROM (MINVALUE) TO ('{legacy_until}')")
+    op.execute("ALTER TABLE moderation_results_legacy DROP CONSTRAINT moderation_results_legacy_bound")
+
+    # Partitioned indexes adopt the matching legacy indexes instead of rebuilding them
+    for name, columns, where in INDEXES:
+        op.create_index(name, 'moderation_results', columns, unique=False,
+                        postgresql_where=sa.text(where) if where else None)
+
+    op.execute("CREATE TABLE moderation_results_default PARTITION OF moderation_results DEFAULT")
+    for offset in range(PRECREATE_DAYS + 1):
+        start = legacy_until + timedelta(days=offset)
+        op.execute(f"CREATE TABLE moderation_results_p{start:%Y%m%d} PARTITION OF moderation_results "
+                   f"FOR VALUES FROM ('{start}') TO ('{start + timedelta(days=1)}')")
+
+
+def downgrade():
+    """Copies All Partitions Back Into One Plain Table With The Single-Column Primary Key."""
+    op.execute("CREATE TABLE moderation_results_plain (LIKE moderation_results INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO moderation_results_plain SELECT * FROM moderation_results ORDER BY created_at")
+    op.execute("DROP TABLE moderation_results CASCADE")
+    op.rename_table('moderation_results_plain', 'moderation_results')
+    op.alter_column('moderation_results', 'created_at', nullable=True)
+    op.create_primary_key('moderation_results_pkey', 'moderation_results', ['text_id'])
+    for name, columns, where in INDEXES:
+        op.create_index(name, 'moderation_results', columns, unique=False,
+                        postgresql_where=sa.text(where) if where else None)
@@ -0,0 +1,54 @@
+"""Analytics rollup tables and the stored_at watermark column
+
+Revision ID: f3b9c2d7e815
+Revises: e5f1a8c3d604
+Create Date: 2026-10-19 13:47:22.106843
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9c2d7e815'
+down_revision: Union[str, None] = 'e5f1a8c3d604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    """
+    Apply the migration: Add stored_at and the rollup tables. Existing rows keep a NULL
+    stored_at (stay out of the partial index and the rollups); the watermark starts now.
+    """
+    op.add_column('moderation_results', sa.Column('stored_at', sa.DateTime(), nullable=True))
+    op.create_index('idx_moderation_stored_at', 'moderation_results', ['stored_at'], unique=False,
+                    postgresql_where=sa.text('stored_at IS NOT NULL'))
+
+    op.create_table('moderation_rollups',
+    sa.Column('granularity', sa.String(), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('source_type', postgresql.ENUM(name='moderation_source_type', create_type=False), nullable=False),
+    sa.Column('category', sa.SmallInteger(), nullable=False),
+    sa.Column('results', sa.Integer(), nullable=False),
+    sa.Column('flagged', sa.Integer(), nullable=False),
+    sa.Column('histogram', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.PrimaryKeyConstraint('granularity', 'bucket', 'source_type', 'category')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('processed_until', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO rollup_watermarks (name, processed_until) VALUES ('moderation_rollups', localtimestamp)")
+
+
+def downgrade():
+    """Rollback the migration: Drop the rollup tables and stored_at."""
+    op.drop_table('rollup_watermarks')
+    op.drop_table('moderation_rollups')
+    op.drop_index('idx_moderation_stored_at', table_name='moderation_results')
+    op.drop_column('moderation_results', 'stored_at')
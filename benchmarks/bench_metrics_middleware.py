@@ -0,0 +1,77 @@
+"""
+Microbenchmark: Per-Request Overhead of The Request Metrics Middleware.
+
+Compares The Previous @app.middleware("http") Implementation (BaseHTTPMiddleware + a
+Route Scan) With The Pure ASGI PrometheusMiddleware, Against an App With no Middleware.
+
+Run From The Project Root:
+    python benchmarks/bench_metrics_middleware.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from fastapi import FastAPI, Request
+from starlette.routing import Match
+from metrics import REQUEST_COUNT, REQUEST_LATENCY
+from metrics_middleware import PrometheusMiddleware
+
+ROUTES = 30
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+    for index in range(ROUTES):
+        app.add_api_route(f"/api/v1/route{index}/{{item_id}}", lambda item_id: {"id": item_id}, methods=["GET"])
+
+    if variant == "base_http":
+        @app.middleware("http")
+        async def prometheus_middleware(request: Request, call_next):
+            method = request.method
+            endpoint = request.url.path
+            for route in request.app.router.routes:
+                match, _ = route.matches(request.scope)
+                if match == Match.FULL:
+                    endpoint = route.path
+                    break
+            REQUEST_COUNT.labels(method=method, endpoint=endpoint).inc()
+            with REQUEST_LATENCY.labels(method=method, endpoint=endpoint).time():
+                response = await call_next(request)
+            return response
+    elif variant == "asgi":
+        app.add_middleware(PrometheusMiddleware)
+    return app
+
+async def run(app, requests: int) -> float:
+    path = f"/api/v1/route{ROUTES - 1}/abc"
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                 "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+                 "query_string": b"", "headers": [(b"host", b"bench")], "server": ("bench", 80),
+                 "client": ("127.0.0.1", 1234)}
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+async def main(requests: int = 5000) -> None:
+    apps = {variant: build_app(variant) for variant in ("none", "base_http", "asgi")}
+    for app in apps.values():
+        await run(app, 200)  # Warm up (builds the middleware stack)
+
+    timings = {variant: await run(app, requests) for variant, app in apps.items()}
+    print(f"Requests: {requests}, Routes: {ROUTES} (matching the last route)\n")
+    print(f"{'variant':<12}{'us/request':>12}{'overhead (us)':>16}")
+    for variant, timing in timings.items():
+        print(f"{variant:<12}{timing:>12.1f}{timing - timings['none']:>16.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+"""
+Benchmark: Size And Lookup Latency of The moderation_results Layouts.
+
+Generates The Same Dataset (Default 10M Rows) in Two Scratch Tables, One With The Previous
+Layout (String Key + Redundant Index, JSON Result) And One With The Current Layout (Native
+UUID Key, JSONB Result, Typed Hot Columns), Then Reports Table, Index And Total Size And
+Primary-Key Lookup Latency For Each. Needs a PostgreSQL 13+ Database (gen_random_uuid).
+
+Run From The Project Root:
+    python benchmarks/bench_schema.py --rows 10000000 --lookups 20000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from categories import CATEGORIES
+from database import DATABASE_URL
+
+OLD_TABLE = "bench_moderation_results_old"
+NEW_TABLE = "bench_moderation_results_new"
+
+def sample_response() -> str:
+    """A Realistic Upstream Response; Every Row Stores a Copy With Its Own Scores."""
+    return json.dumps({
+        "id": "modr-00000000-0000-0000-0000-000000000000",
+        "model": "omni-moderation-latest",
+        "results": [{
+            "flagged": False,
+            "categories": {name: False for name in CATEGORIES},
+            "category_scores": {name: round(random.random() / 10, 7) for name in CATEGORIES},
+            "category_applied_input_types": {name: ["text"] for name in CATEGORIES},
+        }],
+    })
+
+async def create_tables(connection, rows: int) -> None:
+    await connection.execute(text(f"DROP TABLE IF EXISTS {OLD_TABLE}, {NEW_TABLE}"))
+    await connection.execute(text("""
+        DO $$ BEGIN
+            CREATE TYPE moderation_source_type AS ENUM ('text', 'image');
+        EXCEPTION WHEN duplicate_object THEN NULL;
+        END $$
+    """))
+    await connection.execute(text(f"""
+        CREATE TABLE {NEW_TABLE} (
+            text_id uuid NOT NULL,
+            created_at timestamp DEFAULT now(),
+            max_score real,
+            source_type moderation_source_type NOT NULL,
+            flagged boolean,
+            status varchar NOT NULL,
+            model varchar,
+            text varchar NOT NULL,
+            result jsonb NOT NULL
+        )
+    """))
+    await connection.execute(text(f"""
+        CREATE TABLE {OLD_TABLE} (
+            text_id varchar NOT NULL,
+            text varchar NOT NULL,
+            result json NOT NULL,
+            status varchar NOT NULL,
+            created_at timestamp DEFAULT now()
+        )
+    """))
+
+    # Scores vary per row so TOAST compression sees realistic (not identical) documents
+    started = time.perf_counter()
+    await connection.execute(text(f"""
+        INSERT INTO {NEW_TABLE}
+        SELECT gen_random_uuid(),
+               now() - g * interval '1 second',
+               doc.score,
+               CASE WHEN g % 5 = 0 THEN 'image' ELSE 'text' END::moderation_source_type,
+               doc.score > 0.19,
+               'completed',
+               'omni-moderation-latest',
+               CASE WHEN g % 5 = 0 THEN 'https://images.example.com/' || g || '.jpg'
+                    ELSE 'Sample submission number ' || g || ' with some ordinary text to moderate' END,
+               jsonb_set(CAST(:template AS jsonb), '{{results,0,category_scores,hate}}', to_jsonb(doc.score))
+        FROM generate_series(1, :rows) AS g,
+             LATERAL (SELECT (0.1 + random() / 10)::real AS score WHERE g > 0) AS doc
+    """), {"rows": rows, "template": sample_response()})
+    await connection.execute(text(f"""
+        INSERT INTO {OLD_TABLE} (text_id, text, result, status, created_at)
+        SELECT text_id::text, text, result::json, status, created_at FROM {NEW_TABLE}
+    """))
+    print(f"Generated {rows:,} Rows Per Table in {time.perf_counter() - started:.0f}s")
+
+    await connection.execute(text(f"ALTER TABLE {OLD_TABLE} ADD PRIMARY KEY (text_id)"))
+    await connection.execute(text(f"CREATE INDEX ON {OLD_TABLE} (text_id)"))  # The redundant ix_moderation_results_text_id
+    await connection.execute(text(f"ALTER TABLE {NEW_TABLE} ADD PRIMARY KEY (text_id)"))
+    for table in (OLD_TABLE, NEW_TABLE):
+        await connection.execute(text(f"CREATE INDEX ON {table} (created_at)"))
+        await connection.execute(text(f"CREATE INDEX ON {table} (status)"))
+        await connection.execute(text(f"CREATE INDEX ON {table} (status, created_at)"))
+
+async def report_sizes(connection, table: str) -> None:
+    sizes = (await connection.execute(text(
+        "SELECT pg_table_size(CAST(:t AS regclass)), pg_indexes_size(CAST(:t AS regclass)), "
+        "pg_total_relation_size(CAST(:t AS regclass))"), {"t": table})).one()
+    print(f"  Table (Incl. TOAST): {sizes[0] / 2**20:,.0f} MiB   Indexes: {sizes[1] / 2**20:,.0f} MiB   "
+          f"Total: {sizes[2] / 2**20:,.0f} MiB")
+    indexes = await connection.execute(text(
+        "SELECT CAST(indexrelid AS regclass)::text, pg_relation_size(indexrelid) FROM pg_index "
+        "WHERE indrelid = CAST(:t AS regclass) ORDER BY 2 DESC"), {"t": table})
+    for name, size in indexes:
+        print(f"    {name}: {size / 2**20:,.0f} MiB")
+    # Documents below the ~2 KB TOAST threshold are stored inline and uncompressed
+    stored = (await connection.execute(text(
+        f"SELECT avg(pg_column_size(result)) FROM {table} TABLESAMPLE SYSTEM (1)"))).scalar()
+    print(f"  Stored Result: {stored:,.0f} Bytes Per Row on Average")
+
+async def measure_lookups(engine, table: str, ids: list) -> None:
+    timings = []
+    async with engine.connect() as connection:
+        query = text(f"SELECT * FROM {table} WHERE text_id = :id")
+        for text_id in ids[:100]:  # Warm the cache and the prepared statement
+            await connection.execute(query, {"id": text_id})
+        for text_id in ids:
+            started = time.perf_counter()
+            (await connection.execute(query, {"id": text_id})).one()
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    print(f"  Lookup: p50 {statistics.median(timings):.0f}us   p99 {timings[int(len(timings) * 0.99)]:.0f}us   "
+          f"Mean {statistics.fmean(timings):.0f}us over {len(timings):,} Lookups")
+
+async def main(rows: int, lookups: int, keep: bool) -> None:
+    engine = create_async_engine(DATABASE_URL, echo=False)
+    try:
+        async with engine.begin() as connection:
+            await create_tables(connection, rows)
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            for table in (OLD_TABLE, NEW_TABLE):
+                await connection.execute(text(f"VACUUM ANALYZE {table}"))
+            ids = [str(row[0]) for row in await connection.execute(
+                text(f"SELECT text_id FROM {NEW_TABLE} TABLESAMPLE SYSTEM (1) LIMIT :n"), {"n": lookups})]
+        random.shuffle(ids)
+
+        for label, table in (("Previous Layout (String Key, JSON)", OLD_TABLE), ("Current Layout (UUID Key, JSONB)", NEW_TABLE)):
+            print(label)
+            async with engine.connect() as connection:
+                await report_sizes(connection, table)
+            await measure_lookups(engine, table, ids)
+
+        if not keep:
+            async with engine.begin() as connection:
+                await connection.execute(text(f"DROP TABLE IF EXISTS {OLD_TABLE}, {NEW_TABLE}"))
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--keep", action="store_true", help="Keep The Scratch Tables For Further Inspection")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.lookups, args.keep))
@@ -0,0 +1,56 @@
+"""
+Microbenchmark: Stdlib json Path vs The Shared Serialization Layer.
+
+Run From The Project Root:
+    python benchmarks/bench_serialization.py
+"""
+import asyncio
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from fastapi.encoders import jsonable_encoder
+import serialization
+from mock import mock_moderate_text, MockModerationRequest
+
+def main(number: int = 20000) -> None:
+    moderation = asyncio.run(mock_moderate_text(MockModerationRequest(input="benchmark")))
+    response = {"message": "Moderation Result Found in Redis", "id": "0b3c2e1a-8f61-4d7a-9a8f-1d2f3c4b5a6e",
+                "status": "Completed", "text": "benchmark", "created_at": datetime.now(), "result": moderation}
+    log_event = {"event": "Text Moderation Task Queued", "text_id": response["id"], "text": "benchmark",
+                 "timestamp": datetime.now().isoformat()}
+    encoded = json.dumps(moderation)
+
+    cases = {
+        "response body": (
+            lambda: json.dumps(jsonable_encoder(response)).encode("utf-8"),
+            lambda: serialization.dumps(response),
+        ),
+        "redis value encode": (
+            lambda: json.dumps(moderation),
+            lambda: serialization.dumps_str(moderation),
+        ),
+        "redis value decode": (
+            lambda: json.loads(encoded),
+            lambda: serialization.loads(encoded),
+        ),
+        "log line": (
+            lambda: json.dumps(log_event, indent=4, sort_keys=True),
+            lambda: serialization.dumps_pretty(log_event),
+        ),
+    }
+
+    backend = "orjson" if serialization.orjson is not None else "stdlib fallback"
+    print(f"Serialization Backend: {backend} ({number} iterations per case)\n")
+    print(f"{'case':<20}{'stdlib (us)':>14}{'layer (us)':>14}{'speedup':>10}")
+    for name, (baseline, candidate) in cases.items():
+        baseline_us = timeit.timeit(baseline, number=number) / number * 1e6
+        candidate_us = timeit.timeit(candidate, number=number) / number * 1e6
+        print(f"{name:<20}{baseline_us:>14.2f}{candidate_us:>14.2f}{baseline_us / candidate_us:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
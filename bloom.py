@@ -0,0 +1,109 @@
+import hashlib
+import math
+import os
+import time
+from typing import AsyncIterable, Optional
+from dotenv import load_dotenv
+from metrics import BLOOM_FALSE_POSITIVE_RATE, BLOOM_REBUILD_SECONDS, BLOOM_ITEMS
+
+load_dotenv()
+
+# Sets The Bits in The Live Filter And in The Filter Being Rebuilt, so no New ID is Lost.
+# A Filter That Does Not Exist Yet is Left Alone: Only a Full Rebuild Creates it.
+ADD_SCRIPT = """
+for k = 1, #KEYS do
+    if redis.call('EXISTS', KEYS[k]) == 1 then
+        for i = 1, #ARGV do
+            redis.call('SETBIT', KEYS[k], ARGV[i], 1)
+        end
+    end
+end
+return 1
+"""
+
+# Returns -1 if The Filter Has Not Been Built, 0 if The Item is Definitely Absent, 1 if it Might be Present
+CHECK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+for i = 1, #ARGV do
+    if redis.call('GETBIT', KEYS[1], ARGV[i]) == 0 then
+        return 0
+    end
+end
+return 1
+"""
+
+class BloomFilter:
+    """
+    Redis-Backed Bloom Filter of Known Moderation IDs.
+
+    Sized for `capacity` items at the target `error_rate`. Bit positions use double hashing
+    over a single BLAKE2b digest. Add and check are one server-side script each, so both cost
+    exactly one round trip.
+    """
+
+    def __init__(self, key: str = "bloom:text_ids", capacity: int = 10_000_000, error_rate: float = 0.001):
+        self.key = key
+        self.rebuild_key = f"{key}:rebuild"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+
+    def positions(self, item: str) -> list:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    async def add(self, redis_client, item: str) -> None:
+        await redis_client.eval(ADD_SCRIPT, 2, self.key, self.rebuild_key, *self.positions(item))
+
+    async def might_contain(self, redis_client, item: str) -> Optional[bool]:
+        """False if The Item Was Never Added, True if it May Have Been, None if The Filter is Not Built."""
+        found = int(await redis_client.eval(CHECK_SCRIPT, 1, self.key, *self.positions(item)))
+        return None if found < 0 else bool(found)
+
+    def estimated_false_positive_rate(self, bits_set: int) -> float:
+        return (bits_set / self.size) ** self.hashes
+
+    async def rebuild(self, redis_client, items: AsyncIterable, batch_size: int = 10000) -> dict:
+        """
+        Rebuilds The Filter From The Authoritative ID Sources And Swaps it in Atomically.
+        Deleted IDs Drop Out; IDs Added While The Rebuild Runs Are Written to Both Filters.
+        """
+        started = time.perf_counter()
+        await redis_client.delete(self.rebuild_key)
+        # Pre-allocate the bitmap; the expiry cleans up after an aborted rebuild
+        await redis_client.setbit(self.rebuild_key, self.size - 1, 0)
+        await redis_client.expire(self.rebuild_key, 3600)
+
+        count = 0
+        pipe = redis_client.pipeline(transaction=False)
+        async for item in items:
+            for position in self.positions(str(item)):
+                pipe.setbit(self.rebuild_key, position, 1)
+            count += 1
+            if count % batch_size == 0:
+                await pipe.execute()
+        await pipe.execute()
+
+        await redis_client.rename(self.rebuild_key, self.key)
+        await redis_client.persist(self.key)
+
+        bits_set = await redis_client.bitcount(self.key)
+        stats = {
+            "items": count,
+            "seconds": time.perf_counter() - started,
+            "false_positive_rate": self.estimated_false_positive_rate(bits_set),
+        }
+        BLOOM_ITEMS.set(count)
+        BLOOM_REBUILD_SECONDS.set(stats["seconds"])
+        BLOOM_FALSE_POSITIVE_RATE.set(stats["false_positive_rate"])
+        return stats
+
+def get_bloom_filter() -> BloomFilter:
+    """Bloom Filter Configured From The Environment (Shared by The API And The Workers)."""
+    return BloomFilter(capacity=int(os.getenv("BLOOM_CAPACITY", "10000000")),
+                       error_rate=float(os.getenv("BLOOM_ERROR_RATE", "0.001")))
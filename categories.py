@@ -0,0 +1,43 @@
+# Moderation Categories in a Fixed Order (Bit i / Vector Index i = CATEGORIES[i])
+CATEGORIES = (
+    "sexual",
+    "sexual/minors",
+    "harassment",
+    "harassment/threatening",
+    "hate",
+    "hate/threatening",
+    "illicit",
+    "illicit/violent",
+    "self-harm",
+    "self-harm/intent",
+    "self-harm/instructions",
+    "violence",
+    "violence/graphic",
+)
+
+CATEGORY_INDEX = {name: index for index, name in enumerate(CATEGORIES)}
+
+def category_mask(categories: dict) -> int:
+    """Packs The Flagged Category Booleans Into an Integer Bitmask."""
+    mask = 0
+    for name, flagged in categories.items():
+        if flagged:
+            mask |= 1 << CATEGORY_INDEX[name]
+    return mask
+
+def mask_categories(mask: int) -> list:
+    """Returns The Category Names Set in a Bitmask."""
+    return [name for index, name in enumerate(CATEGORIES) if mask & (1 << index)]
+
+def category_bits(names) -> int:
+    """Bitmask For Category Names (For Bitwise Filters). Raises ValueError For Unknown Names."""
+    mask = 0
+    for name in names:
+        if name not in CATEGORY_INDEX:
+            raise ValueError(f"Unknown Category: {name}")
+        mask |= 1 << CATEGORY_INDEX[name]
+    return mask
+
+def category_vector(scores: dict) -> list:
+    """Scores in CATEGORIES Order (None Where The Response Has no Score)."""
+    return [scores.get(name) for name in CATEGORIES]
@@ -1,8 +1,21 @@
 import os
+import base64
+import json
+import uuid
+from bisect import bisect
 from celery import Celery
+from kombu import Queue
+from kombu.serialization import dumps as serialize_body
 from celery.schedules import crontab
-from celery.signals import worker_process_init
+from celery.signals import (worker_process_init, worker_process_shutdown, worker_shutdown, worker_ready,
+                            task_prerun, task_postrun, before_task_publish)
+import threading
+import time
+import logging
+import redis
 from dotenv import load_dotenv
+from metrics import TASK_DURATION, TASKS_PUBLISHED, mark_process_dead
+from health import record_worker_heartbeat, remove_worker_heartbeat, WORKER_HEARTBEAT_INTERVAL
 load_dotenv()
 
 # Get Redis URL from environment variable
@@ -15,32 +28,195 @@ celery = Celery(
     broker=redis_url,   # Message queue
 )
 
+# Task Routing: Dedicated Queues (Lanes) Per Traffic Class
+TEXT_QUEUE = "moderation.text"      # Interactive text moderation
+IMAGE_QUEUE = "moderation.image"    # Slower image moderation
+BULK_QUEUE = "moderation.bulk"      # Low priority / batch submissions and periodic jobs
+RETRY_QUEUE = "moderation.retry"    # Task retries and DLQ replays
+
+# Submission Priorities Mapped to Redis Broker Priorities (0 = Highest)
+TASK_PRIORITIES = {"high": 0, "normal": 3, "low": 6}
+
 celery.conf.update(
     result_expires=3600,  # Cache results for 1 hour
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
-    broker_connection_retry_on_startup=True
+    broker_connection_retry_on_startup=True,
+    task_queues=(
+        Queue(TEXT_QUEUE),
+        Queue(IMAGE_QUEUE),
+        Queue(BULK_QUEUE),
+        Queue(RETRY_QUEUE),
+    ),
+    task_default_queue=BULK_QUEUE,
+    task_routes={
+        "celery_worker.moderate_text_task": {"queue": TEXT_QUEUE},
+        "celery_worker.moderate_image_task": {"queue": IMAGE_QUEUE},
+        "celery_worker.retry_failed_moderation": {"queue": RETRY_QUEUE},
+    },
+    task_default_priority=TASK_PRIORITIES["normal"],
+    # Redis emulates priorities with one list per priority step
+    broker_transport_options={
+        "queue_order_strategy": "priority",
+        "priority_steps": sorted(TASK_PRIORITIES.values()),
+    },
+    # Prefetch one message at a time so higher priority work is not stuck behind prefetched tasks
+    worker_prefetch_multiplier=int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1")),
 )
 
+# Redis Emulates Priorities With One List Per Priority Step, Named "<queue><sep><step>"
+BROKER_PRIORITY_SEP = "\x06\x16"
+
+def queue_keys(queue: str) -> dict:
+    """Returns The Broker List Key For Each Priority Step of a Queue."""
+    return {
+        step: f"{queue}{BROKER_PRIORITY_SEP}{step}" if step else queue
+        for step in sorted(TASK_PRIORITIES.values())
+    }
+
+def broker_message(task_name: str, args: list, kwargs: dict, task_id: str, queue: str, priority: int) -> tuple:
+    """
+    A Task Message in The Redis Transport's Wire Format, as (Broker List Key, Raw Message).
+    Lets a Server-Side Script LPUSH The Task Exactly as `apply_async` Would Have.
+    """
+    message = celery.amqp.as_task_v2(task_id, task_name, args, kwargs, reply_to=celery.thread_oid)
+    content_type, content_encoding, body = serialize_body(message.body, celery.conf.task_serializer)
+    if isinstance(body, str):
+        body = body.encode(content_encoding)
+    properties = {
+        **message.properties,
+        "delivery_mode": 2,
+        # Default exchange: the routing key is the queue name
+        "delivery_info": {"exchange": "", "routing_key": queue},
+        "priority": priority,
+        "body_encoding": "base64",
+        "delivery_tag": str(uuid.uuid4()),
+    }
+    raw = json.dumps({
+        "body": base64.b64encode(body).decode("ascii"),
+        "content-encoding": content_encoding,
+        "content-type": content_type,
+        "headers": message.headers,
+        "properties": properties,
+    })
+    steps = sorted(TASK_PRIORITIES.values())
+    return queue_keys(queue)[steps[max(0, bisect(steps, priority) - 1)]], raw
+
+def route_submission(task_kind: str, priority: str = "normal") -> dict:
+    """
+    Returns The apply_async Options (Queue And Broker Priority) For a Moderation Submission.
+    Low Priority Submissions Go to The Bulk Lane so They Never Delay Interactive Traffic.
+    """
+    if priority not in TASK_PRIORITIES:
+        raise ValueError(f"Unknown Task Priority: {priority}")
+
+    if priority == "low":
+        queue = BULK_QUEUE
+    elif task_kind == "image":
+        queue = IMAGE_QUEUE
+    else:
+        queue = TEXT_QUEUE
+
+    return {"queue": queue, "priority": TASK_PRIORITIES[priority]}
+
+# Per-Lane Throughput Counters (Read by The API's Admission Controller)
+COMPLETED_COUNTER_KEY = "stats:completed:{queue}"
+LANES = (TEXT_QUEUE, IMAGE_QUEUE, BULK_QUEUE, RETRY_QUEUE)
+_stats_redis = None
+
+@task_postrun.connect
+def record_lane_throughput(sender=None, **kwargs):
+    """Counts Processed Tasks Per Lane so The API Can Estimate Queue Wait Times."""
+    global _stats_redis
+    try:
+        delivery_info = getattr(sender.request, "delivery_info", None) or {}
+        queue = delivery_info.get("routing_key")
+        if queue not in LANES:
+            return
+        if _stats_redis is None:
+            _stats_redis = redis.Redis.from_url(redis_url)
+        _stats_redis.incr(COMPLETED_COUNTER_KEY.format(queue=queue))
+    except Exception as e:
+        logging.warning(f"Failed to Record Lane Throughput: {e}")
+
+# Task Metrics (Merged Across Worker And Beat Processes in Multi-Process Mode)
+_task_started = {}
+
+@task_prerun.connect
+def record_task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(time.perf_counter() - started)
+
+@before_task_publish.connect
+def record_task_published(sender=None, **kwargs):
+    TASKS_PUBLISHED.labels(task=sender).inc()
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def drop_live_metrics(**kwargs):
+    mark_process_dead()
+
+# Worker Heartbeat (Read by The API's Readiness Check Instead of Sending Test Tasks)
+_heartbeat_stop = threading.Event()
+
+def _send_heartbeats(hostname: str) -> None:
+    client = redis.Redis.from_url(redis_url)
+    while not _heartbeat_stop.is_set():
+        try:
+            record_worker_heartbeat(client, hostname)
+        except Exception as e:
+            logging.warning(f"Failed to Record Worker Heartbeat: {e}")
+        _heartbeat_stop.wait(WORKER_HEARTBEAT_INTERVAL)
+
+@worker_ready.connect
+def start_heartbeat(sender=None, **kwargs):
+    _heartbeat_stop.clear()
+    threading.Thread(target=_send_heartbeats, args=(sender.hostname,), name="worker-heartbeat", daemon=True).start()
+
+@worker_shutdown.connect
+def stop_heartbeat(sender=None, **kwargs):
+    _heartbeat_stop.set()
+    try:
+        remove_worker_heartbeat(redis.Redis.from_url(redis_url), sender.hostname)
+    except Exception as e:
+        logging.warning(f"Failed to Remove Worker Heartbeat: {e}")
+
 celery.conf.beat_schedule = {
     "retry_failed_tasks": {
         "task": "celery_worker.retry_failed_moderation",
         "schedule": crontab(minute=0, hour="*"),  # Runs every hour
+    },
+    "rebuild_bloom_filter": {
+        "task": "celery_worker.rebuild_bloom_filter",
+        "schedule": crontab(minute=30, hour=3),  # Runs daily, drops deleted IDs
+    },
+    "maintain_result_partitions": {
+        "task": "celery_worker.maintain_result_partitions",
+        "schedule": crontab(minute=15, hour="*/6"),  # Creates upcoming days, drops expired ones
+    },
+    "roll_up_results": {
+        "task": "celery_worker.roll_up_results",
+        "schedule": crontab(),  # Runs every minute, folds in results stored since the last run
     }
 }
 
 # celery.conf.worker_concurrency = 4
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from database import DATABASE_URL
+from database import DATABASE_URL, SQL_ECHO
 
 @worker_process_init.connect
 def init_worker(**kwargs):
     """
     Reinitialize The Async Engine in The Worker Process to Bind it to The Worker's Own Event Loop.
     """
-    new_engine = create_async_engine(DATABASE_URL, future=True, echo=True)
+    new_engine = create_async_engine(DATABASE_URL, future=True, echo=SQL_ECHO)
     global AsyncSessionLocal
     AsyncSessionLocal = async_sessionmaker(
         bind=new_engine, class_=AsyncSession, expire_on_commit=False
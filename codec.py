@@ -0,0 +1,174 @@
+import os
+import struct
+import zlib
+import msgpack
+import serialization
+from dotenv import load_dotenv
+from categories import CATEGORIES, CATEGORY_INDEX
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, zlib is used instead
+    zstandard = None
+
+load_dotenv()
+
+# Codec Used For New Writes: "packed" (default), "msgpack" or "json" (legacy format)
+REDIS_VALUE_CODEC = os.getenv("REDIS_VALUE_CODEC", "packed").strip().lower()
+
+# Encoded Values Larger Than This (Bytes) Are Compressed
+COMPRESS_THRESHOLD = int(os.getenv("REDIS_VALUE_COMPRESS_THRESHOLD", "512"))
+
+# Binary Values Start With a 3-Byte Header: MAGIC + Format + Compression.
+# JSON Never Starts With a NUL Byte, so Legacy Values Are Detected by The First Byte.
+MAGIC = b"\x00"
+FORMAT_MSGPACK = b"m"
+FORMAT_PACKED = b"p"
+COMPRESSION_NONE = b"-"
+COMPRESSION_ZLIB = b"z"
+COMPRESSION_ZSTD = b"s"
+
+# Known Input Types For category_applied_input_types, One Bitmask Each
+INPUT_TYPES = ("text", "image")
+
+class CodecError(ValueError):
+    """Raised When a Stored Value Cannot be Decoded."""
+
+def _bitmask(names) -> int:
+    mask = 0
+    for name in names:
+        mask |= 1 << CATEGORY_INDEX[name]
+    return mask
+
+def _float32_to_float(packed: bytes) -> float:
+    """Shortest Decimal That Round-Trips to The Same float32 (Avoids 0.10000000149 Noise)."""
+    value = struct.unpack("<f", packed)[0]
+    for precision in range(6, 10):
+        candidate = float(f"{value:.{precision}g}")
+        if struct.pack("<f", candidate) == packed:
+            return candidate
+    return value
+
+def _pack_result(result: dict) -> list:
+    """
+    Packs One Moderation Result Into a Fixed Layout:
+    [flagged, present_mask, flagged_mask, float32 scores, input type masks, extra fields]
+    Scores Are Stored as a Little-Endian float32 Array in CATEGORIES Order For The Present Categories.
+    """
+    categories = result["categories"]
+    scores = result["category_scores"]
+    applied = result.get("category_applied_input_types")
+    present = [name for name in CATEGORIES if name in categories]
+    if len(present) != len(categories) or set(scores) != set(categories):
+        raise KeyError("Unknown or Mismatched Categories")
+
+    input_masks = None
+    if applied is not None:
+        if set(applied) != set(categories) or any(t not in INPUT_TYPES for types in applied.values() for t in types):
+            raise KeyError("Unknown Applied Input Types")
+        input_masks = [_bitmask(name for name in present if input_type in applied[name]) for input_type in INPUT_TYPES]
+
+    extra = {key: value for key, value in result.items()
+             if key not in ("flagged", "categories", "category_scores", "category_applied_input_types")}
+    return [
+        result["flagged"],
+        _bitmask(present),
+        _bitmask(name for name in present if categories[name]),
+        struct.pack(f"<{len(present)}f", *(scores[name] for name in present)),
+        input_masks,
+        extra,
+    ]
+
+def _unpack_result(packed: list) -> dict:
+    flagged, present_mask, flagged_mask, scores, input_masks, extra = packed
+    present = [name for index, name in enumerate(CATEGORIES) if present_mask & (1 << index)]
+
+    result = {"flagged": flagged}
+    result.update(extra)
+    result["categories"] = {name: bool(flagged_mask & (1 << CATEGORY_INDEX[name])) for name in present}
+    result["category_scores"] = {name: _float32_to_float(scores[4 * i:4 * i + 4]) for i, name in enumerate(present)}
+    if input_masks is not None:
+        result["category_applied_input_types"] = {
+            name: [input_type for input_type, mask in zip(INPUT_TYPES, input_masks) if mask & (1 << CATEGORY_INDEX[name])]
+            for name in present
+        }
+    return result
+
+def _pack_moderation(value: dict) -> dict:
+    """Packs an Upstream Moderation Response, Raising KeyError/TypeError if it Has Another Shape."""
+    results = value["results"]
+    if not isinstance(results, list):
+        raise TypeError("results is Not a List")
+    packed = {key: item for key, item in value.items() if key != "results"}
+    packed["results"] = [_pack_result(result) for result in results]
+    return packed
+
+def _unpack_moderation(packed: dict) -> dict:
+    value = {key: item for key, item in packed.items() if key != "results"}
+    value["results"] = [_unpack_result(result) for result in packed["results"]]
+    return value
+
+def _compress(payload: bytes):
+    if len(payload) <= COMPRESS_THRESHOLD:
+        return COMPRESSION_NONE, payload
+    if zstandard is not None:
+        compressed, compression = zstandard.ZstdCompressor(level=3).compress(payload), COMPRESSION_ZSTD
+    else:
+        compressed, compression = zlib.compress(payload, 6), COMPRESSION_ZLIB
+    # Tiny or incompressible values are kept as they are
+    if len(compressed) >= len(payload):
+        return COMPRESSION_NONE, payload
+    return compression, compressed
+
+def _decompress(compression: bytes, payload: bytes) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return payload
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(payload)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise CodecError("Value is zstd Compressed But The zstandard Package is Not Installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise CodecError(f"Unknown Compression {compression!r}")
+
+def encode_value(value, codec: str = None) -> bytes:
+    """Encodes a Result or Status Value For Redis Using The Configured Codec."""
+    codec = codec or REDIS_VALUE_CODEC
+    if codec == "json":
+        return serialization.dumps(value)
+
+    value_format = FORMAT_MSGPACK
+    if codec == "packed" and isinstance(value, dict) and "results" in value:
+        try:
+            value, value_format = _pack_moderation(value), FORMAT_PACKED
+        except (KeyError, TypeError, struct.error):
+            pass  # Not a standard moderation response, store it as plain msgpack
+
+    compression, payload = _compress(msgpack.packb(value, use_bin_type=True))
+    return MAGIC + value_format + compression + payload
+
+def decode_value(raw):
+    """Decodes a Redis Value Written by Any Codec, Including Legacy JSON Strings."""
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+
+    if not raw.startswith(MAGIC):
+        try:
+            return serialization.loads(raw)
+        except ValueError as e:
+            raise CodecError(f"Invalid Legacy JSON Value: {e}")
+
+    value_format, compression = raw[1:2], raw[2:3]
+    try:
+        value = msgpack.unpackb(_decompress(compression, raw[3:]), raw=False)
+        if value_format == FORMAT_PACKED:
+            return _unpack_moderation(value)
+        if value_format == FORMAT_MSGPACK:
+            return value
+    except CodecError:
+        raise
+    except Exception as e:
+        raise CodecError(f"Corrupt Encoded Value: {e}")
+    raise CodecError(f"Unknown Value Format {value_format!r}")
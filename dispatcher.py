@@ -0,0 +1,204 @@
+"""
+Weighted-Fair Dispatcher: Forwards Per-Tenant Sub-Queues to The Celery Lanes.
+
+Run Alongside The Workers When TENANT_FAIR_QUEUING=true:
+    python dispatcher.py
+"""
+import logging
+import math
+import os
+import time
+from typing import Dict
+
+import redis
+from dotenv import load_dotenv
+
+import serialization
+from celery_worker import celery, queue_keys, TEXT_QUEUE, IMAGE_QUEUE, BULK_QUEUE
+from metrics import TENANT_QUEUE_DEPTH, TENANT_QUEUE_WAIT, TENANT_DISPATCHED, TENANT_DISPATCH_MALFORMED, mark_process_dead
+from tenants import get_tenant_registry, tenant_queue_key, tenant_processing_key
+
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Lanes Fed Through Tenant Sub-Queues (Retries Are Published to The Retry Lane Directly)
+DISPATCH_LANES = (TEXT_QUEUE, IMAGE_QUEUE, BULK_QUEUE)
+
+# Sub-Queue Messages That Cannot be Decoded Are Moved Here (Raw) Instead of Being Retried Forever
+DISPATCH_DEAD_LETTER_KEY = "dlq:dispatch_malformed"
+
+class DeficitRoundRobin:
+    """
+    Deficit Round Robin Over Tenants For One Lane.
+
+    Each visit adds `quantum * weight` to a tenant's deficit and lets it send that many
+    messages. Deficits of backlogged tenants carry over between calls and the round resumes
+    where the previous budget ran out, so long-run throughput is proportional to weight.
+    """
+
+    def __init__(self, quantum: int = 10):
+        self.quantum = quantum
+        self.deficits: Dict[str, float] = {}
+        self._next = 0
+
+    def plan(self, weights: Dict[str, float], depths: Dict[str, int], budget: int) -> Dict[str, int]:
+        """How Many Messages to Take From Each Tenant, at Most `budget` in Total."""
+        names = list(weights)
+        remaining = {name: depths.get(name, 0) for name in names}
+        plan = {name: 0 for name in names}
+        for name in names:
+            if remaining[name] == 0:
+                self.deficits[name] = 0.0  # Idle tenants do not bank credit
+
+        while budget > 0 and any(remaining.values()):
+            for offset in range(len(names)):
+                index = (self._next + offset) % len(names)
+                name = names[index]
+                if remaining[name] == 0:
+                    continue
+                deficit = self.deficits.get(name, 0.0) + self.quantum * weights[name]
+                take = min(math.floor(deficit), remaining[name], budget)
+                plan[name] += take
+                remaining[name] -= take
+                budget -= take
+                self.deficits[name] = 0.0 if remaining[name] == 0 else deficit - take
+                if budget == 0:
+                    # Resume after this tenant next time, it already had its turn
+                    self._next = (index + 1) % len(names)
+                    return plan
+        return plan
+
+class Dispatcher:
+    """
+    Moves Submissions From Tenant Sub-Queues to Celery in Weighted-Fair Order.
+
+    Each lane's broker backlog is kept below `max_backlog` messages, so the backlog (and
+    therefore the ordering decision) stays in the tenant sub-queues where it can be shared
+    fairly instead of piling up first-come-first-served in the Celery queue.
+
+    Messages are moved (LMOVE) into a per-tenant processing list before they are published
+    and dropped from it only once Celery has them, so a broker error or a crash never loses
+    one. Run a single dispatcher: its processing lists are not shared. A message that cannot
+    be decoded is moved to DISPATCH_DEAD_LETTER_KEY, so it cannot block its sub-queue.
+    """
+
+    def __init__(self, app, redis_client, registry, max_backlog: int = 50, quantum: int = 10, idle_sleep: float = 0.05):
+        self.app = app
+        self.redis = redis_client
+        self.registry = registry
+        self.max_backlog = max_backlog
+        self.idle_sleep = idle_sleep
+        self.schedulers = {lane: DeficitRoundRobin(quantum) for lane in DISPATCH_LANES}
+
+    def run_forever(self) -> None:
+        logging.info(f"Dispatcher Started For Tenants: {[tenant.name for tenant in self.registry.all()]}")
+        recovered = self.recover()
+        if recovered:
+            logging.warning(f"Returned {recovered} Unacknowledged Messages to The Tenant Sub-Queues")
+        try:
+            while True:
+                if self.run_once() == 0:
+                    time.sleep(self.idle_sleep)
+        finally:
+            mark_process_dead()
+
+    def run_once(self) -> int:
+        """One Dispatch Round Over Every Lane. Returns The Number of Messages Forwarded."""
+        tenants = self.registry.all()
+        weights = {tenant.name: tenant.weight for tenant in tenants}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for lane in DISPATCH_LANES:
+            for key in queue_keys(lane).values():
+                pipe.llen(key)
+            for name in weights:
+                pipe.llen(tenant_queue_key(name, lane))
+        values = iter(pipe.execute())
+
+        dispatched = 0
+        for lane in DISPATCH_LANES:
+            backlog = sum(int(next(values)) for _ in queue_keys(lane))
+            depths = {name: int(next(values)) for name in weights}
+            budget = self.max_backlog - backlog
+            plan = self.schedulers[lane].plan(weights, depths, budget) if budget > 0 else {}
+            if any(plan.values()):
+                dispatched += self._forward(lane, plan)
+            for name, depth in depths.items():
+                TENANT_QUEUE_DEPTH.labels(tenant=name, lane=lane).set(depth - plan.get(name, 0))
+        return dispatched
+
+    def recover(self) -> int:
+        """
+        Returns Messages Left in The Processing Lists (by a Dispatcher That Stopped Mid-Batch) to
+        The Head of Their Sub-Queues, in Order. Some of Them May Have Reached Celery Already, so
+        Delivery is At Least Once.
+        """
+        recovered = 0
+        for tenant in self.registry.all():
+            for lane in DISPATCH_LANES:
+                processing, queue = tenant_processing_key(tenant.name, lane), tenant_queue_key(tenant.name, lane)
+                while self.redis.lmove(processing, queue, "RIGHT", "LEFT") is not None:
+                    recovered += 1
+        return recovered
+
+    def _forward(self, lane: str, plan: Dict[str, int]) -> int:
+        planned = [(name, count) for name, count in plan.items() if count]
+        pipe = self.redis.pipeline(transaction=False)
+        for name, count in planned:
+            for _ in range(count):
+                pipe.lmove(tenant_queue_key(name, lane), tenant_processing_key(name, lane), "LEFT", "RIGHT")
+        moved = iter(pipe.execute())
+
+        forwarded = 0
+        with self.app.producer_or_acquire() as producer:
+            for name, count in planned:
+                messages = [raw for raw in (next(moved) for _ in range(count)) if raw is not None]
+                sent, malformed = 0, []
+                for raw in messages:
+                    try:
+                        message = serialization.loads(raw)
+                        task, enqueued_at = message["task"], message["enqueued_at"]
+                        options = {key: message[key] for key in ("args", "kwargs", "task_id", "queue", "priority")}
+                    except (ValueError, TypeError, KeyError) as e:
+                        logging.error(f"Malformed Message in The {lane} Sub-Queue of Tenant {name}, Dead-Lettered: {e}")
+                        TENANT_DISPATCH_MALFORMED.labels(tenant=name, lane=lane).inc()
+                        malformed.append(raw)
+                        continue
+                    try:
+                        self.app.send_task(task, producer=producer, **options)
+                    except Exception as e:
+                        logging.error(f"Dispatch to {lane} Failed For Tenant {name}: {e}")
+                        break
+                    TENANT_QUEUE_WAIT.labels(tenant=name).observe(max(0.0, time.time() - enqueued_at))
+                    TENANT_DISPATCHED.labels(tenant=name, lane=lane).inc()
+                    sent += 1
+                self._settle(name, lane, len(messages), sent, malformed)
+                forwarded += sent
+        return forwarded
+
+    def _settle(self, name: str, lane: str, moved: int, sent: int, malformed: list) -> None:
+        """
+        Puts The Unsent Messages Back at The Head of The Sub-Queue, in Order, Dead-Letters The
+        Malformed Ones And Drops The Sent Ones (Those Two Are The Head of The Processing List).
+        """
+        processing = tenant_processing_key(name, lane)
+        handled = sent + len(malformed)
+        pipe = self.redis.pipeline(transaction=True)
+        if malformed:
+            pipe.rpush(DISPATCH_DEAD_LETTER_KEY, *malformed)
+        for _ in range(moved - handled):
+            pipe.lmove(processing, tenant_queue_key(name, lane), "RIGHT", "LEFT")
+        pipe.ltrim(processing, handled, -1)
+        pipe.execute()
+
+def build_dispatcher() -> Dispatcher:
+    return Dispatcher(celery,
+                      redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"), decode_responses=True),
+                      get_tenant_registry(),
+                      max_backlog=int(os.getenv("DISPATCH_MAX_BACKLOG", "50")),
+                      quantum=int(os.getenv("DISPATCH_QUANTUM", "10")),
+                      idle_sleep=float(os.getenv("DISPATCH_IDLE_SLEEP", "0.05")))
+
+if __name__ == "__main__":
+    build_dispatcher().run_forever()
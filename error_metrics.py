@@ -0,0 +1,49 @@
+import asyncio
+
+from fastapi import HTTPException
+from redis import exceptions as redis_exceptions
+from sqlalchemy import exc as sqlalchemy_exceptions
+from structlog import get_logger
+
+from metrics import GUARDED_ERROR_COUNT
+from admission import AdmissionRejected
+from publisher import PublisherOverloaded
+from payload_store import PayloadNotFound
+from codec import CodecError
+
+log = get_logger()
+
+# Exception Classes Mapped to a Normalized Error Code (First Match Wins, Subclasses First)
+ERROR_CODES = (
+    (PublisherOverloaded, "overloaded"),
+    (AdmissionRejected, "overloaded"),
+    (PayloadNotFound, "payload_missing"),
+    (CodecError, "corrupt_value"),
+    (redis_exceptions.ConnectionError, "redis_unavailable"),
+    (redis_exceptions.TimeoutError, "redis_timeout"),
+    (redis_exceptions.RedisError, "redis_error"),
+    (sqlalchemy_exceptions.IntegrityError, "db_integrity"),
+    (sqlalchemy_exceptions.OperationalError, "db_unavailable"),
+    (sqlalchemy_exceptions.InterfaceError, "db_unavailable"),
+    (sqlalchemy_exceptions.SQLAlchemyError, "db_error"),
+    (asyncio.TimeoutError, "timeout"),  # Before OSError, which TimeoutError subclasses
+    (OSError, "connection_error"),
+    ((ValueError, TypeError, KeyError), "invalid_input"),
+)
+
+def classify_error(error: BaseException) -> tuple:
+    """Maps an Exception to Bounded (exception type, error code) Labels. The Message is Never a Label."""
+    if isinstance(error, HTTPException):
+        return type(error).__name__, f"http_{error.status_code}"
+    for exception_types, code in ERROR_CODES:
+        if isinstance(error, exception_types):
+            return type(error).__name__, code
+    return type(error).__name__, "internal"
+
+def record_error(method: str, endpoint: str, error: BaseException) -> None:
+    """Counts an Endpoint Error by Type And Code, Keeping The Raw Message in The Logs Only."""
+    exception, code = classify_error(error)
+    GUARDED_ERROR_COUNT.labels(method=method, endpoint=endpoint, exception=exception, code=code).inc()
+    # Overload and client errors are expected under load; everything else is a server error
+    log_method = log.warning if code == "overloaded" or code.startswith("http_4") else log.error
+    log_method("API Error", method=method, endpoint=endpoint, exception=exception, code=code, error=str(error))
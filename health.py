@@ -0,0 +1,95 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+load_dotenv()
+
+# Celery Workers Record Their Last Heartbeat Here (Sorted Set: hostname -> Unix Time)
+WORKER_HEARTBEAT_KEY = "health:workers"
+WORKER_HEARTBEAT_INTERVAL = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "10"))
+# A Worker Counts as Alive if it Sent a Heartbeat Within This Many Seconds
+WORKER_HEARTBEAT_MAX_AGE = float(os.getenv("WORKER_HEARTBEAT_MAX_AGE", "30"))
+
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+
+def record_worker_heartbeat(redis_client, hostname: str) -> None:
+    """Marks a Celery Worker as Alive (Sync Client, Called From The Worker's Heartbeat Thread)."""
+    now = time.time()
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zadd(WORKER_HEARTBEAT_KEY, {hostname: now})
+    # Forget workers that stopped long ago
+    pipe.zremrangebyscore(WORKER_HEARTBEAT_KEY, "-inf", now - 10 * WORKER_HEARTBEAT_MAX_AGE)
+    pipe.execute()
+
+def remove_worker_heartbeat(redis_client, hostname: str) -> None:
+    redis_client.zrem(WORKER_HEARTBEAT_KEY, hostname)
+
+async def check_database(engine) -> dict:
+    """SELECT 1 on a Pooled Connection."""
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return {"status": "ok"}
+
+async def check_redis(redis_client) -> dict:
+    """PING on a Pooled Connection."""
+    if not await redis_client.ping():
+        raise ConnectionError("Redis PING Failed")
+    return {"status": "ok"}
+
+async def check_workers(redis_client, max_age: float = WORKER_HEARTBEAT_MAX_AGE) -> dict:
+    """Counts Workers With a Recent Heartbeat; Fails if There Are None."""
+    alive = await redis_client.zcount(WORKER_HEARTBEAT_KEY, time.time() - max_age, "+inf")
+    if not alive:
+        raise RuntimeError(f"No Worker Heartbeat in The Last {max_age:g}s")
+    return {"status": "ok", "workers": alive}
+
+class HealthChecker:
+    """
+    Runs The Readiness Checks Concurrently, Each Under Its Own Timeout.
+
+    The report is cached for `cache_ttl` seconds and concurrent callers share one
+    refresh, so frequent probes from several orchestrators cost one round of checks.
+    """
+
+    def __init__(self,
+                 checks: Dict[str, Callable[[], Awaitable[dict]]],
+                 timeout: float = HEALTH_CHECK_TIMEOUT,
+                 cache_ttl: float = HEALTH_CACHE_TTL):
+        self.checks = checks
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self._report = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def report(self) -> dict:
+        if self._report is not None and self._expires_at > time.monotonic():
+            return self._report
+        async with self._lock:
+            if self._report is None or self._expires_at <= time.monotonic():
+                self._report = await self._run()
+                self._expires_at = time.monotonic() + self.cache_ttl
+        return self._report
+
+    async def _run(self) -> dict:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(self.checks[name]) for name in names))
+        checks = dict(zip(names, results))
+        status = "ok" if all(result["status"] == "ok" for result in checks.values()) else "error"
+        return {"status": status, "checks": checks}
+
+    async def _run_check(self, check) -> dict:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(check(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "error", "details": f"Timed Out After {self.timeout:g}s"}
+        except Exception as e:
+            result = {"status": "error", "details": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
@@ -0,0 +1,72 @@
+import hashlib
+import os
+from datetime import datetime
+from typing import Optional
+from dotenv import load_dotenv
+
+import serialization
+from codec import encode_value, decode_value, CodecError
+
+load_dotenv()
+
+# Completed Results Never Change, so Clients And Edge Proxies May Cache Them For Long
+COMPLETED_CACHE_CONTROL = os.getenv("COMPLETED_RESULT_CACHE_CONTROL", "public, max-age=86400, immutable")
+PENDING_CACHE_CONTROL = "no-store"
+LISTING_CACHE_CONTROL = "no-cache"  # Always revalidate, but allow 304s
+
+def completed_body(text_id: str, text: str, created_at: datetime, result: dict) -> dict:
+    """
+    The Body of a Completed Result, Built The Same Way Whichever Tier Serves it. Keys of The
+    Upstream Response Are Sorted, Since JSONB Returns Them in Its Own Order.
+    """
+    return {"id": str(text_id),
+            "status": "completed",
+            "text": text,
+            "created_at": created_at,
+            "result": serialization.loads(serialization.dumps_pretty(result))}
+
+def result_etag(body: dict) -> str:
+    """Strong ETag Over The Whole Response Body (Keys Sorted, `message` Left Out)."""
+    fields = {key: value for key, value in body.items() if key != "message"}
+    digest = hashlib.blake2b(serialization.dumps_pretty(fields).encode("utf-8"), digest_size=16)
+    return '"' + digest.hexdigest() + '"'
+
+def encode_result_record(body: dict) -> bytes:
+    """
+    Redis Value of a Completed Result: Its ETag, a Newline, Then The Body Encoded Without Loss
+    (Scores Stay float64), so a Matching If-None-Match is Answered Without Decoding Anything.
+    """
+    record = {**body, "created_at": body["created_at"].isoformat()}
+    return result_etag(body).encode("ascii") + b"\n" + encode_value(record)
+
+def record_etag(raw: bytes) -> Optional[str]:
+    """ETag of a Result Record; None For Values Written Before Records (Bare Upstream Responses)."""
+    if not raw.startswith(b'"'):
+        return None
+    return raw[:raw.index(b"\n")].decode("ascii")
+
+def decode_result_record(raw: bytes) -> dict:
+    """Body of a Result Record, Raising CodecError if it Cannot be Decoded."""
+    body = decode_value(raw[raw.index(b"\n") + 1:])
+    try:
+        body["created_at"] = datetime.fromisoformat(body["created_at"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise CodecError(f"Invalid Result Record: {e}")
+    return body
+
+def weak_etag(*parts) -> str:
+    """Weak ETag For Listings, Derived From The Identity of The Returned Records."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return 'W/"' + digest.hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match Uses The Weak Comparison Function (RFC 9110 Section 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
@@ -0,0 +1,59 @@
+import hashlib
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+import serialization
+
+load_dotenv()
+
+# Maps (Tenant, Idempotency-Key) to The Original Response For The Retention Window
+IDEMPOTENCY_KEY = "idempotency:{tenant}:{key}"
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+class DuplicateSubmission(Exception):
+    """Raised When an Idempotency Key Was Already Used; Carries The Stored Record."""
+
+    def __init__(self, record: dict):
+        super().__init__("Idempotency Key Was Already Used")
+        self.record = record
+
+    @property
+    def response(self) -> dict:
+        return self.record["response"]
+
+    def matches(self, claim: "IdempotencyClaim") -> bool:
+        """True if The Earlier Request Had The Same Fingerprint (a Genuine Retry)."""
+        return self.record.get("fingerprint") == claim.fingerprint
+
+class IdempotencyClaim:
+    """
+    An Idempotency Key Together With The Response to Replay For Duplicates.
+
+    IDs are generated before publishing, so the response is known up front and is stored
+    by the same script call that claims the key and enqueues the task. The fingerprint
+    covers the endpoint and the request body, so reusing a key for a different request can
+    be told apart from a retry.
+    """
+
+    __slots__ = ("redis_key", "fingerprint", "response", "ttl")
+
+    def __init__(self, tenant: str, key: str, endpoint: str, request_body: dict, response: dict,
+                 ttl: int = IDEMPOTENCY_TTL):
+        self.redis_key = IDEMPOTENCY_KEY.format(tenant=tenant, key=key)
+        self.fingerprint = fingerprint(endpoint, request_body)
+        self.response = response
+        self.ttl = ttl
+
+    def record(self) -> str:
+        return serialization.dumps_str({"fingerprint": self.fingerprint, "response": self.response})
+
+def fingerprint(endpoint: str, request_body: dict) -> str:
+    return hashlib.sha256(serialization.dumps({"endpoint": endpoint, "body": request_body})).hexdigest()
+
+def duplicate_from(stored) -> Optional[DuplicateSubmission]:
+    """Turns SUBMIT_SCRIPT's Result Into a DuplicateSubmission (None if The Key Was Claimed)."""
+    if not stored:
+        return None
+    return DuplicateSubmission(serialization.loads(stored))
@@ -0,0 +1,147 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+import structlog
+from dotenv import load_dotenv
+import serialization
+from metrics import LOG_EVENTS_DROPPED
+
+load_dotenv()
+
+# "development" (pretty multi-line JSON, written inline) or "production" (compact JSON, written off-thread)
+LOG_MODE = os.getenv("LOG_MODE", "development").strip().lower()
+
+# Values of These Fields Are Cut Down to LOG_MAX_FIELD_LENGTH Characters
+TRUNCATED_FIELDS = ("text", "url", "image_url")
+LOG_MAX_FIELD_LENGTH = int(os.getenv("LOG_MAX_FIELD_LENGTH", "256"))
+
+# Log Records Buffered For The Writer Thread; Beyond This, Events Are Dropped Rather Than Blocking
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Fraction of Events Kept Per Event Name in Production (Everything Else is Always Logged)
+DEFAULT_SAMPLE_RATES = {
+    "Text Moderation Task Queued": 0.01,
+    "Image Moderation Task Queued": 0.01,
+}
+
+def parse_sample_rates(value: str) -> dict:
+    """Parses LOG_SAMPLE_RATES, e.g. "Text Moderation Task Queued=0.01;Image Moderation Task Queued=0.1"."""
+    rates = {}
+    for item in value.split(";"):
+        if "=" in item:
+            event, rate = item.rsplit("=", 1)
+            rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+class EventSampler:
+    """Keeps a Configured Fraction of Each Named Event, Dropping The Rest Before Rendering."""
+
+    def __init__(self, rates: dict):
+        self.rates = rates
+
+    def __call__(self, logger, method_name, event_dict):
+        rate = self.rates.get(event_dict.get("event"))
+        # Warnings and errors are never sampled away
+        if rate is not None and method_name in ("debug", "info") and random.random() >= rate:
+            LOG_EVENTS_DROPPED.labels(reason="sampled").inc()
+            raise structlog.DropEvent
+        return event_dict
+
+class FieldTruncator:
+    """Caps The Size of Large Free-Form Fields (Submitted Text, URLs)."""
+
+    def __init__(self, fields=TRUNCATED_FIELDS, max_length: int = LOG_MAX_FIELD_LENGTH):
+        self.fields = fields
+        self.max_length = max_length
+
+    def __call__(self, logger, method_name, event_dict):
+        for field in self.fields:
+            value = event_dict.get(field)
+            if value is not None:
+                value = str(value)
+                if len(value) > self.max_length:
+                    event_dict[field] = f"{value[:self.max_length]}...[{len(value) - self.max_length} more]"
+        return event_dict
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler on a Bounded Queue That Counts And Drops Records Instead of Blocking When Full."""
+
+    def prepare(self, record):
+        # The message is already rendered by structlog; skip QueueHandler's re-formatting
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_EVENTS_DROPPED.labels(reason="queue_full").inc()
+
+def compact_json_serializer(event_dict, **kwargs):
+    return serialization.dumps_str(event_dict)
+
+def pretty_json_serializer(event_dict, **kwargs):
+    return serialization.dumps_pretty(event_dict)
+
+_listener = None
+
+def _start_writer(logger_name: str) -> logging.Logger:
+    """Routes a Logger Through a Bounded Queue to a Background Thread Writing to stdout."""
+    global _listener
+    if _listener is not None:
+        return logging.getLogger(logger_name)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    logger = logging.getLogger(logger_name)
+    logger.handlers = [DroppingQueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+def stop_logging() -> None:
+    """Flushes The Queued Records And Stops The Writer Thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def configure_logging(mode: str = LOG_MODE) -> None:
+    """Configures structlog For The API: Pretty And Synchronous in Development, Compact And Off-Thread in Production."""
+    if mode != "production":
+        structlog.configure(
+            processors=[
+                structlog.processors.TimeStamper(fmt="iso"),  # Timestamp in ISO format
+                structlog.processors.JSONRenderer(serializer=pretty_json_serializer)
+            ],
+            wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+            context_class=dict,
+            logger_factory=structlog.PrintLoggerFactory(),
+        )
+        return
+
+    rates = {**DEFAULT_SAMPLE_RATES, **parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))}
+    writer = _start_writer("moderation")
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            EventSampler(rates),
+            FieldTruncator(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=compact_json_serializer)
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        context_class=dict,
+        logger_factory=lambda *args: writer,
+        cache_logger_on_first_use=True,
+    )
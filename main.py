@@ -1,106 +1,196 @@
 import os
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request, APIRouter
+import asyncio
+import math
+from fastapi import FastAPI, HTTPException, Depends, Request, APIRouter, Header
 from fastapi import UploadFile, File, Form
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import PlainTextResponse, Response
 import base64
 from uuid import uuid4
 from pydantic import BaseModel, ConfigDict, HttpUrl, Field
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
-from starlette.routing import Match
 import redis.asyncio as redis
 from tasks import celery
 from dotenv import load_dotenv
 import uuid
-import json
+import serialization
+from serialization import FastJSONResponse
 from fastapi import Query
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 from structlog import get_logger
-from prometheus_client import Counter, Histogram, CollectorRegistry
 from prometheus_client import REGISTRY, generate_latest,CONTENT_TYPE_LATEST
-import prometheus_client.parser as parser
-from sqlalchemy import text
+from prometheus_client.exposition import choose_encoder
+from sqlalchemy import text, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import Depends, HTTPException
-from database import get_db
-from models import ModerationResult
+from database import get_db, get_shared_engine, dispose_shared_engine
+from models import ModerationResult, SOURCE_TYPES, parse_text_id, new_text_id, id_filter
+from categories import CATEGORIES, category_bits, mask_categories
+from rollups import (ROLLUP_GRANULARITIES, BUCKET_SIZES, ANALYTICS_MAX_BUCKETS, HISTOGRAM_BINS,
+                     category_indexes, read_rollups)
 import structlog
 import logging
 
 # Import Celery Task
 from tasks import moderate_text_task, moderate_image_task
+from celery_worker import route_submission
+from admission import AdmissionController, AdmissionRejected
+from publisher import SubmitScriptPublisher, TenantQueuePublisher, PublisherOverloaded, PublishTimedOut, StatusRecord
+from tenants import Tenant, UnknownTenant, get_tenant_registry, tenant_queue_key, TENANT_FAIR_QUEUING
+from idempotency import IdempotencyClaim, DuplicateSubmission, IDEMPOTENCY_KEY_MAX_LENGTH
+from rate_limiter import HybridRateLimiter, RateLimit, parse_limits, limit_identity
+from payload_store import needs_claim_check, store_payload
+from codec import encode_value, decode_value, CodecError
+from result_cache import ResultCache, publish_invalidation, listen_for_invalidations, INVALIDATE_ALL
+from bloom import get_bloom_filter
+from http_cache import (completed_body, result_etag, record_etag, decode_result_record, weak_etag, etag_matches,
+                        COMPLETED_CACHE_CONTROL, PENDING_CACHE_CONTROL, LISTING_CACHE_CONTROL)
 from celery.result import AsyncResult
-
-# Clear any previously registered metrics to avoid duplicates
-for collector in list(REGISTRY._collector_to_names.keys()):
-    REGISTRY.unregister(collector)
+from logging_config import configure_logging, stop_logging
+import health
+from health import HealthChecker
 
 # Prometheus Metrics
-REQUEST_COUNT = Counter("api_requests_total",
-                        "Total API Requests", 
-                        ["method", "endpoint"],
-                        registry=REGISTRY)
-
-REQUEST_LATENCY = Histogram("api_request_duration_seconds",
-                            "API Request Duration",
-                            ["method", "endpoint"],
-                            registry=REGISTRY)
-
-ERROR_COUNT = Counter("api_errors_total",
-                      "Total API Errors",
-                      ["method", "endpoint", "exception"],
-                      registry=REGISTRY)
-
-def pretty_json_serializer(event_dict, **kwargs):
-    return json.dumps(event_dict, indent=4, sort_keys=True, **kwargs)
-
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),  # Timestamp in ISO format
-        structlog.processors.JSONRenderer(serializer=pretty_json_serializer)
-    ],
-    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
-    context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
-)
+from metrics import RESULT_LOOKUPS, BLOOM_CHECKS, IDEMPOTENT_REPLAYS, MetricsSnapshot, metrics_registry, mark_process_dead
+from error_metrics import record_error
+from metrics_middleware import PrometheusMiddleware
+
+configure_logging()
 
 # Configure Structured Logging
 log = structlog.get_logger()
 
-# Async Redis Connection
 load_dotenv()
+
+# Async Redis Connections Over Shared Pools (Clients Are Cheap Handles; aclose() Returns Connections to The Pool)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+redis_pool = redis.ConnectionPool.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+binary_redis_pool = redis.ConnectionPool.from_url(REDIS_URL)
+
 async def get_redis():
-    return redis.from_url(
-        os.getenv("REDIS_URL", "redis://localhost:6379/0"),
-        encoding="utf-8",
-        decode_responses=True
-    )
+    return redis.Redis(connection_pool=redis_pool)
+
+# Binary Redis Connection For Codec-Encoded Result And Status Values
+async def get_binary_redis():
+    return redis.Redis(connection_pool=binary_redis_pool)
+
+# API-Key Tenancy (Each Tenant Gets a Weighted Share of Worker Throughput Under TENANT_FAIR_QUEUING)
+tenant_registry = get_tenant_registry()
+
+async def get_tenant(request: Request) -> Tenant:
+    """Resolves The Submitting Tenant From The X-API-Key Header."""
+    try:
+        return tenant_registry.resolve(request.headers.get("X-API-Key"))
+    except UnknownTenant as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "API-Key"})
+
+def tenant_backlog_keys(lane: str) -> list:
+    return [tenant_queue_key(tenant.name, lane) for tenant in tenant_registry.all()]
+
+# Global Admission Control (Sheds Submissions When The Estimated Queue Wait is Too Long)
+admission_controller = AdmissionController(
+    get_redis,
+    max_wait={
+        "high": float(os.getenv("ADMISSION_MAX_WAIT_HIGH", "120")),
+        "normal": float(os.getenv("ADMISSION_MAX_WAIT_NORMAL", "30")),
+        "low": float(os.getenv("ADMISSION_MAX_WAIT_LOW", "10")),
+    },
+    refresh_interval=float(os.getenv("ADMISSION_REFRESH_INTERVAL", "1.0")),
+    default_throughput=float(os.getenv("ADMISSION_DEFAULT_THROUGHPUT", "50")),
+    max_retry_after=int(os.getenv("ADMISSION_MAX_RETRY_AFTER", "300")),
+    backlog_keys=tenant_backlog_keys if TENANT_FAIR_QUEUING else None)
+
+async def admit_submission(lane: str, priority: str) -> None:
+    """Rejects a Submission With 503 And Retry-After When The Workers Are Too Far Behind."""
+    try:
+        await admission_controller.admit(lane, priority)
+    except AdmissionRejected as e:
+        log.warning("Submission Rejected by Admission Control", lane=e.lane, priority=e.priority,
+                    estimated_wait=round(e.estimated_wait, 1))
+        raise HTTPException(status_code=503,
+                            detail="Moderation Queue is Overloaded, Please Retry Later",
+                            headers={"Retry-After": str(e.retry_after)})
+    except Exception as e:
+        # Fail open: an unreachable broker is reported by the enqueue itself
+        log.warning("Admission Control Unavailable", error=str(e))
+
+# Bloom Filter of Known IDs (Rejects Lookups For IDs That Were Never Issued)
+known_ids = get_bloom_filter()
+
+# Non-Blocking Publisher (Batches Submissions Off The Request Path). Each Submission is One
+# Redis Script Writing The Task Message, Pending Status, Idempotency Key And Bloom Filter Bits.
+# With Fair Queuing, Messages Go to Per-Tenant Sub-Queues And `dispatcher.py` Forwards Them to Celery.
+publisher_options = dict(
+    known_ids=known_ids,
+    max_buffer=int(os.getenv("PUBLISH_MAX_BUFFER", "10000")),
+    max_batch=int(os.getenv("PUBLISH_MAX_BATCH", "100")),
+    publish_timeout=float(os.getenv("PUBLISH_TIMEOUT", "10")))
+if TENANT_FAIR_QUEUING:
+    task_publisher = TenantQueuePublisher(get_binary_redis, **publisher_options)
+else:
+    task_publisher = SubmitScriptPublisher(get_binary_redis, **publisher_options)
+
+# In-Process Tier For Completed Results (In Front of Redis And PostgreSQL)
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000")),
+    max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=float(os.getenv("RESULT_CACHE_TTL", "3600")),
+    negative_ttl=float(os.getenv("RESULT_NEGATIVE_CACHE_TTL", "5")))
+
+# Cached JSON View of The Metrics Registry (/metrics/json)
+metrics_snapshot = MetricsSnapshot()
+
+# Submission Rate Limits Per API Key (or Client IP), Enforced in Process And Reconciled With Redis
+rate_limiter = HybridRateLimiter(
+    get_redis,
+    default_limit=RateLimit.per_minute(float(os.getenv("RATE_LIMIT_PER_MINUTE", "100")),
+                                       float(os.getenv("RATE_LIMIT_BURST")) if os.getenv("RATE_LIMIT_BURST") else None),
+    limits=parse_limits(os.getenv("RATE_LIMIT_API_KEYS", "")),
+    sync_interval=float(os.getenv("RATE_LIMIT_SYNC_INTERVAL", "1.0")))
+
+# API Keys With Their Own Bucket: Configured Limits And Tenant Keys
+rate_limited_keys = frozenset(rate_limiter.limits) | frozenset(tenant_registry.by_api_key)
+
+async def enforce_rate_limit(request: Request) -> None:
+    """Rejects Submissions Over The Caller's Rate Limit With 429 And Retry-After (no Redis Round Trip)."""
+    identity, kind = limit_identity(request.headers.get("X-API-Key"),
+                                    request.client.host if request.client else "unknown", rate_limited_keys)
+    retry_after = rate_limiter.acquire(identity, kind)
+    if retry_after is not None:
+        raise HTTPException(status_code=429, detail="Too Many Requests",
+                            headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    redis_client = None
+    invalidation_listener = None
     try:
-        redis_client = await get_redis()
-        await FastAPILimiter.init(redis_client)
-        log.info("FastAPI Rate Limiter Initialized")
+        rate_limiter.start()
+        log.info("Rate Limiter Started")
+        task_publisher.start()
+        invalidation_listener = asyncio.create_task(listen_for_invalidations(result_cache, get_redis))
         yield
     except Exception as e:
-        log.error("Redis Initialization Failed", error=str(e))
+        log.error("Background Service Initialization Failed", error=str(e))
     finally:
-        if redis_client:
-            await redis_client.aclose()
-            log.info("Redis Connection Closed.")
+        if invalidation_listener:
+            invalidation_listener.cancel()
+        await rate_limiter.stop()
+        await task_publisher.stop()
+        await redis_pool.disconnect()
+        await binary_redis_pool.disconnect()
+        await dispose_shared_engine()
+        mark_process_dead()
+        stop_logging()
 
 # FastAPI Application Setup
 app = FastAPI(
     docs_url="/",
     title="Content Moderation System",
     version="1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 app.add_middleware(
@@ -109,14 +199,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"]
 )
+# Request Count, Latency And In-Flight Metrics (Added Last, so it is Outermost And Times The Whole Stack)
+app.add_middleware(PrometheusMiddleware)
     
 # Pydantic Model For Text Moderation Requests
 class TextModerationRequest(BaseModel):
     text: str = Field(..., min_length=1, description="Text to be Moderated")
+    priority: Literal["high", "normal", "low"] = Field("normal", description="Queue Priority (low = Bulk Lane)")
 
 # Pydantic Model For Image Moderation Requests
 class ImageModerationRequest(BaseModel):
     image_url: HttpUrl
+    priority: Literal["high", "normal", "low"] = Field("normal", description="Queue Priority (low = Bulk Lane)")
 
 # Pydantic Model For Moderation Results
 class ModerationResultResponse(BaseModel):
@@ -129,43 +223,53 @@ class ModerationResultResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-# Store Pending Status in Redis
-async def store_pending_status(text_id: str, text: str, celery_task_id: str) -> None:
-    """Stores pending status in Redis for quick retrieval."""
-    redis_client = await get_redis()
-    try:
-        await redis_client.set(
-            f"status:{text_id}",
-            json.dumps({"status": "Processing",
-                        "text": text,
-                        "celery_task_id": celery_task_id}),
-            ex=600)     # Expires in 10 minutes
-        # log.info("Stored Pending Status", text_id=text_id, celery_task_id=celery_task_id)
-    finally: 
-        await redis_client.aclose()
-
-# Middleware to Track Request Count And Duration
-@app.middleware("http")
-async def prometheus_middleware(request: Request, call_next):
-    method = request.method
-    endpoint = request.url.path
-
-    # Normalize Dynamic Routes
-    for route in request.app.router.routes:
-        match, _ = route.matches(request.scope)
-        if match == Match.FULL:
-            endpoint = route.path
-            break
-
-    REQUEST_COUNT.labels(method=method, endpoint=endpoint).inc()  # Increment request count
-    with REQUEST_LATENCY.labels(method=method, endpoint=endpoint).time():  # Track request duration
-        response = await call_next(request)
-
-    return response
+def idempotency_claim(key: Optional[str], tenant: Tenant, endpoint: str, request: BaseModel,
+                      response: dict) -> Optional[IdempotencyClaim]:
+    """Claim For an Idempotency-Key Header (None Without One), Scoped to The Tenant."""
+    if not key:
+        return None
+    return IdempotencyClaim(tenant.name, key, endpoint, request.model_dump(mode="json"), response)
+
+def replay_submission(duplicate: DuplicateSubmission, claim: IdempotencyClaim, response: Response, endpoint: str) -> dict:
+    """Original Response For a Retried Submission; 422 if The Key Was Used For a Different Request."""
+    if not duplicate.matches(claim):
+        raise HTTPException(status_code=422, detail="Idempotency-Key Was Already Used For a Different Request")
+    IDEMPOTENT_REPLAYS.labels(endpoint=endpoint).inc()
+    response.headers["Idempotent-Replayed"] = "true"
+    log.info("Idempotent Submission Replayed", endpoint=endpoint, id=duplicate.response.get("id"))
+    return duplicate.response
+
+def publish_timed_out(error: PublishTimedOut, submission_id: str, endpoint: str) -> HTTPException:
+    """
+    503 For a Submission The Broker Did Not Confirm in Time. One That Was Never Sent is Safe to
+    Retry; One That Was Being Sent May Still Run, so The Body Says so And Carries Its ID to Poll.
+    """
+    record_error("POST", endpoint, error)
+    if not error.may_be_published:
+        return HTTPException(status_code=503, detail="Moderation Queue is Overloaded, Please Retry Later",
+                             headers={"Retry-After": "1"})
+    return HTTPException(status_code=503, headers={"Retry-After": "5"}, detail={
+        "message": "Moderation Task May Still be Processed, Poll Its ID Before Submitting Again",
+        "id": submission_id})
+
+# Pending Status Record, Written to Redis in The Same Script as The Task Message
+PENDING_STATUS_TTL = 600    # Expires in 10 minutes
+
+def pending_status(text_id: str, text: Optional[str], celery_task_id: str, payload_ref: Optional[str] = None) -> StatusRecord:
+    """Pending status for quick retrieval while the task is queued or running."""
+    status = {"status": "Processing", "celery_task_id": celery_task_id}
+    if payload_ref:
+        status["payload_ref"] = payload_ref  # Claim-checked texts are only referenced
+    else:
+        status["text"] = text
+    return StatusRecord(f"status:{text_id}", encode_value(status), PENDING_STATUS_TTL)
 
 # API Endpoint For Text Moderation (Now Uses Celery)
-@app.post("/api/v1/moderate/text", dependencies=[Depends(RateLimiter(times=100, seconds=60))], tags=["POST"])
-async def moderate_text(request: TextModerationRequest, background_tasks: BackgroundTasks) -> dict:
+@app.post("/api/v1/moderate/text", dependencies=[Depends(enforce_rate_limit)], tags=["POST"])
+async def moderate_text(request: TextModerationRequest, response: Response,
+                        tenant: Tenant = Depends(get_tenant),
+                        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key",
+                                                                max_length=IDEMPOTENCY_KEY_MAX_LENGTH)) -> dict:
     if not request.text.strip():  # Ensure text is not empty or just spaces
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     """
@@ -177,39 +281,80 @@ async def moderate_text(request: TextModerationRequest, background_tasks: Backgr
     
     ### **Request Body**:
     - **`text`**:  The text content to be moderated.
+
+    - **`priority`** *(optional, default=normal)*:  `high`, `normal` or `low`. Low priority work runs on the bulk lane.
+
+    ### **Headers**:
+    - **`Idempotency-Key`** *(optional)*:  Retries with the same key return the original response instead of queuing the text again.
     
     ### **Response Body**:
     - **`message`**:  Confirmation that the moderation task is queued.
 
-    - **`text`**:  The submitted text content.
+    - **`text`**:  The submitted text content (omitted for large texts stored by reference).
+
+    - **`payload_ref`**:  Reference to the stored payload (only for large texts).
 
     - **`id`**:  Unique ID for tracking the moderation task.
     ---
     """
+    routing = route_submission("text", request.priority)
+    await admit_submission(routing["queue"], request.priority)
+
     try:
         text = request.text
-        text_id = str(uuid.uuid4())  # Generate unique ID
-
-        # Send task to Celery
-        celery_task = moderate_text_task.delay(text_id, text)
-
-        # BackgroundTasks for quick Redis status update
-        background_tasks.add_task(store_pending_status, text_id, text, celery_task.id)
+        text_id = new_text_id()  # Time-ordered unique ID (encodes its partition)
+        celery_task_id = str(uuid.uuid4())
+
+        if needs_claim_check(text):
+            # Claim check: store the large text once and pass only its reference around
+            payload_ref = await store_payload(text)
+            result = {"message": "Text Moderation Task Queued",
+                      "payload_ref": payload_ref,
+                      "id": text_id}
+            claim = idempotency_claim(idempotency_key, tenant, "/api/v1/moderate/text", request, result)
+            await task_publisher.publish(moderate_text_task, [text_id], routing,
+                                         kwargs={"payload_ref": payload_ref}, tenant=tenant.name,
+                                         idempotency=claim, task_id=celery_task_id, known_id=text_id,
+                                         status=pending_status(text_id, None, celery_task_id, payload_ref))
+
+            log.info("Text Moderation Task Queued", text_id=text_id, payload_ref=payload_ref, text_length=len(text))
+            return result
+
+        result = {"message": "Text Moderation Task Queued",
+                  "text": text,
+                  "id": text_id}
+        claim = idempotency_claim(idempotency_key, tenant, "/api/v1/moderate/text", request, result)
+
+        # Hand the task to the background publisher (routed to the text or bulk lane by priority),
+        # the pending status is written atomically with the task message
+        await task_publisher.publish(moderate_text_task, [text_id, text], routing, tenant=tenant.name,
+                                     idempotency=claim, task_id=celery_task_id, known_id=text_id,
+                                     status=pending_status(text_id, text, celery_task_id))
 
         log.info("Text Moderation Task Queued", text_id=text_id, text=text)
-        return {"message": "Text Moderation Task Queued",
-                "text": text,
-                # "celery_task_id": celery_task.id,
-                "id": text_id}
+        return result
+
+    except DuplicateSubmission as e:
+        return replay_submission(e, claim, response, "/api/v1/moderate/text")
     
+    except PublisherOverloaded as e:
+        record_error("POST", "/api/v1/moderate/text", e)
+        raise HTTPException(status_code=503, detail="Moderation Queue is Overloaded, Please Retry Later",
+                            headers={"Retry-After": "1"})
+
+    except PublishTimedOut as e:
+        raise publish_timed_out(e, text_id, "/api/v1/moderate/text")
+
     except Exception as e:
-        ERROR_COUNT.labels(method="POST", endpoint="/api/v1/moderate/text", exception=str(e)).inc()
-        log.error("Error in Text Moderation", error=str(e))
+        record_error("POST", "/api/v1/moderate/text", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # API Endpoint For Image Moderation (Uses Celery)
-@app.post("/api/v1/moderate/image", dependencies=[Depends(RateLimiter(times=100, seconds=60))], tags=["POST"])
-async def moderate_image(request: ImageModerationRequest, background_tasks: BackgroundTasks) -> dict:
+@app.post("/api/v1/moderate/image", dependencies=[Depends(enforce_rate_limit)], tags=["POST"])
+async def moderate_image(request: ImageModerationRequest, response: Response,
+                         tenant: Tenant = Depends(get_tenant),
+                         idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key",
+                                                                 max_length=IDEMPOTENCY_KEY_MAX_LENGTH)) -> dict:
     """
     ## **Moderate Image**
     
@@ -219,6 +364,11 @@ async def moderate_image(request: ImageModerationRequest, background_tasks: Back
     
     ### **Request Body**:
     - **`image_url`**:  The URL of the image to be moderated.
+
+    - **`priority`** *(optional, default=normal)*:  `high`, `normal` or `low`. Low priority work runs on the bulk lane.
+
+    ### **Headers**:
+    - **`Idempotency-Key`** *(optional)*:  Retries with the same key return the original response instead of queuing the image again.
     
     ### **Response Body**:
     - **`message`**:  Confirmation that the moderation task is queued.
@@ -228,24 +378,40 @@ async def moderate_image(request: ImageModerationRequest, background_tasks: Back
     - **`id`**:  Unique ID for tracking the moderation task.
     ---
     """
+    routing = route_submission("image", request.priority)
+    await admit_submission(routing["queue"], request.priority)
+
     try:
         image_url = str(request.image_url)
-        image_id = str(uuid.uuid4())  # Generate unique ID
-
-        # Send task to Celery
-        celery_task = moderate_image_task.delay(image_id, image_url)
-
-        # Store pending status in Redis
-        background_tasks.add_task(store_pending_status, image_id, image_url, celery_task.id)
+        image_id = new_text_id()  # Time-ordered unique ID (encodes its partition)
+        celery_task_id = str(uuid.uuid4())
+        result = {"message": "Image Moderation Task Queued",
+                  "image_url": image_url,
+                  "id": image_id}
+        claim = idempotency_claim(idempotency_key, tenant, "/api/v1/moderate/image", request, result)
+
+        # Hand the task to the background publisher (routed to the image or bulk lane by priority),
+        # the pending status is written atomically with the task message
+        await task_publisher.publish(moderate_image_task, [image_id, image_url], routing, tenant=tenant.name,
+                                     idempotency=claim, task_id=celery_task_id, known_id=image_id,
+                                     status=pending_status(image_id, image_url, celery_task_id))
         
         log.info("Image Moderation Task Queued", image_id=image_id, image_url=image_url)
-        return {"message": "Image Moderation Task Queued",
-                "image_url": image_url,
-                "id": image_id}
+        return result
+
+    except DuplicateSubmission as e:
+        return replay_submission(e, claim, response, "/api/v1/moderate/image")
     
+    except PublisherOverloaded as e:
+        record_error("POST", "/api/v1/moderate/image", e)
+        raise HTTPException(status_code=503, detail="Moderation Queue is Overloaded, Please Retry Later",
+                            headers={"Retry-After": "1"})
+
+    except PublishTimedOut as e:
+        raise publish_timed_out(e, image_id, "/api/v1/moderate/image")
+
     except Exception as e:
-        ERROR_COUNT.labels(method="POST", endpoint="/api/v1/moderate/image", exception=str(e)).inc()
-        log.error("Error in Image Moderation", error=str(e))
+        record_error("POST", "/api/v1/moderate/image", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # API Endpoint To Retrieve Failed Moderation Tasks
@@ -276,10 +442,10 @@ async def get_failed_tasks() -> dict:
             return {"status": "Not Found", "message": "No Failed Tasks in DLQ"}
         
         return {
-            "failed_tasks": [json.loads(task) for task in failed_tasks]
+            "failed_tasks": [serialization.loads(task) for task in failed_tasks]
         }
     except Exception as e:
-        ERROR_COUNT.labels(method="GET", endpoint="/api/v1/moderation/failed", exception=str(e)).inc()
+        record_error("GET", "/api/v1/moderation/failed", e)
         raise HTTPException(status_code=500, detail=f"Error fetching failed tasks: {str(e)}")
     finally:
         await redis_client.aclose()
@@ -315,7 +481,7 @@ async def clear_failed_tasks()-> dict:
         return {"status": "success", "message": "All Failed Moderation Tasks Cleared From DLQ"}
 
     except Exception as e:
-        ERROR_COUNT.labels(method="DELETE", endpoint="/api/v1/moderation/failed/clear", exception=str(e)).inc()
+        record_error("DELETE", "/api/v1/moderation/failed/clear", e)
         raise HTTPException(status_code=500, detail=f"Error clearing failed tasks: {str(e)}")
     
     finally:
@@ -355,7 +521,7 @@ async def clear_failed_task_by_id(id: str)-> dict:
         removed_task = None
 
         for task in failed_tasks:
-            task_data = json.loads(task)
+            task_data = serialization.loads(task)
             if task_data["text_id"] == id:
                 removed_task = task_data  # Mark this for deletion
             else:
@@ -372,17 +538,26 @@ async def clear_failed_task_by_id(id: str)-> dict:
         return {"status": "Not Found", "message": f"No Failed Task Found with ID {id}"}
 
     except Exception as e:
-        ERROR_COUNT.labels(method="DELETE", endpoint="/api/v1/moderation/failed/{id}/clear", exception=str(e)).inc()
+        record_error("DELETE", "/api/v1/moderation/failed/{id}/clear", e)
         raise HTTPException(status_code=500, detail=f"Error clearing failed task: {str(e)}")
     
     finally:
         await redis_client.aclose()
     
+def local_naive(value: datetime) -> datetime:
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
 # API Endpoint To Retrieve All Moderation Results
 @app.get("/api/v1/moderation/all", tags=["GET"])
 async def get_all_moderation_tasks(
+    request: Request,
+    response: Response,
     offset: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    categories: Optional[str] = Query(None, description="Comma-Separated Flagged Categories, e.g. hate,hate/threatening"),
+    match: Literal["any", "all"] = Query("any", description="Match Results Flagged For Any or All of The Categories"),
+    since: Optional[datetime] = Query(None, description="Only Results Created at or After This Time"),
+    until: Optional[datetime] = Query(None, description="Only Results Created Before This Time"),
     db: AsyncSession = Depends(get_db)
 )-> dict:
     """
@@ -390,13 +565,19 @@ async def get_all_moderation_tasks(
     
     **Description:**  
 
-    Fetches all moderation tasks from the database with pagination.
+    Fetches all moderation tasks from the database with pagination, optionally filtered by flagged category and time range.
 
     ### **Query Parameters**:
     - **`offset`** *(integer, default=0)*:  The starting index for pagination.
     
     - **`limit`** *(integer, default=10, min=1, max=100)*:  The maximum number of records to retrieve.
 
+    - **`categories`** *(optional)*:  Comma-separated category names (e.g. `hate/threatening`); only results flagged for them are returned.
+
+    - **`match`** *(default=any)*:  `any` returns results flagged for at least one of the categories, `all` for every one of them.
+
+    - **`since`**, **`until`** *(optional, ISO 8601)*:  Time range on `created_at`.
+
     ### **Response Body**:
     - **`total_count`**:  The total number of moderation records in the database.
 
@@ -414,26 +595,60 @@ async def get_all_moderation_tasks(
 
       - **`result`**:  The moderation analysis result.
 
+      - **`flagged_categories`**:  The categories the result was flagged for.
+
+      - **`decision`**:  The decision of the moderation policy (e.g. `block`, `allow`).
+
       - **`created_at`**:  Timestamp when the moderation task was created.
 
+    ### **Caching**:
+    Pages carry a weak `ETag` over the returned records; a matching `If-None-Match` returns `304 Not Modified`.
+
     ---
     """
+    filters = []
+    if categories:
+        try:
+            bits = category_bits(name.strip() for name in categories.split(",") if name.strip())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"{e}. Known Categories: {', '.join(CATEGORIES)}")
+        if bits:
+            flagged_bits = ModerationResult.category_mask.op("&")(bits)
+            # category_mask <> 0 is implied, but spelled out so the partial index applies
+            filters += [ModerationResult.category_mask != 0, flagged_bits == bits if match == "all" else flagged_bits != 0]
+    # created_at is a naive local timestamp
+    if since is not None:
+        filters.append(ModerationResult.created_at >= local_naive(since))
+    if until is not None:
+        filters.append(ModerationResult.created_at < local_naive(until))
+
     try:
         # Get total count
-        total_count = await db.execute(text("SELECT COUNT(*) FROM moderation_results"))
+        if filters:
+            total_count = await db.execute(select(func.count()).select_from(ModerationResult).where(*filters))
+        else:
+            total_count = await db.execute(text("SELECT COUNT(*) FROM moderation_results"))
         total_count = total_count.scalar()
 
         if total_count == 0:
-            return {"message": "Database is Empty"}
+            return {"message": "No Records Match The Filters" if filters else "Database is Empty"}
 
         # Fetch records
-        query = select(ModerationResult).offset(offset).limit(limit)
+        query = select(ModerationResult).where(*filters).offset(offset).limit(limit)
         result = await db.execute(query)
         tasks = result.scalars().all()
 
         if not tasks:
             return {"message": f"No Records Found for Limit={limit}, Offset={offset}. Total Records: {total_count}"}
 
+        # The page changes only when its records, their statuses or their decisions do
+        etag = weak_etag(total_count, offset, limit, categories, match, since, until,
+                         *((task.text_id, task.status, task.decision) for task in tasks))
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(etag, LISTING_CACHE_CONTROL)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = LISTING_CACHE_CONTROL
+
         return {
             "total_count": total_count,
             "offset": offset,
@@ -444,6 +659,8 @@ async def get_all_moderation_tasks(
                     "text": task.text,
                     "status": task.status,
                     "result": task.result,
+                    "flagged_categories": mask_categories(task.category_mask or 0),
+                    "decision": task.decision,
                     "created_at": task.created_at
                 }
                 for task in tasks
@@ -451,9 +668,89 @@ async def get_all_moderation_tasks(
         }
 
     except Exception as e:
-        ERROR_COUNT.labels(method="GET", endpoint="/api/v1/moderation/all", exception=str(e)).inc()
+        record_error("GET", "/api/v1/moderation/all", e)
         return {"database_status": "error", "message": str(e)}
     
+# API Endpoint For Moderation Analytics
+@app.get("/api/v1/analytics", tags=["GET"])
+async def get_moderation_analytics(
+    granularity: Literal[ROLLUP_GRANULARITIES] = Query("hour", description="Bucket Size"),
+    since: Optional[datetime] = Query(None, description="First Bucket (Default: 60 Minutes or 24 Hours Before `until`)"),
+    until: Optional[datetime] = Query(None, description="End of The Range, Exclusive (Default: Now)"),
+    categories: Optional[str] = Query(None, description="Comma-Separated Categories, `all` For The Whole Result"),
+    source_type: Optional[Literal[SOURCE_TYPES]] = Query(None, description="Only Text or Only Image Results"),
+    db: AsyncSession = Depends(get_db)
+)-> dict:
+    """
+    ## **Moderation Analytics**
+
+    **Description:**
+
+    Flagged rate and score histogram per time bucket and category. Answered from the rollup tables only,
+    so the cost depends on the number of buckets, not on the number of stored results.
+    Results become visible once the rollup task has folded them in (about a minute after they are stored).
+
+    ### **Query Parameters**:
+    - **`granularity`** *(`minute` or `hour`, default=hour)*:  Bucket size.
+
+    - **`since`**, **`until`** *(optional, ISO 8601)*:  Time range on `created_at`; at most `ANALYTICS_MAX_BUCKETS` buckets.
+
+    - **`categories`** *(optional)*:  Comma-separated category names; `all` is the result as a whole (its `flagged` and highest score). Default: every category.
+
+    - **`source_type`** *(optional, `text` or `image`)*:  Default: both summed.
+
+    ### **Response Body**:
+    - **`granularity`**, **`since`**, **`until`**:  The range covered.
+
+    - **`histogram_bins`**:  Number of equal-width score bins over `[0, 1]`.
+
+    - **`series`**:  One point per bucket and category with `bucket`, `category`, `results`, `flagged`, `flagged_rate` and `histogram` (results per score bin).
+
+    ---
+    """
+    bucket_size = BUCKET_SIZES[granularity]
+    until = local_naive(until) if until is not None else datetime.now()
+    since = local_naive(since) if since is not None else until - (60 if granularity == "minute" else 24) * bucket_size
+    if since >= until:
+        raise HTTPException(status_code=400, detail="`since` Must be Before `until`")
+    if (until - since) / bucket_size > ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range Spans More Than {ANALYTICS_MAX_BUCKETS} {granularity.title()} Buckets")
+
+    indexes = None
+    if categories:
+        try:
+            indexes = category_indexes(name.strip() for name in categories.split(",") if name.strip())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"{e}. Known Categories: all, {', '.join(CATEGORIES)}")
+
+    try:
+        series = await read_rollups(db, granularity, since, until, indexes, source_type)
+    except Exception as e:
+        record_error("GET", "/api/v1/analytics", e)
+        raise HTTPException(status_code=500, detail=f"Error Reading Analytics: {str(e)}")
+
+    return {
+        "granularity": granularity,
+        "since": since,
+        "until": until,
+        "histogram_bins": HISTOGRAM_BINS,
+        "series": series,
+    }
+
+async def invalidate_cached_result(key: str) -> None:
+    """Drops a Result (or All Results) From The In-Process Tier of Every API Worker."""
+    if key == INVALIDATE_ALL:
+        result_cache.clear()
+    else:
+        result_cache.invalidate(key)
+    redis_client = await get_redis()
+    try:
+        await publish_invalidation(redis_client, key)
+    except Exception as e:
+        log.warning("Cache Invalidation Publish Failed", key=key, error=str(e))
+    finally:
+        await redis_client.aclose()
+
 # API Endpoint To Clear All Moderation Results
 @app.delete("/api/v1/moderation/clear_all", tags=["DELETE"])
 async def clear_all_moderation_results(db: AsyncSession = Depends(get_db))-> dict:
@@ -463,6 +760,7 @@ async def clear_all_moderation_results(db: AsyncSession = Depends(get_db))-> dic
     **Description:**  
 
     Deletes all records from the `moderation_results` table, clearing the database of all stored moderation data.
+    Every partition is truncated, which is instant and leaves no dead rows behind.
 
     ### **Response Body**:
     - **`status`**:  Indicates if the deletion was successful or if an error occurred.
@@ -472,12 +770,13 @@ async def clear_all_moderation_results(db: AsyncSession = Depends(get_db))-> dic
     ---
     """
     try:
-        await db.execute(text("DELETE FROM moderation_results"))
+        await db.execute(text("TRUNCATE moderation_results, moderation_rollups"))
         await db.commit()
+        await invalidate_cached_result(INVALIDATE_ALL)
         return {"status": "success", "message": "All Moderation Results Have Been Deleted From The Database."}
     
     except Exception as e:
-        ERROR_COUNT.labels(method="DELETE", endpoint="/api/v1/moderation/clear_all", exception=str(e)).inc()
+        record_error("DELETE", "/api/v1/moderation/clear_all", e)
         await db.rollback()
         return {"status": "error", "message": str(e)}
 
@@ -502,30 +801,43 @@ async def clear_moderation_result_by_id(id: str, db: AsyncSession = Depends(get_
     ---
     """
     try:
-        result = await db.execute(select(ModerationResult).filter(ModerationResult.text_id == id))
-        moderation = result.scalars().first()
+        # IDs are native UUIDs, anything else cannot exist
+        text_id = parse_text_id(id)
+        moderation = None
+        if text_id is not None:
+            result = await db.execute(select(ModerationResult).filter(*id_filter(text_id)))
+            moderation = result.scalars().first()
 
         if not moderation:
             raise HTTPException(status_code=404, detail=f"Moderation Result With ID {id} Not Found.")
 
         await db.delete(moderation)
         await db.commit()
+        await invalidate_cached_result(text_id)
         return {"status": "success", "message": f"Moderation Result With ID {id} Has Been Deleted."}
 
     except Exception as e:
-        ERROR_COUNT.labels(method="DELETE", endpoint="/api/v1/moderation/clear/{id}", exception=str(e)).inc()
+        record_error("DELETE", "/api/v1/moderation/clear/{id}", e)
         await db.rollback()
         return {"status": "error", "message": str(e)}
 
+def set_completed_headers(response: Response, etag: str) -> None:
+    """Validators For an Immutable, Completed Moderation Result."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = COMPLETED_CACHE_CONTROL
+
+def not_modified(etag: str, cache_control: str = COMPLETED_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
 # API Endpoint To Retrieve Moderation Results
 @app.get("/api/v1/moderation/{id}", response_model=ModerationResultResponse, tags=["GET"])
-async def get_moderation_result(id: str, db: AsyncSession = Depends(get_db))-> dict:
+async def get_moderation_result(id: str, request: Request, response: Response, db: AsyncSession = Depends(get_db))-> dict:
     """
     ## **Retrieve Moderation Result**
     
     **Description:**  
 
-    Fetches the moderation result for a given `id`. It first checks Redis for the result, and if not found, queries the database.
+    Fetches the moderation result for a given `id`. Completed results are served from an in-process cache when possible. Otherwise it checks Redis for the result, and if not found, queries the database.
 
     ### **Path Parameter**:
     - **`id`**:  The unique identifier of the moderation task.
@@ -535,67 +847,119 @@ async def get_moderation_result(id: str, db: AsyncSession = Depends(get_db))-> d
 
     - **`id`**:  The unique identifier of the moderation task.
 
-    - **`status`**:  The current moderation status (`Processing`, `Completed`, or `Not Found`).
+    - **`text`**:  The moderated text (or image URL).
+
+    - **`status`**:  The current moderation status (`PENDING`, `STARTED` or `completed`).
 
     - **`result`**:  The moderation analysis result.
     
     - **`created_at`**:  Timestamp of when the moderation task was created.
 
+    ### **Caching**:
+    Completed results carry a strong `ETag` over the response body, the same whichever tier answers, and a long `Cache-Control`; pending ones are `no-store`.
+    A matching `If-None-Match` returns `304 Not Modified` without the body.
+
     ---
     """
-    redis_client = await get_redis()
+    if_none_match = request.headers.get("if-none-match")
+    # IDs are native UUIDs, anything else cannot exist. Every tier is keyed by the canonical
+    # form the ID was issued in, so an uppercase spelling finds the same result
+    id = parse_text_id(id)
+    if id is None:
+        raise HTTPException(status_code=404, detail="Moderation Result Not Found in Redis or Database")
+
+    # Completed results are immutable, so the in-process tier can answer without any I/O
+    cached = result_cache.get(id)
+    if cached is not None:
+        etag, cached_response = cached
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_completed_headers(response, etag)
+        return {**cached_response, "message": "Moderation Result Found in Cache"}
+    if result_cache.is_missing(id):
+        raise HTTPException(status_code=404, detail="Moderation Result Not Found in Redis or Database")
+
+    # Definitely-unknown IDs are rejected without touching Redis keys or PostgreSQL
+    bloom_passed = False
+    try:
+        gate_client = await get_redis()
+        try:
+            might_exist = await known_ids.might_contain(gate_client, id)
+        finally:
+            await gate_client.aclose()
+        if might_exist is False:
+            BLOOM_CHECKS.labels(outcome="rejected").inc()
+            raise HTTPException(status_code=404, detail="Moderation Result Not Found in Redis or Database")
+        bloom_passed = might_exist is True
+        BLOOM_CHECKS.labels(outcome="passed" if bloom_passed else "not_built").inc()
+    except HTTPException:
+        raise
+    except Exception as e:
+        BLOOM_CHECKS.labels(outcome="unavailable").inc()
+        log.warning("Bloom Filter Check Failed", error=str(e))
+
+    redis_client = await get_binary_redis()
     try:
         # Check if task is still "Processing"
         status = await redis_client.get(f"status:{id}")
         if status:
-            status_data = json.loads(status)
+            status_data = decode_value(status)
             celery_task_id = status_data.get("celery_task_id")
 
             if celery_task_id:
                 task_status = AsyncResult(celery_task_id)
 
                 if task_status.state in ["PENDING", "STARTED"]:
+                    response.headers["Cache-Control"] = PENDING_CACHE_CONTROL
                     return {
                         "id": id,
                         "status": task_status.state,
                         "message": f"Moderation Task is Currently {task_status.state} in Celery."
                     }
 
-        result = await redis_client.get(id) 
-        if result:
+        # Completed results are records led by their ETag; older values (the bare upstream
+        # response, without text or creation time) are served from the database instead
+        result = await redis_client.get(id)
+        etag = record_etag(result) if result else None
+        if etag is not None:
+            RESULT_LOOKUPS.labels(tier="redis", outcome="hit").inc()
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
             try:
-                parsed_result = json.loads(result)
-                created_at = parsed_result.get("created_at")
-                if created_at:
-                    created_at = datetime.fromisoformat(created_at)
-                else:
-                    created_at = datetime.now()
-                return {"message": "Moderation Result Found in Redis", 
-                        "id": id,
-                        "status": "Completed",
-                        "text": parsed_result.get("text", ""),
-                        "created_at": created_at,
-                        "result": parsed_result}
-                        
-            except json.JSONDecodeError:
+                body = decode_result_record(result)
+            except CodecError:
                 raise HTTPException(status_code=500, detail="Error Parsing Moderation Result")
+            result_cache.put(id, (etag, body), len(result))
+            set_completed_headers(response, etag)
+            return {"message": "Moderation Result Found in Redis", **body}
+        RESULT_LOOKUPS.labels(tier="redis", outcome="miss").inc()
         
         # If not in Redis, check PostgreSQL
-        db_result = await db.execute(select(ModerationResult).filter(ModerationResult.text_id == id))
+        db_result = await db.execute(select(ModerationResult).filter(*id_filter(id)))
         moderation = db_result.scalars().first()
 
         if not moderation:
+            RESULT_LOOKUPS.labels(tier="database", outcome="miss").inc()
+            if bloom_passed:
+                BLOOM_CHECKS.labels(outcome="false_positive").inc()
+            result_cache.put_missing(id)
             raise HTTPException(status_code=404, detail="Moderation Result Not Found in Redis or Database")
+        RESULT_LOOKUPS.labels(tier="database", outcome="hit").inc()
         
         # Return data from PostgreSQL
-        return {
-            "message": "Moderation Result Found in Database",
-            "id": moderation.text_id,
-            "text": moderation.text,
-            "status": moderation.status,
-            "result": moderation.result,
-            "created_at": moderation.created_at
-        }
+        if moderation.status != "completed":
+            response.headers["Cache-Control"] = PENDING_CACHE_CONTROL
+            return {"message": "Moderation Result Found in Database", "id": moderation.text_id,
+                    "text": moderation.text, "status": moderation.status, "result": moderation.result,
+                    "created_at": moderation.created_at}
+
+        body = completed_body(moderation.text_id, moderation.text, moderation.created_at, moderation.result)
+        etag = result_etag(body)
+        result_cache.put(id, (etag, body), len(moderation.text) + len(encode_value(moderation.result)))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_completed_headers(response, etag)
+        return {"message": "Moderation Result Found in Database", **body}
         # return {"status": "Not Found", "message": "Moderation Result Not Found"}
             
     finally:
@@ -627,98 +991,98 @@ async def debug_db(db: AsyncSession = Depends(get_db))-> dict:
         return {"database_status": "connected", "row_count": count}
     
     except Exception as e:
-        ERROR_COUNT.labels(method="GET", endpoint="/api/v1/debug/db", exception=str(e)).inc()
+        record_error("GET", "/api/v1/debug/db", e)
         return {"database_status": "error", "message": str(e)}
     
 # # Prometheus Metrics Endpoint
 @app.get("/stats", response_class=PlainTextResponse, tags=["MONITORING"])
-async def metrics()->PlainTextResponse:
-    """Returns Prometheus Metrics in Plain Text."""
-    return PlainTextResponse(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+async def metrics(request: Request)->PlainTextResponse:
+    """Returns Prometheus Metrics in Plain Text (OpenMetrics, With Exemplars, if The Scraper Accepts it)."""
+    encoder, content_type = choose_encoder(request.headers.get("accept"))
+    return PlainTextResponse(encoder(metrics_registry()), media_type=content_type)
     # return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)\
 
 @app.get("/metrics/json", tags=["MONITORING"])
-async def get_metrics_json()-> dict:
+async def get_metrics_json(names: Optional[str] = Query(None, description="Comma-Separated Metric Name Prefixes, e.g. api_,celery_"))-> dict:
     """
     Returns Prometheus Metrics in JSON Format.
+
+    Built from the registry's collectors and cached for `METRICS_JSON_CACHE_TTL` seconds.
     """
     try:
-        # Generate raw Prometheus metrics
-        raw_metrics = generate_latest()
-
-        # Parse metrics into JSON format
-        parsed_metrics = {}
-        for metric in parser.text_string_to_metric_families(raw_metrics.decode("utf-8")):
-            parsed_metrics[metric.name] = {
-                "type": metric.type,
-                "help": metric.documentation,
-                "values": [
-                    {
-                        "labels": sample.labels,
-                        "value": sample.value
-                    }
-                    for sample in metric.samples
-                ]
-            }
-
-        return parsed_metrics
+        prefixes = [name.strip() for name in names.split(",") if name.strip()] if names else None
+        return metrics_snapshot.get(prefixes)
     except Exception as e:
         return {"status": "error", "message": str(e)}
     
-async def check_database(db: AsyncSession)-> dict:
-    """ Check if the database connection is working """
-    try:
-        result = await db.execute(text("SELECT 1"))
-        return {"database": "connected"}
-    except Exception as e:
-        return {"database": "error", "details": str(e)}
+async def check_database_ready()-> dict:
+    return await health.check_database(get_shared_engine())
 
-async def check_redis()-> dict:
-    """ Check if Redis is reachable """
+async def check_redis_ready()-> dict:
+    redis_client = await get_redis()
     try:
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        redis_client = redis.from_url(redis_url, encoding="utf-8", decode_responses=True)
-        pong = await redis_client.ping()
+        return await health.check_redis(redis_client)
+    finally:
         await redis_client.aclose()
-        return {"redis": "connected"} if pong else {"redis": "error"}
-    except Exception as e:
-        return {"redis": "error", "details": str(e)}
 
-async def check_celery()-> dict:
-    """ Check if Celery workers are running (by sending a test task) """
+async def check_workers_ready()-> dict:
+    redis_client = await get_redis()
     try:
-        test_task = celery.send_task("celery_worker.moderate_text_task", args=["test_id", "test_text"])
-        task_status = AsyncResult(test_task.id)
+        return await health.check_workers(redis_client)
+    finally:
+        await redis_client.aclose()
 
-        if task_status.state:
-            return {"celery": "running"}
-        else:
-            return {"celery": "error"}
-    except Exception as e:
-        return {"celery": "error", "details": str(e)}
+# Readiness Checks Run Concurrently With Per-Check Timeouts; The Report is Cached Briefly
+health_checker = HealthChecker({
+    "database": check_database_ready,
+    "redis": check_redis_ready,
+    "celery": check_workers_ready,
+})
+
+@app.get("/api/v1/health/live", tags=["MONITORING"])
+async def liveness_check()-> dict:
+    """
+    ## **Liveness Check**
+
+    The API process is up and serving requests. Does not touch any dependency.
+    """
+    return {"status": "ok"}
+
+@app.get("/api/v1/health/ready", tags=["MONITORING"])
+async def readiness_check()-> dict:
+    """
+    ## **Readiness Check**
+
+    **Checks Database (`SELECT 1`), Redis (`PING`) And Celery Worker Heartbeats.**
+
+    Returns `503` if any check fails. Results are cached for `HEALTH_CACHE_TTL` seconds.
+    """
+    report = await health_checker.report()
+    if report["status"] != "ok":
+        raise HTTPException(status_code=503, detail=report)
+    return report
 
 # Health Check Endpoint
 @app.get("/api/v1/health", tags=["MONITORING"])
-async def health_check(db: AsyncSession = Depends(get_db))-> dict:
+async def health_check()-> dict:
     """
     ## **Health Check Endpoint**
     
     **Checks API, Database, Redis, and Celery Worker Status.**
-    """
-    db_status = await check_database(db)
-    redis_status = await check_redis()
-    celery_status = await check_celery()
 
+    Same checks as `/api/v1/health/ready`; no moderation task is enqueued.
+    """
+    report = await health_checker.report()
     health_status = {
         "api": "running",
-        "status": "ok",
-        "database": db_status,
-        "redis": redis_status,
-        "celery": celery_status
+        "status": report["status"],
+        "database": report["checks"]["database"],
+        "redis": report["checks"]["redis"],
+        "celery": report["checks"]["celery"]
     }
 
     # If any component fails, return HTTP 500
-    if "error" in db_status.values() or "error" in redis_status.values() or "error" in celery_status.values():
+    if report["status"] != "ok":
         raise HTTPException(status_code=500, detail=health_status)
 
     return health_status
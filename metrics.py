@@ -0,0 +1,276 @@
+import os
+import socket
+import threading
+import time
+from dotenv import load_dotenv
+from prometheus_client import Counter, Histogram, Gauge
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess, values
+
+load_dotenv()
+
+# Multi-Process Mode: When Set, Every API Worker, Celery Worker And Beat Process Writes Its
+# Metrics to mmap Files in This (Shared) Directory, And The Exposition Endpoints Merge Them.
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+def process_identifier() -> str:
+    """Host-Qualified PID, so Containers Sharing The Directory (Where Everything is PID 1) Never Collide."""
+    return f"{socket.gethostname()}_{os.getpid()}"
+
+if PROMETHEUS_MULTIPROC_DIR:
+    # Must be installed before any metric below is created
+    values.ValueClass = values.MultiProcessValue(process_identifier=process_identifier)
+
+def metrics_registry():
+    """Registry to Expose: This Process's Registry, or a Merged View of Every Process in Multi-Process Mode."""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=PROMETHEUS_MULTIPROC_DIR)
+    return registry
+
+def mark_process_dead() -> None:
+    """Drops This Process's Live Gauges From The Merged View (Call on Process Shutdown)."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(process_identifier(), PROMETHEUS_MULTIPROC_DIR)
+
+# Prometheus Metrics
+REQUEST_COUNT = Counter("api_requests_total",
+                        "Total API Requests", 
+                        ["method", "endpoint"],
+                        registry=REGISTRY)
+
+REQUEST_LATENCY = Histogram("api_request_duration_seconds",
+                            "API Request Duration",
+                            ["method", "endpoint"],
+                            registry=REGISTRY)
+
+REQUESTS_IN_PROGRESS = Gauge("api_requests_in_progress",
+                             "API Requests Currently Being Served",
+                             ["method"],
+                             multiprocess_mode="livesum",
+                             registry=REGISTRY)
+
+ERROR_COUNT = Counter("api_errors_total",
+                      "Total API Errors by Exception Type And Normalized Error Code",
+                      ["method", "endpoint", "exception", "code"],
+                      registry=REGISTRY)
+
+# Admission Control Metrics
+ADMISSION_ESTIMATED_WAIT = Gauge("admission_estimated_wait_seconds",
+                                 "Estimated Queue Wait Per Lane",
+                                 ["lane"],
+                                 multiprocess_mode="mostrecent",
+                                 registry=REGISTRY)
+
+ADMISSION_REJECTIONS = Counter("admission_rejections_total",
+                               "Submissions Rejected by Admission Control",
+                               ["lane", "priority"],
+                               registry=REGISTRY)
+
+# Task Publisher Metrics
+PUBLISH_LATENCY = Histogram("task_publish_duration_seconds",
+                            "Time From Buffering a Task to Broker Confirmation",
+                            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+                            registry=REGISTRY)
+
+PUBLISH_BATCH_SIZE = Histogram("task_publish_batch_size",
+                               "Number of Tasks Published Per Batch",
+                               buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+                               registry=REGISTRY)
+
+PUBLISH_BUFFER_DEPTH = Gauge("task_publish_buffer_depth",
+                             "Tasks Waiting in The In-Process Publish Buffer",
+                             multiprocess_mode="livesum",
+                             registry=REGISTRY)
+
+# Idempotency Metrics
+IDEMPOTENT_REPLAYS = Counter("idempotent_replays_total",
+                             "Duplicate Submissions Answered With The Original Response Instead of Being Enqueued",
+                             ["endpoint"],
+                             registry=REGISTRY)
+
+# Tenant Fair Queuing Metrics (Recorded by The Dispatcher)
+TENANT_QUEUE_DEPTH = Gauge("tenant_queue_depth",
+                           "Submissions Waiting in a Tenant Sub-Queue",
+                           ["tenant", "lane"],
+                           multiprocess_mode="mostrecent",
+                           registry=REGISTRY)
+
+TENANT_QUEUE_WAIT = Histogram("tenant_queue_wait_seconds",
+                              "Time From Submission to Dispatch Into The Celery Lane",
+                              ["tenant"],
+                              buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+                              registry=REGISTRY)
+
+TENANT_DISPATCHED = Counter("tenant_dispatched_total",
+                            "Submissions Forwarded From Tenant Sub-Queues to Celery",
+                            ["tenant", "lane"],
+                            registry=REGISTRY)
+
+TENANT_DISPATCH_MALFORMED = Counter("tenant_dispatch_malformed_total",
+                                    "Undecodable Submissions Moved From Tenant Sub-Queues to The Dead-Letter List",
+                                    ["tenant", "lane"],
+                                    registry=REGISTRY)
+
+# Rate Limiter Metrics
+RATE_LIMIT_DECISIONS = Counter("rate_limit_decisions_total",
+                               "Submissions Accepted or Rejected by The Rate Limiter",
+                               ["decision", "identity"],
+                               registry=REGISTRY)
+
+RATE_LIMIT_ACTIVE_KEYS = Gauge("rate_limit_active_keys",
+                               "Rate Limit Buckets Held in Process",
+                               multiprocess_mode="livesum",
+                               registry=REGISTRY)
+
+RATE_LIMIT_SYNC_FAILURES = Counter("rate_limit_sync_failures_total",
+                                   "Failed Reconciliations of Local Buckets With Redis",
+                                   registry=REGISTRY)
+
+# Result Lookup Metrics (Hit Ratio Per Storage Tier)
+RESULT_LOOKUPS = Counter("result_lookups_total",
+                         "Moderation Result Lookups Per Storage Tier",
+                         ["tier", "outcome"],
+                         registry=REGISTRY)
+
+RESULT_CACHE_ENTRIES = Gauge("result_cache_entries",
+                             "Entries in The In-Process Result Cache",
+                             multiprocess_mode="livesum",
+                             registry=REGISTRY)
+
+RESULT_CACHE_BYTES = Gauge("result_cache_bytes",
+                           "Approximate Size of The In-Process Result Cache",
+                           multiprocess_mode="livesum",
+                           registry=REGISTRY)
+
+# Bloom Filter Metrics (Unknown ID Gate on The Result Lookup Path)
+BLOOM_CHECKS = Counter("bloom_filter_checks_total",
+                       "Result Lookups Checked Against The Bloom Filter",
+                       ["outcome"],
+                       registry=REGISTRY)
+
+BLOOM_FALSE_POSITIVE_RATE = Gauge("bloom_filter_false_positive_rate",
+                                  "Estimated Bloom Filter False Positive Rate After The Last Rebuild",
+                                  multiprocess_mode="mostrecent",
+                                  registry=REGISTRY)
+
+BLOOM_REBUILD_SECONDS = Gauge("bloom_filter_rebuild_seconds",
+                              "Duration of The Last Bloom Filter Rebuild",
+                              multiprocess_mode="mostrecent",
+                              registry=REGISTRY)
+
+BLOOM_ITEMS = Gauge("bloom_filter_items",
+                    "IDs Added During The Last Bloom Filter Rebuild",
+                    multiprocess_mode="mostrecent",
+                    registry=REGISTRY)
+
+# Worker Metrics (Recorded by Celery Worker And Beat Processes)
+TASK_DURATION = Histogram("celery_task_duration_seconds",
+                          "Celery Task Run Time",
+                          ["task", "state"],
+                          buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+                          registry=REGISTRY)
+
+TASKS_PUBLISHED = Counter("celery_tasks_published_total",
+                          "Tasks Sent to The Broker (API, Retries And Beat Schedules)",
+                          ["task"],
+                          registry=REGISTRY)
+
+UPSTREAM_LATENCY = Histogram("moderation_upstream_duration_seconds",
+                             "Moderation API Call Latency",
+                             ["kind", "backend"],
+                             buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+                             registry=REGISTRY)
+
+STORE_LATENCY = Histogram("moderation_store_duration_seconds",
+                          "Result Write Latency Per Store",
+                          ["store", "operation"],
+                          buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+                          registry=REGISTRY)
+
+# Logging Pipeline Metrics
+LOG_EVENTS_DROPPED = Counter("log_events_dropped_total",
+                             "Log Events Dropped by Sampling or a Full Log Queue",
+                             ["reason"],
+                             registry=REGISTRY)
+
+# Label Cardinality Guard
+METRIC_MAX_LABEL_SETS = int(os.getenv("METRIC_MAX_LABEL_SETS", "1000"))
+OVERFLOW_LABEL = "other"
+
+LABEL_SET_OVERFLOWS = Counter("metric_label_set_overflows_total",
+                              "Observations Folded Into The Overflow Series After a Metric Hit its Label Set Cap",
+                              ["metric"],
+                              registry=REGISTRY)
+
+class LabelGuard:
+    """
+    Caps The Number of Label Combinations a Metric Can Create in This Process.
+
+    Combinations beyond `max_series` are recorded under a single series with every label
+    set to OVERFLOW_LABEL, so a misbehaving label source cannot grow the registry without bound.
+    """
+
+    def __init__(self, metric, max_series: int = METRIC_MAX_LABEL_SETS):
+        self.metric = metric
+        self.name = metric._name
+        self.max_series = max_series
+        self._label_names = metric._labelnames
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self._label_names)
+        if key not in self._seen:
+            with self._lock:
+                if key not in self._seen:
+                    if len(self._seen) >= self.max_series:
+                        LABEL_SET_OVERFLOWS.labels(metric=self.name).inc()
+                        key = (OVERFLOW_LABEL,) * len(self._label_names)
+                    else:
+                        self._seen.add(key)
+        return self.metric.labels(*key)
+
+GUARDED_REQUEST_COUNT = LabelGuard(REQUEST_COUNT)
+GUARDED_REQUEST_LATENCY = LabelGuard(REQUEST_LATENCY)
+GUARDED_REQUESTS_IN_PROGRESS = LabelGuard(REQUESTS_IN_PROGRESS)
+GUARDED_ERROR_COUNT = LabelGuard(ERROR_COUNT)
+
+# JSON Metrics View
+METRICS_JSON_CACHE_TTL = float(os.getenv("METRICS_JSON_CACHE_TTL", "1.0"))
+
+class MetricsSnapshot:
+    """
+    Short-Lived JSON View of The Exposed Registry.
+
+    Built directly from registry.collect() (no text exposition round trip) and reused for
+    `ttl` seconds, so dashboards polling every second cost one collection per interval.
+    """
+
+    def __init__(self, get_registry=metrics_registry, ttl: float = METRICS_JSON_CACHE_TTL):
+        self.get_registry = get_registry
+        self.ttl = ttl
+        self._families = None
+        self._expires_at = 0.0
+
+    def get(self, prefixes=None) -> dict:
+        """Metric Families by Name, Optionally Limited to Names Starting With One of `prefixes`."""
+        if self._families is None or self._expires_at <= time.monotonic():
+            self._families = self._collect()
+            self._expires_at = time.monotonic() + self.ttl
+        if not prefixes:
+            return self._families
+        return {name: family for name, family in self._families.items() if name.startswith(tuple(prefixes))}
+
+    def _collect(self) -> dict:
+        families = {}
+        for metric in self.get_registry().collect():
+            families[metric.name] = {
+                "type": metric.type,
+                "help": metric.documentation,
+                "values": [
+                    {"name": sample.name, "labels": sample.labels, "value": sample.value}
+                    for sample in metric.samples
+                ],
+            }
+        return families
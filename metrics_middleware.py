@@ -0,0 +1,53 @@
+import re
+import time
+
+from metrics import GUARDED_REQUEST_COUNT, GUARDED_REQUEST_LATENCY, GUARDED_REQUESTS_IN_PROGRESS
+
+# Label Used For Requests That Matched no Route (Keeps Raw Paths Out of The Label Set)
+UNMATCHED_ENDPOINT = "unmatched"
+
+# W3C traceparent: version-trace_id-parent_id-flags
+TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-[0-9a-f]{2}$")
+
+def _exemplar(headers: list):
+    """Trace ID From traceparent (or X-Request-ID) to Attach to The Latency Observation."""
+    request_id = None
+    for name, value in headers:
+        if name == b"traceparent":
+            match = TRACEPARENT.match(value.decode("latin-1"))
+            if match:
+                return {"trace_id": match.group(1)}
+        elif name == b"x-request-id":
+            request_id = value.decode("latin-1")[:64]
+    return {"request_id": request_id} if request_id else None
+
+class PrometheusMiddleware:
+    """
+    Pure ASGI Request Metrics Middleware.
+
+    The endpoint label is the path template of the route the router already matched,
+    read from scope["route"] after dispatch, so routes are never matched twice and
+    no per-request task or response streaming wrapper is added.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = GUARDED_REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            duration = time.perf_counter() - started
+            in_progress.dec()
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or UNMATCHED_ENDPOINT
+            GUARDED_REQUEST_COUNT.labels(method=method, endpoint=endpoint).inc()
+            GUARDED_REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration, exemplar=_exemplar(scope["headers"]))
@@ -1,14 +1,127 @@
-from sqlalchemy import Column, String, JSON, DateTime, func
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Column, String, Boolean, Integer, SmallInteger, REAL, DateTime, Enum, Index, func
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from categories import CATEGORY_INDEX, category_mask, category_vector
 from database import Base
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
+# Submission Kinds (Stored as a Postgres Enum)
+SOURCE_TYPES = ("text", "image")
+
 class ModerationResult(Base):
     __tablename__ = "moderation_results"
 
-    text_id = Column(String, primary_key=True, index=True)
-    text = Column(String, nullable=False)
-    result = Column(JSON, nullable=False)
+    # Fixed-width columns first, widest alignment first, so rows carry no padding
+    # Range-partitioned by created_at, so the partition key is part of the primary key
+    text_id = Column(UUID(as_uuid=False), primary_key=True)
+    created_at = Column(DateTime, primary_key=True, nullable=False, server_default=func.now())
+    # When the result was first written; rollups consume rows by this watermark (see rollups.py)
+    stored_at = Column(DateTime)
+    max_score = Column(REAL)
+    # Flagged categories as bits (bit i = CATEGORIES[i]), for bitwise filters without JSON parsing
+    category_mask = Column(Integer, nullable=False, server_default="0", default=0)
+    source_type = Column(Enum(*SOURCE_TYPES, name="moderation_source_type"), nullable=False, default="text")
+    flagged = Column(Boolean)
     status = Column(String, nullable=False, default="pending")
-    created_at = Column(DateTime, server_default=func.now())
+    model = Column(String)
+    # Our own decision for the result and the policy (name@digest) that made it, see policy.py
+    decision = Column(String)
+    policy = Column(String)
+    # Category scores in CATEGORIES order
+    category_scores = Column(ARRAY(REAL))
+    text = Column(String, nullable=False)
+    result = Column(JSONB, nullable=False)
+
+    __table_args__ = (
+        # Recent flagged results by category: time range on the index, mask tested from the index tuple
+        Index("idx_moderation_flagged_created_at_mask", "created_at", "category_mask",
+              postgresql_where=sql_text("category_mask <> 0")),
+        Index("idx_moderation_stored_at", "stored_at", postgresql_where=sql_text("stored_at IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+class ModerationRollup(Base):
+    """Counts And Score Histogram of Completed Results Per Time Bucket, Source Type And Category."""
+    __tablename__ = "moderation_rollups"
+
+    granularity = Column(String, primary_key=True)  # 'minute' or 'hour'
+    bucket = Column(DateTime, primary_key=True)
+    source_type = Column(Enum(*SOURCE_TYPES, name="moderation_source_type", create_type=False), primary_key=True)
+    # Index into CATEGORIES, or -1 for the result as a whole (flagged, max_score)
+    category = Column(SmallInteger, primary_key=True)
+    results = Column(Integer, nullable=False)
+    flagged = Column(Integer, nullable=False)
+    # Results per score bin of width 1 / len(histogram)
+    histogram = Column(ARRAY(Integer), nullable=False)
+
+class RollupWatermark(Base):
+    """stored_at Up to Which Results Have Been Folded Into The Rollups."""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    processed_until = Column(DateTime, nullable=False)
+
+def parse_text_id(value: str) -> Optional[str]:
+    """Canonical Form of a Moderation ID, or None if it is Not a UUID (And Cannot Exist)."""
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def new_text_id() -> str:
+    """
+    A UUIDv7 (RFC 9562): 48-Bit Unix Millisecond Timestamp Followed by Random Bits.
+    IDs Sort by Creation Time And Tell Which Partition Holds Their Row.
+    """
+    milliseconds = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    value = ((milliseconds & ((1 << 48) - 1)) << 80) | (0x7 << 76) | ((random_bits >> 62) & 0xFFF) << 64 \
+            | (0b10 << 62) | (random_bits & ((1 << 62) - 1))
+    return str(uuid.UUID(int=value))
+
+def text_id_created_at(text_id: str) -> Optional[datetime]:
+    """Creation Time Encoded in a UUIDv7 ID (Naive Local Time, Like created_at); None For Other IDs."""
+    try:
+        value = uuid.UUID(text_id)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if value.version != 7:
+        return None
+    return datetime.fromtimestamp((value.int >> 80) / 1000)
+
+def id_filter(text_id: str) -> list:
+    """
+    WHERE Clauses For a Lookup by ID. For UUIDv7 IDs a created_at Window Around The Encoded
+    Time Lets PostgreSQL Prune The Lookup to One or Two Partitions (The Day Either Way Absorbs
+    Time Zone Differences Between The API And The Workers). Older IDs Probe Every Partition.
+    """
+    clauses = [ModerationResult.text_id == text_id]
+    created_at = text_id_created_at(text_id)
+    if created_at is not None:
+        clauses += [ModerationResult.created_at >= created_at - timedelta(days=1),
+                    ModerationResult.created_at < created_at + timedelta(days=1)]
+    return clauses
+
+def result_columns(moderation_data: dict) -> dict:
+    """Hot Fields of an Upstream Moderation Response, Extracted Into Typed Columns."""
+    results = moderation_data.get("results") or [{}]
+    first = results[0] if isinstance(results[0], dict) else {}
+    category_scores = first.get("category_scores") or {}
+    scores = [score for score in category_scores.values() if isinstance(score, (int, float))]
+    # Categories outside the fixed layout stay in the JSONB result only
+    categories = {name: flagged for name, flagged in (first.get("categories") or {}).items() if name in CATEGORY_INDEX}
+    return {
+        "flagged": first.get("flagged"),
+        "model": moderation_data.get("model"),
+        "max_score": max(scores) if scores else None,
+        "category_mask": category_mask(categories),
+        "category_scores": category_vector(category_scores) if category_scores else None,
+    }
@@ -0,0 +1,108 @@
+import os
+import re
+from datetime import date, datetime, timedelta, time as dt_time
+from typing import NamedTuple, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from structlog import get_logger
+
+load_dotenv()
+log = get_logger()
+
+# moderation_results is Range-Partitioned by created_at, One Partition Per Day
+PARTITIONED_TABLE = "moderation_results"
+PARTITION_PREFIX = "moderation_results_p"
+
+# Days of Results Kept; Whole Partitions Older Than This Are Dropped
+PARTITION_RETENTION_DAYS = int(os.getenv("PARTITION_RETENTION_DAYS", "30"))
+# Days of Partitions Created Ahead, so Inserts Never Fall Through to The Default Partition
+PARTITION_PRECREATE_DAYS = int(os.getenv("PARTITION_PRECREATE_DAYS", "7"))
+
+_BOUND = re.compile(r"FROM \((MINVALUE|'[^']+')\) TO \((MAXVALUE|'[^']+')\)")
+
+class Partition(NamedTuple):
+    """One Attached Partition; lower/upper Are None For MINVALUE/MAXVALUE, Both None For DEFAULT."""
+    name: str
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+    default: bool = False
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+def parse_bound(expression: str) -> tuple:
+    """(lower, upper) From pg_get_expr(relpartbound), e.g. FOR VALUES FROM ('2026-10-19 00:00:00') TO (...)."""
+    match = _BOUND.search(expression)
+    if match is None:
+        return None, None
+    return tuple(None if value.endswith("VALUE") else datetime.fromisoformat(value.strip("'")) for value in match.groups())
+
+def retention_cutoff(today: date, retention_days: int = PARTITION_RETENTION_DAYS) -> datetime:
+    """Start of The Oldest Day Kept; Anything Entirely Before it Has Expired."""
+    return datetime.combine(today - timedelta(days=retention_days), dt_time.min)
+
+def plan_partitions(existing: list, today: date, retention_days: int = PARTITION_RETENTION_DAYS,
+                    precreate_days: int = PARTITION_PRECREATE_DAYS) -> tuple:
+    """
+    Decides Which Daily Partitions to Create And Which to Drop.
+
+    Returns ([(name, start, end)], [name]): one partition for each day from today through
+    `precreate_days` ahead that no existing partition covers yet, and every partition whose
+    upper bound is at or before the retention cutoff. The default partition is never dropped.
+    """
+    ranges = [partition for partition in existing if not partition.default]
+    create = []
+    for offset in range(precreate_days + 1):
+        start = datetime.combine(today + timedelta(days=offset), dt_time.min)
+        covered = any((p.lower is None or p.lower <= start) and (p.upper is None or start < p.upper) for p in ranges)
+        if not covered:
+            create.append((partition_name(start.date()), start, start + timedelta(days=1)))
+
+    cutoff = retention_cutoff(today, retention_days)
+    drop = [p.name for p in ranges if p.upper is not None and p.upper <= cutoff]
+    return create, drop
+
+async def list_partitions(connection) -> list:
+    rows = await connection.execute(text("""
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = CAST(:table AS regclass)
+    """), {"table": PARTITIONED_TABLE})
+    partitions = []
+    for name, bound in rows:
+        if bound == "DEFAULT":
+            partitions.append(Partition(name, None, None, default=True))
+        else:
+            partitions.append(Partition(name, *parse_bound(bound)))
+    return partitions
+
+async def maintain_partitions(connection, today: Optional[date] = None,
+                              retention_days: int = PARTITION_RETENTION_DAYS,
+                              precreate_days: int = PARTITION_PRECREATE_DAYS) -> dict:
+    """
+    Pre-Creates Upcoming Daily Partitions And Drops Expired Ones.
+
+    Retention is a DROP TABLE per expired day: a catalog change that unlinks the files, with
+    no row-by-row DELETE, no dead tuples and no vacuum debt. Each statement runs in its own
+    savepoint, so one failure (e.g. rows for that day already sitting in the default
+    partition) is logged and does not block the rest.
+    """
+    create, drop = plan_partitions(await list_partitions(connection), today or date.today(),
+                                   retention_days, precreate_days)
+    stats = {"created": [], "dropped": [], "failed": []}
+    statements = [("created", name, f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARTITIONED_TABLE} "
+                                    f"FOR VALUES FROM ('{start.isoformat(' ')}') TO ('{end.isoformat(' ')}')")
+                  for name, start, end in create]
+    statements += [("dropped", name, f"DROP TABLE IF EXISTS {name}") for name in drop]
+
+    for outcome, name, statement in statements:
+        try:
+            async with connection.begin_nested():
+                await connection.execute(text(statement))
+            stats[outcome].append(name)
+        except Exception as e:
+            log.error("Partition Maintenance Failed", partition=name, error=str(e))
+            stats["failed"].append(name)
+    return stats
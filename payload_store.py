@@ -0,0 +1,53 @@
+import hashlib
+import os
+import zlib
+import redis.asyncio as redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Texts Larger Than This (UTF-8 Bytes) Are Stored Once And Passed Around by Reference
+CLAIM_CHECK_THRESHOLD = int(os.getenv("CLAIM_CHECK_THRESHOLD", "4096"))
+
+# Payloads Must Outlive Task Retries And The Hourly DLQ Replay
+PAYLOAD_TTL = int(os.getenv("PAYLOAD_TTL", str(2 * 24 * 3600)))
+
+PAYLOAD_KEY_PREFIX = "payload:"
+
+class PayloadNotFound(Exception):
+    """Raised When a Claim-Check Reference Points to a Missing or Expired Payload."""
+
+# Binary Redis Connection (Payloads Are Stored Compressed)
+async def get_payload_redis():
+    return redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
+def needs_claim_check(text: str) -> bool:
+    """Whether a Text is Large Enough to be Stored by Reference."""
+    # Cheap upper bound first: a str never encodes to fewer bytes than characters
+    return len(text) > CLAIM_CHECK_THRESHOLD or len(text.encode("utf-8")) > CLAIM_CHECK_THRESHOLD
+
+def payload_ref(text: str) -> str:
+    """Content-Addressed Reference, so Identical Payloads Are Stored Only Once."""
+    return PAYLOAD_KEY_PREFIX + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+async def store_payload(text: str) -> str:
+    """Stores a Compressed Payload And Returns Its Reference."""
+    ref = payload_ref(text)
+    redis_client = await get_payload_redis()
+    try:
+        await redis_client.set(ref, zlib.compress(text.encode("utf-8")), ex=PAYLOAD_TTL)
+    finally:
+        await redis_client.aclose()
+    return ref
+
+async def fetch_payload(ref: str) -> str:
+    """Loads And Decompresses The Payload Behind a Reference."""
+    redis_client = await get_payload_redis()
+    try:
+        data = await redis_client.get(ref)
+    finally:
+        await redis_client.aclose()
+
+    if data is None:
+        raise PayloadNotFound(f"Payload {ref} Not Found or Expired")
+    return zlib.decompress(data).decode("utf-8")
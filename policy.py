@@ -0,0 +1,181 @@
+import hashlib
+import os
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+import serialization
+from categories import CATEGORIES, CATEGORY_INDEX
+
+load_dotenv()
+
+# Score a Category Must Reach to Count as Hit, Unless The Policy Sets Its Own
+DEFAULT_THRESHOLD = 0.5
+# JSON File With One Policy Per Surface (Source Type) And a "default" Policy, See The Readme
+MODERATION_POLICIES_FILE = os.getenv("MODERATION_POLICIES_FILE", "")
+
+# Without a Policies File: Block When Any Category Reaches The Default Threshold
+DEFAULT_POLICY = {
+    "name": "default",
+    "rules": [{"decision": "block", "when": {"any": list(CATEGORIES)}}],
+    "default": "allow",
+}
+
+class PolicyError(ValueError):
+    """Raised For a Malformed Policy."""
+
+class ScoreContext(NamedTuple):
+    """Everything a Compiled Condition Reads, Computed Once Per Score Matrix."""
+    scores: np.ndarray    # (n, len(CATEGORIES)) float32, NaN where there is no score
+    hits: np.ndarray      # (n, len(CATEGORIES)) bool, score >= category threshold
+    weighted: np.ndarray  # (n,) float32, weighted sum of the scores
+
+def score_matrix(vectors) -> np.ndarray:
+    """
+    Score Vectors (category_scores Rows) as an (n, len(CATEGORIES)) float32 Matrix. Missing
+    Scores And Missing Vectors Become NaN, Which Never Reaches a Threshold.
+    """
+    width = len(CATEGORIES)
+    try:
+        matrix = np.array(vectors, dtype=np.float32)  # None scores convert to NaN
+        if matrix.ndim == 2 and matrix.shape[1] == width:
+            return matrix
+    except (TypeError, ValueError):
+        pass
+    # Rows without a vector at all
+    return np.array([[np.nan] * width if vector is None else vector for vector in vectors], dtype=np.float32).reshape(-1, width)
+
+def _category(name) -> int:
+    if name not in CATEGORY_INDEX:
+        raise PolicyError(f"Unknown Category: {name}")
+    return CATEGORY_INDEX[name]
+
+def _compile(expression, uses: set) -> Callable[[ScoreContext], np.ndarray]:
+    """
+    Compiles a Condition Into a Function of The ScoreContext Returning One Boolean Per Row:
+        "hate"                                    hate score >= its threshold
+        {"any": [...]} / {"all": [...]}           at least one / every sub-condition
+        {"not": condition}
+        {"score": "hate", "gte": 0.9}             explicit bound ("gte" and/or "lt")
+        {"weighted": {"gte": 1.2}}                weighted sum of the scores ("gte" and/or "lt")
+    """
+    if isinstance(expression, str):
+        column = _category(expression)
+        return lambda context: context.hits[:, column]
+    if not isinstance(expression, dict) or len(expression.keys() - {"gte", "lt"}) != 1:
+        raise PolicyError(f"Invalid Condition: {expression!r}")
+
+    if "any" in expression or "all" in expression:
+        combine = "any" if "any" in expression else "all"
+        parts = expression[combine]
+        if not isinstance(parts, list) or not parts:
+            raise PolicyError(f"'{combine}' Needs a Non-Empty List of Conditions")
+        if all(isinstance(part, str) for part in parts):
+            # Plain categories reduce over a column slice in one call
+            columns = [_category(part) for part in parts]
+            return (lambda context: context.hits[:, columns].any(axis=1)) if combine == "any" \
+                else (lambda context: context.hits[:, columns].all(axis=1))
+        compiled = [_compile(part, uses) for part in parts]
+        reduce = np.logical_or.reduce if combine == "any" else np.logical_and.reduce
+        return lambda context: reduce([condition(context) for condition in compiled])
+
+    if "not" in expression:
+        condition = _compile(expression["not"], uses)
+        return lambda context: ~condition(context)
+
+    if "score" in expression:
+        column = _category(expression["score"])
+        return _bounds(expression, lambda context: context.scores[:, column])
+
+    if "weighted" in expression:
+        uses.add("weighted")
+        return _bounds(expression["weighted"], lambda context: context.weighted)
+
+    raise PolicyError(f"Invalid Condition: {expression!r}")
+
+def _bounds(expression: dict, values: Callable) -> Callable:
+    if not isinstance(expression, dict) or not expression.keys() & {"gte", "lt"}:
+        raise PolicyError(f"Condition Needs 'gte' And/or 'lt': {expression!r}")
+    low, high = expression.get("gte"), expression.get("lt")
+    if low is not None and high is not None:
+        return lambda context: (values(context) >= low) & (values(context) < high)
+    if low is not None:
+        return lambda context: values(context) >= low
+    return lambda context: values(context) < high
+
+class Policy:
+    """
+    A Decision Policy Compiled Into Vectorized NumPy Evaluation.
+
+    Spec: {"name", "thresholds": {category: score}, "weights": {category: weight},
+           "rules": [{"decision", "when": condition}, ...], "default": decision}.
+    Rules are checked in order and the first matching rule decides; rows matching none get
+    the default. `evaluate` works on a whole score matrix at once, so re-deciding a chunk of
+    rows costs a handful of array operations, however many rows it holds.
+    """
+
+    def __init__(self, spec: dict):
+        if not isinstance(spec, dict) or not spec.get("name"):
+            raise PolicyError("A Policy Needs a Name")
+        rules = spec.get("rules") or []
+        if not all(isinstance(rule, dict) and rule.get("decision") and "when" in rule for rule in rules):
+            raise PolicyError("Every Rule Needs a 'decision' And a 'when' Condition")
+
+        self.name = spec["name"]
+        self.thresholds = np.full(len(CATEGORIES), DEFAULT_THRESHOLD, dtype=np.float32)
+        for name, threshold in (spec.get("thresholds") or {}).items():
+            self.thresholds[_category(name)] = threshold
+        self.weights = np.zeros(len(CATEGORIES), dtype=np.float32)
+        for name, weight in (spec.get("weights") or {}).items():
+            self.weights[_category(name)] = weight
+
+        self._uses = set()
+        self._conditions = [_compile(rule["when"], self._uses) for rule in rules]
+        # Decision labels by code: one per rule, then the default
+        self.labels = np.array([rule["decision"] for rule in rules] + [spec.get("default", "allow")], dtype=object)
+        # Same spec, same ID: rows already decided by this exact policy can be skipped
+        digest = hashlib.sha256(serialization.dumps_pretty(spec).encode("utf-8")).hexdigest()[:12]
+        self.id = f"{self.name}@{digest}"
+
+    def evaluate(self, scores: np.ndarray) -> np.ndarray:
+        """Decision Codes (Indexes Into `labels`) For an (n, len(CATEGORIES)) Score Matrix."""
+        weighted = np.nan_to_num(scores) @ self.weights if "weighted" in self._uses else None
+        with np.errstate(invalid="ignore"):
+            context = ScoreContext(scores, scores >= self.thresholds, weighted)
+            conditions = [condition(context) for condition in self._conditions]
+        return np.select(conditions, np.arange(len(conditions), dtype=np.int16), default=len(conditions)) \
+            if conditions else np.full(len(scores), 0, dtype=np.int16)
+
+    def decide(self, scores: np.ndarray) -> np.ndarray:
+        """Decision Labels For an (n, len(CATEGORIES)) Score Matrix."""
+        return self.labels[self.evaluate(scores)]
+
+    def decide_one(self, vector: Optional[list]) -> str:
+        """Decision For One Result's Score Vector (The Worker's Inline Path)."""
+        return str(self.decide(score_matrix([vector]))[0])
+
+class PolicySet:
+    """The Policy of Each Surface (Source Type), With a Default For The Rest."""
+
+    def __init__(self, policies: Dict[str, Policy]):
+        if "default" not in policies:
+            policies = {**policies, "default": Policy(DEFAULT_POLICY)}
+        self.policies = policies
+
+    def for_surface(self, surface: str) -> Policy:
+        return self.policies.get(surface) or self.policies["default"]
+
+    @classmethod
+    def from_spec(cls, spec: dict) -> "PolicySet":
+        """From {"default": policy, "text": policy, "image": policy} (Every Entry Optional)."""
+        return cls({surface: Policy(policy) for surface, policy in spec.items()})
+
+@lru_cache(maxsize=1)
+def get_policies() -> PolicySet:
+    """Policies Configured From MODERATION_POLICIES_FILE (Shared by The Workers And Bulk Re-Decisions)."""
+    if not MODERATION_POLICIES_FILE:
+        return PolicySet({})
+    with open(MODERATION_POLICIES_FILE, "rb") as file:
+        return PolicySet.from_spec(serialization.loads(file.read()))
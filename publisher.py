@@ -0,0 +1,274 @@
+import asyncio
+import time
+import uuid
+from typing import NamedTuple, Optional
+
+from structlog import get_logger
+import serialization
+from celery_worker import broker_message
+from metrics import PUBLISH_LATENCY, PUBLISH_BATCH_SIZE, PUBLISH_BUFFER_DEPTH, TASKS_PUBLISHED
+from tenants import DEFAULT_TENANT, tenant_queue_key
+from idempotency import IdempotencyClaim, duplicate_from
+
+log = get_logger()
+
+# Everything One Submission Writes, in One Atomic Step:
+#   KEYS[1] Destination List    ARGV[1] 'LPUSH' (Celery Broker) or 'RPUSH' (Tenant Sub-Queue), ARGV[2] Message
+#   KEYS[2] Status Record       ARGV[3] Encoded Status, ARGV[4] TTL
+#   KEYS[3] Idempotency Key     ARGV[5] Stored Response, ARGV[6] TTL
+#   KEYS[4], KEYS[5] Bloom Filter And The Filter Being Rebuilt, ARGV[7..] Bit Positions
+# Unused keys are ''. Returns The Stored Response if The Idempotency Key Was Already Claimed
+# (Nothing Else is Written), Otherwise False. The status record is written before the task
+# message, so a worker can never finish before it and be overwritten by it. Redis does not
+# roll back a script that fails part way, so the key is only claimed once the message is in
+# (a failed push leaves no claim behind); scripts never interleave, so GET Then SET is safe.
+SUBMIT_SCRIPT = """
+if KEYS[3] ~= '' then
+    local stored = redis.call('GET', KEYS[3])
+    if stored then
+        return stored
+    end
+end
+if KEYS[2] ~= '' then
+    redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[4])
+end
+redis.call(ARGV[1], KEYS[1], ARGV[2])
+if KEYS[3] ~= '' then
+    redis.call('SET', KEYS[3], ARGV[5], 'EX', ARGV[6])
+end
+for k = 4, 5 do
+    if KEYS[k] ~= '' and redis.call('EXISTS', KEYS[k]) == 1 then
+        for i = 7, #ARGV do
+            redis.call('SETBIT', KEYS[k], ARGV[i], 1)
+        end
+    end
+end
+return false
+"""
+
+class PublisherOverloaded(Exception):
+    """Raised When The Publish Buffer is Full."""
+
+class PublishTimedOut(Exception):
+    """
+    Raised When The Broker Did Not Confirm a Submission in Time. If it Was Not Sent Yet it
+    Never Will be; if it Was Already Being Sent (`may_be_published`) it May Still Run.
+    """
+
+    def __init__(self, task_id: str, may_be_published: bool):
+        super().__init__(f"Publishing Task {task_id} Timed Out" + (", it May Still be Processed" if may_be_published else ""))
+        self.task_id = task_id
+        self.may_be_published = may_be_published
+
+class StatusRecord(NamedTuple):
+    """Pending Status Written Together With The Task Message."""
+    key: str
+    value: bytes
+    ttl: int
+
+class Submission:
+    """One Buffered Task And Everything That Has to be Written With it."""
+
+    __slots__ = ("task", "args", "options", "tenant", "idempotency", "status", "known_id", "future", "enqueued_at",
+                 "sending")
+
+    def __init__(self, task, args: list, options: dict, tenant: Optional[str], idempotency: Optional[IdempotencyClaim],
+                 status: Optional[StatusRecord], known_id: Optional[str], future: asyncio.Future):
+        self.task = task
+        self.args = args
+        self.options = options
+        self.tenant = tenant
+        self.idempotency = idempotency
+        self.status = status
+        self.known_id = known_id
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+        self.sending = False
+
+class TaskPublisher:
+    """
+    Non-Blocking Celery Producer For The API Event Loop.
+
+    Handlers put submissions on a bounded in-process buffer and await a future. A single
+    background task drains the buffer in batches and hands each batch to `_send`, so a slow
+    broker round trip never blocks the loop. Subclasses write the batch to Redis.
+    """
+
+    def __init__(self, get_redis, max_buffer: int = 10000, max_batch: int = 100, publish_timeout: float = 10.0):
+        self.get_redis = get_redis
+        self.max_buffer = max_buffer
+        self.max_batch = max_batch
+        self.publish_timeout = publish_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Starts The Background Publisher on The Running Event Loop."""
+        if self._runner is None or self._runner.done():
+            self._queue = asyncio.Queue(maxsize=self.max_buffer)
+            self._runner = asyncio.create_task(self._run())
+            log.info("Task Publisher Started", max_buffer=self.max_buffer, max_batch=self.max_batch)
+
+    async def stop(self) -> None:
+        """Publishes Whatever is Still Buffered, Then Stops The Background Publisher."""
+        if self._runner is None:
+            return
+        await self._queue.join()
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+        log.info("Task Publisher Stopped")
+
+    async def publish(self, task, args: list, options: dict, kwargs: Optional[dict] = None,
+                      tenant: Optional[str] = None, idempotency: Optional[IdempotencyClaim] = None,
+                      task_id: Optional[str] = None, status: Optional[StatusRecord] = None,
+                      known_id: Optional[str] = None) -> str:
+        """
+        Buffers a Task For Publishing And Returns Its Celery Task ID Once The Broker Accepted it.
+        Raises DuplicateSubmission if The Idempotency Key Was Already Claimed, And PublishTimedOut
+        After `publish_timeout` Seconds (a Submission Still in The Buffer is Then Dropped).
+
+        `status` is Written And `known_id` Added to The Bloom Filter Together With The Message.
+        """
+        self.start()
+        task_id = task_id or str(uuid.uuid4())
+        options = {**options, "kwargs": kwargs, "task_id": task_id}
+        future = asyncio.get_running_loop().create_future()
+        submission = Submission(task, args, options, tenant, idempotency, status, known_id, future)
+        try:
+            self._queue.put_nowait(submission)
+        except asyncio.QueueFull:
+            raise PublisherOverloaded("Task Publish Buffer is Full")
+        PUBLISH_BUFFER_DEPTH.set(self._queue.qsize())
+
+        try:
+            # On timeout the future is cancelled, which keeps a buffered submission from being sent
+            await asyncio.wait_for(future, timeout=self.publish_timeout)
+        except asyncio.TimeoutError:
+            raise PublishTimedOut(task_id, submission.sending)
+        return task_id
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            PUBLISH_BUFFER_DEPTH.set(self._queue.qsize())
+
+            # Callers that timed out were told so; sending their submissions now would run them twice
+            for submission in batch:
+                if submission.future.done():
+                    self._queue.task_done()
+            batch = [submission for submission in batch if not submission.future.done()]
+            if not batch:
+                continue
+            for submission in batch:
+                submission.sending = True
+            PUBLISH_BATCH_SIZE.observe(len(batch))
+
+            try:
+                errors = await self._send(batch)
+            except Exception as e:
+                errors = [e] * len(batch)
+
+            for submission, error in zip(batch, errors):
+                if not submission.future.done():
+                    if error is None:
+                        PUBLISH_LATENCY.observe(time.perf_counter() - submission.enqueued_at)
+                        submission.future.set_result(None)
+                    else:
+                        submission.future.set_exception(error)
+                self._queue.task_done()
+
+    async def _send(self, batch: list) -> list:
+        """Sends a Batch And Returns One Error (or None) Per Item."""
+        raise NotImplementedError
+
+class SubmitScriptPublisher(TaskPublisher):
+    """
+    Publisher That Enqueues Each Submission With One Server-Side Script.
+
+    The script claims the idempotency key, writes the pending status record, pushes the task
+    message and sets the Bloom filter bits together, so a submit costs one round trip (one
+    pipelined round trip per batch) and there is no window in which a poll or a fast worker
+    can observe only part of it. Messages are written in the Celery Redis transport's wire
+    format straight to the lane's priority list, exactly where `apply_async` would put them.
+    """
+
+    def __init__(self, get_redis, known_ids=None, **kwargs):
+        super().__init__(get_redis, **kwargs)
+        self.known_ids = known_ids
+
+    def destination(self, submission: Submission) -> tuple:
+        """(Push Command, List Key, Raw Message) For a Submission."""
+        options = submission.options
+        key, message = broker_message(submission.task.name, submission.args, options["kwargs"] or {},
+                                      options["task_id"], options["queue"], options.get("priority") or 0)
+        return "LPUSH", key, message
+
+    async def _send(self, batch: list) -> list:
+        redis_client = await self.get_redis()
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for submission in batch:
+                pipe.eval(SUBMIT_SCRIPT, *self.script_args(submission))
+            # A failed script fails only its own submission
+            results = await pipe.execute(raise_on_error=False)
+        finally:
+            await redis_client.aclose()
+
+        errors = [result if isinstance(result, Exception) else duplicate_from(result) for result in results]
+        self._record_published([submission for submission, error in zip(batch, errors) if error is None])
+        return errors
+
+    def script_args(self, submission: Submission) -> list:
+        push, list_key, message = self.destination(submission)
+        status, claim = submission.status, submission.idempotency
+        bloom_keys, positions = ["", ""], []
+        if self.known_ids is not None and submission.known_id:
+            bloom_keys, positions = [self.known_ids.key, self.known_ids.rebuild_key], self.known_ids.positions(submission.known_id)
+
+        return [5, list_key, status.key if status else "", claim.redis_key if claim else "", *bloom_keys,
+                push, message,
+                status.value if status else "", status.ttl if status else 0,
+                claim.record() if claim else "", claim.ttl if claim else 0,
+                *positions]
+
+    def _record_published(self, published: list) -> None:
+        # The script bypasses apply_async, so the before_task_publish signal does not fire
+        for submission in published:
+            TASKS_PUBLISHED.labels(task=submission.task.name).inc()
+
+class TenantQueuePublisher(SubmitScriptPublisher):
+    """
+    Publisher That Appends Submissions to Per-Tenant Sub-Queues in Redis.
+
+    Uses the same submit script with an RPUSH to the tenant's sub-queue for the lane;
+    `dispatcher.py` later forwards the messages to the Celery lanes in weighted-fair order.
+    The Celery task ID is still pre-generated here, so the API can return and track it
+    before the task reaches the broker.
+    """
+
+    def destination(self, submission: Submission) -> tuple:
+        tenant = submission.tenant or DEFAULT_TENANT
+        message = serialization.dumps_str(envelope(submission.task, submission.args, submission.options, tenant))
+        return "RPUSH", tenant_queue_key(tenant, submission.options["queue"]), message
+
+    def _record_published(self, published: list) -> None:
+        pass  # Counted when the dispatcher publishes to Celery
+
+def envelope(task, args: list, options: dict, tenant: str) -> dict:
+    """Message Stored in a Tenant Sub-Queue (Everything The Dispatcher Needs to Call send_task)."""
+    return {
+        "task": task.name,
+        "args": args,
+        "kwargs": options.get("kwargs") or {},
+        "task_id": options["task_id"],
+        "queue": options["queue"],
+        "priority": options.get("priority"),
+        "tenant": tenant,
+        "enqueued_at": time.time(),
+    }
@@ -0,0 +1,196 @@
+import asyncio
+import math
+import time
+import uuid
+from typing import Dict, Optional
+
+from structlog import get_logger
+from metrics import RATE_LIMIT_DECISIONS, RATE_LIMIT_ACTIVE_KEYS, RATE_LIMIT_SYNC_FAILURES
+
+log = get_logger()
+
+# Refills The Shared Bucket by Elapsed Time (Redis Clock), Subtracts The Tokens a Process
+# Consumed Locally Since Its Last Sync And Returns What is Left (May be Negative).
+RECONCILE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local consumed = tonumber(ARGV[3])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - consumed
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return tostring(tokens)
+"""
+
+class RateLimit:
+    """Sustained Rate (Requests Per Second) And Burst Capacity of One Token Bucket."""
+
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: Optional[float] = None) -> "RateLimit":
+        return cls(requests / 60.0, burst if burst is not None else requests)
+
+class _LocalBucket:
+    __slots__ = ("tokens", "updated_at", "unsynced", "last_used")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated_at = now
+        self.unsynced = 0.0
+        self.last_used = now
+
+class HybridRateLimiter:
+    """
+    Token-Bucket Rate Limiter Decided in Process, Reconciled With Redis in The Background.
+
+    Every API process admits requests from its own buckets, so the hot path never waits on
+    Redis. Every `sync_interval` seconds a background task reports each key's local
+    consumption to a shared bucket in Redis (one pipelined script per key) and resets the
+    local bucket to this process's share of what is left, the share being 1 / number of
+    live API processes. Cluster-wide over-admission is bounded by roughly one sync
+    interval of refill. If Redis is unreachable, processes keep enforcing their local share.
+    """
+
+    def __init__(self,
+                 get_redis,
+                 default_limit: RateLimit,
+                 limits: Optional[Dict[str, RateLimit]] = None,
+                 sync_interval: float = 1.0,
+                 idle_ttl: float = 600,
+                 key_prefix: str = "ratelimit"):
+        self.get_redis = get_redis
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self.sync_interval = sync_interval
+        self.idle_ttl = idle_ttl
+        self.key_prefix = key_prefix
+        self.instance_id = uuid.uuid4().hex
+        self.instances = 1
+
+        self._buckets: Dict[str, _LocalBucket] = {}
+        self._runner: Optional[asyncio.Task] = None
+
+    def limit_for(self, identity: str) -> RateLimit:
+        return self.limits.get(identity, self.default_limit)
+
+    def acquire(self, identity: str, kind: str = "api_key", cost: float = 1.0) -> Optional[float]:
+        """Takes `cost` Tokens. Returns None if Admitted, Else The Seconds Until Enough Tokens Refill."""
+        limit = self.limit_for(identity)
+        share = 1.0 / self.instances
+        now = time.monotonic()
+
+        bucket = self._buckets.get(identity)
+        if bucket is None:
+            bucket = self._buckets[identity] = _LocalBucket(limit.burst * share, now)
+        else:
+            bucket.tokens = min(limit.burst * share, bucket.tokens + (now - bucket.updated_at) * limit.rate * share)
+            bucket.updated_at = now
+        bucket.last_used = now
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            bucket.unsynced += cost
+            RATE_LIMIT_DECISIONS.labels(decision="accepted", identity=kind).inc()
+            return None
+
+        RATE_LIMIT_DECISIONS.labels(decision="rejected", identity=kind).inc()
+        if limit.rate <= 0:
+            return float(self.sync_interval)
+        return (cost - bucket.tokens) / (limit.rate * share)
+
+    def start(self) -> None:
+        """Starts The Background Reconciliation on The Running Event Loop."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+        try:
+            await self.sync()  # Report the last local consumption
+        except Exception:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                RATE_LIMIT_SYNC_FAILURES.inc()
+                log.warning("Rate Limit Sync Failed", error=str(e))
+
+    async def sync(self) -> None:
+        """Reconciles Every Active Local Bucket With Its Shared Redis Bucket in One Pipeline."""
+        now = time.monotonic()
+        for identity in [key for key, bucket in self._buckets.items() if now - bucket.last_used > self.idle_ttl]:
+            del self._buckets[identity]
+        RATE_LIMIT_ACTIVE_KEYS.set(len(self._buckets))
+
+        identities = list(self._buckets)
+        reported = {identity: self._buckets[identity].unsynced for identity in identities}
+        instances_key = f"{self.key_prefix}:instances"
+        bucket_ttl = max(60, math.ceil(self.idle_ttl))
+
+        redis_client = await self.get_redis()
+        try:
+            wall_clock = time.time()
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zadd(instances_key, {self.instance_id: wall_clock})
+            pipe.zremrangebyscore(instances_key, "-inf", wall_clock - 3 * self.sync_interval)
+            pipe.zcard(instances_key)
+            for identity in identities:
+                limit = self.limit_for(identity)
+                pipe.eval(RECONCILE_SCRIPT, 1, f"{self.key_prefix}:{identity}",
+                          limit.rate, limit.burst, reported[identity], bucket_ttl)
+            results = await pipe.execute()
+        finally:
+            await redis_client.aclose()
+
+        self.instances = max(1, int(results[2]))
+        share = 1.0 / self.instances
+        now = time.monotonic()
+        for identity, remaining in zip(identities, results[3:]):
+            bucket = self._buckets.get(identity)
+            if bucket is None:
+                continue
+            # Requests admitted while the pipeline was in flight are reported next time
+            bucket.unsynced -= reported[identity]
+            bucket.tokens = max(0.0, float(remaining) * share - bucket.unsynced)
+            bucket.updated_at = now
+
+def limit_identity(api_key: Optional[str], client_ip: str, known_keys) -> tuple:
+    """
+    (Bucket, Kind) For a Request. The API Key Names The Bucket Only if it is Known (a Tenant's
+    Key or One With Its Own Limit); Anything Else Counts Against The Client IP, so Made-Up
+    Keys Neither Get a Fresh Burst Nor Pile Up Buckets And Sync Work.
+    """
+    if api_key and api_key in known_keys:
+        return api_key, "api_key"
+    return client_ip, "client_ip"
+
+def parse_limits(value: str) -> Dict[str, RateLimit]:
+    """Parses Per-Key Limits, e.g. "key-a=600:1200;key-b=60" (Requests Per Minute[:Burst])."""
+    limits = {}
+    for item in value.split(";"):
+        if "=" not in item:
+            continue
+        identity, spec = item.rsplit("=", 1)
+        per_minute, _, burst = spec.partition(":")
+        limits[identity.strip()] = RateLimit.per_minute(float(per_minute), float(burst) if burst else None)
+    return limits
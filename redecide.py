@@ -0,0 +1,184 @@
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import text
+from structlog import get_logger
+
+import serialization
+from policy import PolicySet, score_matrix
+
+load_dotenv()
+log = get_logger()
+
+# Resume Point of a Re-Decision Job (Its Celery Task ID Unless Given)
+REDECIDE_CHECKPOINT_KEY = "redecide:{job_id}"
+# Finished And Abandoned Checkpoints Expire After This Long
+REDECIDE_CHECKPOINT_TTL = int(os.getenv("REDECIDE_CHECKPOINT_TTL", str(7 * 86400)))
+# Lease Held by The Worker Running a Job; Renewed With Every Checkpoint, so it Only Lapses
+# When That Worker is Gone (Redelivered Copies of The Task Wait For it Instead of Running Alongside)
+REDECIDE_LOCK_KEY = "redecide:{job_id}:lock"
+REDECIDE_LOCK_TTL = int(os.getenv("REDECIDE_LOCK_TTL", "300"))
+REDECIDE_DAYS = int(os.getenv("REDECIDE_DAYS", "30"))
+REDECIDE_CHUNK_SIZE = int(os.getenv("REDECIDE_CHUNK_SIZE", "10000"))
+
+# Keyset Pagination on (created_at, text_id): Every Chunk Starts Where The Last One Ended,
+# so Chunks Cost The Same Deep Into The Range And a Checkpoint is Just The Last Key. The
+# Plain Lower Bound Lets The created_at Index Start There; The Row Comparison Breaks Ties
+FETCH_CHUNK_SQL = """
+SELECT text_id, created_at, source_type, decision, policy, category_scores
+FROM moderation_results
+WHERE created_at >= :after_created_at AND created_at < :until AND status = 'completed'
+  AND (created_at, text_id) > (:after_created_at, CAST(:after_text_id AS uuid))
+ORDER BY created_at, text_id
+LIMIT :limit
+"""
+
+# One Statement Per Chunk For Every Changed Row; created_at Lets Each Row Find Its Partition
+UPDATE_DECISIONS_SQL = """
+UPDATE moderation_results AS m
+SET decision = changed.decision, policy = changed.policy
+FROM unnest(CAST(:text_ids AS uuid[]), CAST(:created_ats AS timestamp[]), CAST(:decisions AS varchar[]),
+            CAST(:policies AS varchar[])) AS changed(text_id, created_at, decision, policy)
+WHERE m.text_id = changed.text_id AND m.created_at = changed.created_at
+"""
+
+# Moves The Checkpoint (KEYS[1] <- ARGV[2], TTL ARGV[3]) And Renews The Lease (KEYS[2], TTL
+# ARGV[4]) Only While This Run (Token ARGV[1]) Still Holds it; Returns 0 Once it Lost The Lease
+CHECKPOINT_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+# Releases The Lease (KEYS[1]) if This Run (Token ARGV[1]) Still Holds it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class JobRunning(Exception):
+    """Raised When Another Worker Holds The Job's Lease (or Took it Over)."""
+
+# Sorts Before Every Real ID at The Same created_at
+_NIL_ID = "00000000-0000-0000-0000-000000000000"
+
+def new_checkpoint(now: datetime, days: int) -> dict:
+    """A Job Re-Decides Results Created in The `days` Before it Started; Later Ones Were Decided Inline."""
+    return {
+        "since": now - timedelta(days=days),
+        "until": now,
+        "after_created_at": now - timedelta(days=days),
+        "after_text_id": _NIL_ID,
+        "scanned": 0,
+        "changed": 0,
+        "seconds": 0.0,
+        "done": False,
+    }
+
+def encode_checkpoint(checkpoint: dict) -> str:
+    return serialization.dumps_str(checkpoint)
+
+def decode_checkpoint(value: str) -> dict:
+    checkpoint = serialization.loads(value)
+    for field in ("since", "until", "after_created_at"):
+        checkpoint[field] = datetime.fromisoformat(checkpoint[field])
+    return checkpoint
+
+def decide_chunk(rows: list, policies: PolicySet) -> dict:
+    """
+    Re-Decides a Chunk of (text_id, created_at, source_type, decision, policy, category_scores)
+    Rows And Returns The Rows Whose Decision or Deciding Policy Changed as Update Parameters.
+    Scores Are Decoded Into One Matrix And Each Surface's Policy Decides Its Rows in One
+    Vectorized Call.
+    """
+    text_ids, created_ats, surfaces, current, current_policies, vectors = zip(*rows)
+    scores = score_matrix(vectors)
+    surfaces = np.array(surfaces, dtype=object)
+    decisions = np.empty(len(rows), dtype=object)
+    policy_ids = np.empty(len(rows), dtype=object)
+    for surface in set(surfaces.tolist()):
+        rows_of_surface = surfaces == surface
+        policy = policies.for_surface(surface)
+        decisions[rows_of_surface] = policy.decide(scores[rows_of_surface])
+        policy_ids[rows_of_surface] = policy.id
+
+    changed = np.flatnonzero((decisions != np.array(current, dtype=object))
+                             | (policy_ids != np.array(current_policies, dtype=object)))
+    return {
+        "text_ids": [str(text_ids[i]) for i in changed],
+        "created_ats": [created_ats[i] for i in changed],
+        "decisions": decisions[changed].tolist(),
+        "policies": policy_ids[changed].tolist(),
+    }
+
+async def redecide(engine, redis_client, job_id: str, policies: PolicySet, days: int = REDECIDE_DAYS,
+                   chunk_size: int = REDECIDE_CHUNK_SIZE, report: Optional[Callable[[dict], None]] = None,
+                   lock_ttl: int = REDECIDE_LOCK_TTL) -> dict:
+    """
+    Re-Decides Stored Results Under The Current Policies, Chunk by Chunk, Without Calling The Upstream.
+
+    Each chunk is read by keyset, decided in NumPy and its changed decisions written back in
+    one UPDATE, committed on its own; the checkpoint in Redis moves only after the commit.
+    An interrupted job started again with the same `job_id` continues after the last
+    committed chunk (a chunk committed just before the interruption is decided again, which
+    changes nothing). `report` receives the checkpoint with throughput after every chunk.
+
+    Only one run of a job proceeds at a time: it holds a lease in Redis, renewed with every
+    checkpoint. Raises JobRunning if another run holds it, or took it over after this one
+    stalled for longer than `lock_ttl`.
+    """
+    key = REDECIDE_CHECKPOINT_KEY.format(job_id=job_id)
+    lock_key, token = REDECIDE_LOCK_KEY.format(job_id=job_id), str(uuid.uuid4())
+    if not await redis_client.set(lock_key, token, nx=True, ex=lock_ttl):
+        raise JobRunning(f"Re-Decision Job {job_id} is Already Running")
+    try:
+        stored = await redis_client.get(key)
+        checkpoint = decode_checkpoint(stored) if stored else new_checkpoint(datetime.now(), days)
+        if checkpoint["done"]:
+            return {**checkpoint, "job_id": job_id}
+        if stored:
+            log.info("Re-Decision Resumed", job_id=job_id, scanned=checkpoint["scanned"], after=checkpoint["after_created_at"])
+
+        while True:
+            started = time.perf_counter()
+            async with engine.begin() as connection:
+                rows = (await connection.execute(text(FETCH_CHUNK_SQL), {
+                    "until": checkpoint["until"],
+                    "after_created_at": checkpoint["after_created_at"], "after_text_id": checkpoint["after_text_id"],
+                    "limit": chunk_size,
+                })).all()
+                if rows:
+                    changes = decide_chunk(rows, policies)
+                    if changes["text_ids"]:
+                        await connection.execute(text(UPDATE_DECISIONS_SQL), changes)
+
+            if rows:
+                checkpoint["after_created_at"], checkpoint["after_text_id"] = rows[-1][1], str(rows[-1][0])
+                checkpoint["scanned"] += len(rows)
+                checkpoint["changed"] += len(changes["text_ids"])
+            checkpoint["seconds"] += time.perf_counter() - started
+            checkpoint["done"] = len(rows) < chunk_size
+            if not await redis_client.eval(CHECKPOINT_SCRIPT, 2, key, lock_key, token, encode_checkpoint(checkpoint),
+                                           REDECIDE_CHECKPOINT_TTL, lock_ttl):
+                raise JobRunning(f"Re-Decision Job {job_id} Was Taken Over by Another Run")
+
+            progress = {**checkpoint, "job_id": job_id,
+                        "rows_per_second": checkpoint["scanned"] / checkpoint["seconds"] if checkpoint["seconds"] else 0.0}
+            if report is not None:
+                report(progress)
+            if checkpoint["done"]:
+                log.info("Re-Decision Finished", job_id=job_id, scanned=checkpoint["scanned"], changed=checkpoint["changed"],
+                         rows_per_second=round(progress["rows_per_second"]))
+                return progress
+    finally:
+        await redis_client.eval(RELEASE_SCRIPT, 1, lock_key, token)
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from structlog import get_logger
+from metrics import RESULT_LOOKUPS, RESULT_CACHE_ENTRIES, RESULT_CACHE_BYTES
+
+log = get_logger()
+
+# Redis Pub/Sub Channel Used to Invalidate The In-Process Tier Across API Workers
+INVALIDATION_CHANNEL = "cache:invalidate"
+INVALIDATE_ALL = "*"
+
+class ResultCache:
+    """
+    In-Process LRU Tier For Completed Moderation Results.
+
+    Completed results never change, so each API worker keeps the most recently read ones
+    in memory, bounded by entry count, total size and TTL. A separate, short-lived
+    negative cache remembers IDs that were recently answered with 404.
+    """
+
+    def __init__(self,
+                 max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 3600,
+                 negative_ttl: float = 5,
+                 negative_max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.negative_max_entries = negative_max_entries
+
+        self._entries: OrderedDict = OrderedDict()     # id -> (expires_at, size, value)
+        self._missing: OrderedDict = OrderedDict()     # id -> expires_at
+        self._bytes = 0
+
+    def get(self, key: str):
+        """Returns The Cached Value or None, Refreshing Its LRU Position."""
+        entry = self._entries.get(key)
+        if entry is None:
+            RESULT_LOOKUPS.labels(tier="local", outcome="miss").inc()
+            return None
+        if entry[0] < time.monotonic():
+            self._remove(key)
+            RESULT_LOOKUPS.labels(tier="local", outcome="miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        RESULT_LOOKUPS.labels(tier="local", outcome="hit").inc()
+        return entry[2]
+
+    def put(self, key: str, value, size: int) -> None:
+        """Caches a Completed Result, Evicting The Least Recently Used Entries Beyond The Caps."""
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._missing.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+        self._report_size()
+
+    def is_missing(self, key: str) -> bool:
+        """Whether The ID Was Recently Answered With 404."""
+        expires_at = self._missing.get(key)
+        if expires_at is None:
+            RESULT_LOOKUPS.labels(tier="negative", outcome="miss").inc()
+            return False
+        if expires_at < time.monotonic():
+            del self._missing[key]
+            RESULT_LOOKUPS.labels(tier="negative", outcome="miss").inc()
+            return False
+
+        RESULT_LOOKUPS.labels(tier="negative", outcome="hit").inc()
+        return True
+
+    def put_missing(self, key: str) -> None:
+        """Remembers a 404'd ID For The Negative TTL."""
+        self._missing.pop(key, None)
+        self._missing[key] = time.monotonic() + self.negative_ttl
+        while len(self._missing) > self.negative_max_entries:
+            self._missing.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._remove(key)
+        self._missing.pop(key, None)
+        self._report_size()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._missing.clear()
+        self._bytes = 0
+        self._report_size()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _report_size(self) -> None:
+        RESULT_CACHE_ENTRIES.set(len(self._entries))
+        RESULT_CACHE_BYTES.set(self._bytes)
+
+async def publish_invalidation(redis_client, key: str) -> None:
+    """Tells Every API Worker to Drop a Result (or All Results With INVALIDATE_ALL)."""
+    await redis_client.publish(INVALIDATION_CHANNEL, key)
+
+async def listen_for_invalidations(cache: ResultCache, get_redis, retry_delay: float = 1.0) -> None:
+    """Applies Invalidation Messages to The Local Tier Until Cancelled, Reconnecting on Errors."""
+    while True:
+        redis_client = None
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before the subscription may have missed an invalidation
+                cache.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    if message["data"] == INVALIDATE_ALL:
+                        cache.clear()
+                    else:
+                        cache.invalidate(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("Cache Invalidation Listener Disconnected", error=str(e))
+            await asyncio.sleep(retry_delay)
+        finally:
+            if redis_client:
+                await redis_client.aclose()
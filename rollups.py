@@ -0,0 +1,139 @@
+import os
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import text, select, func
+from categories import CATEGORIES, CATEGORY_INDEX
+from models import ModerationRollup
+from partitions import PARTITION_RETENTION_DAYS, retention_cutoff
+
+load_dotenv()
+
+# Bucket Sizes Maintained For Every Result (Any date_trunc Unit)
+ROLLUP_GRANULARITIES = ("minute", "hour")
+# Category Index Used For The Result as a Whole (flagged, max_score)
+ALL_CATEGORIES = -1
+# Score Histogram Bins of Equal Width Over [0, 1]
+HISTOGRAM_BINS = 10
+ROLLUP_WATERMARK = "moderation_rollups"
+# Results Stored Less Than This Long Ago Are Left For The Next Run, so a Transaction That
+# Took Its stored_at Before The Watermark Moved But Committed After it is Not Missed
+ROLLUP_LAG_SECONDS = float(os.getenv("ROLLUP_LAG_SECONDS", "30"))
+# Most Buckets One Analytics Query May Span
+ANALYTICS_MAX_BUCKETS = int(os.getenv("ANALYTICS_MAX_BUCKETS", "1440"))
+BUCKET_SIZES = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1)}
+
+_BINS = ", ".join(
+    f"count(*) FILTER (WHERE LEAST(width_bucket(scored.score, 0, 1, {HISTOGRAM_BINS}), {HISTOGRAM_BINS}) = {i})"
+    for i in range(1, HISTOGRAM_BINS + 1))
+_GRANULARITIES = ", ".join(f"('{granularity}')" for granularity in ROLLUP_GRANULARITIES)
+
+# One Pass Over The New Rows: Every Row Counts Once For The Whole Result And Once Per
+# Category, For Every Granularity, And is Added to Existing Buckets (Late Results Included)
+ROLLUP_SQL = f"""
+WITH new_rows AS (
+    SELECT created_at, source_type, flagged, max_score, category_mask, category_scores
+    FROM moderation_results
+    WHERE stored_at >= :since AND stored_at < :until AND status = 'completed'
+), scored AS (
+    SELECT created_at, source_type, {ALL_CATEGORIES} AS category, COALESCE(flagged, false) AS flagged, max_score AS score
+    FROM new_rows
+    UNION ALL
+    SELECT r.created_at, r.source_type, (c.position - 1)::smallint, (r.category_mask >> (c.position - 1)::int) & 1 = 1, c.score
+    FROM new_rows r, unnest(r.category_scores) WITH ORDINALITY AS c(score, position)
+)
+INSERT INTO moderation_rollups (granularity, bucket, source_type, category, results, flagged, histogram)
+SELECT g.granularity, date_trunc(g.granularity, scored.created_at), scored.source_type, scored.category,
+       count(*), count(*) FILTER (WHERE scored.flagged), ARRAY[{_BINS}]::integer[]
+FROM scored CROSS JOIN (VALUES {_GRANULARITIES}) AS g(granularity)
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (granularity, bucket, source_type, category) DO UPDATE SET
+    results = moderation_rollups.results + EXCLUDED.results,
+    flagged = moderation_rollups.flagged + EXCLUDED.flagged,
+    histogram = ARRAY(
+        SELECT old + new
+        FROM unnest(moderation_rollups.histogram, EXCLUDED.histogram) WITH ORDINALITY AS bins(old, new, position)
+        ORDER BY position
+    )
+"""
+
+async def roll_up(connection, now: Optional[datetime] = None, lag_seconds: float = ROLLUP_LAG_SECONDS) -> dict:
+    """
+    Folds Results Stored Since The Watermark Into The Rollup Tables And Advances it.
+
+    The watermark row is locked FOR UPDATE SKIP LOCKED, so overlapping runs do not count
+    the same rows twice: a run that finds it locked skips. The insert and the watermark
+    move commit together with the caller's transaction.
+    """
+    since = (await connection.execute(text(
+        "SELECT processed_until FROM rollup_watermarks WHERE name = :name FOR UPDATE SKIP LOCKED"),
+        {"name": ROLLUP_WATERMARK})).scalar()
+    if since is None:
+        return {"skipped": True}
+
+    until = (now or datetime.now()) - timedelta(seconds=lag_seconds)
+    if until <= since:
+        return {"skipped": False, "since": since, "until": since, "buckets": 0}
+
+    result = await connection.execute(text(ROLLUP_SQL), {"since": since, "until": until})
+    await connection.execute(text("UPDATE rollup_watermarks SET processed_until = :until WHERE name = :name"),
+                             {"until": until, "name": ROLLUP_WATERMARK})
+    return {"skipped": False, "since": since, "until": until, "buckets": result.rowcount}
+
+# Buckets Expire Together With The Partitions Holding Their Results
+PRUNE_ROLLUPS_SQL = "DELETE FROM moderation_rollups WHERE bucket < :cutoff"
+
+async def prune_rollups(connection, today: Optional[date] = None, retention_days: int = PARTITION_RETENTION_DAYS) -> int:
+    """Deletes Buckets Older Than The Partition Retention Window; Returns How Many Were Deleted."""
+    result = await connection.execute(text(PRUNE_ROLLUPS_SQL),
+                                      {"cutoff": retention_cutoff(today or date.today(), retention_days)})
+    return result.rowcount
+
+def category_label(category: int) -> str:
+    return "all" if category == ALL_CATEGORIES else CATEGORIES[category]
+
+def category_indexes(names) -> list:
+    """Rollup Category Indexes For Category Names ('all' = The Whole Result); Raises ValueError For Unknown Names."""
+    indexes = []
+    for name in names:
+        if name == "all":
+            indexes.append(ALL_CATEGORIES)
+        elif name in CATEGORY_INDEX:
+            indexes.append(CATEGORY_INDEX[name])
+        else:
+            raise ValueError(f"Unknown Category: {name}")
+    return indexes
+
+def merge_histograms(histograms: list) -> list:
+    return [sum(column) for column in zip(*histograms)] if histograms else [0] * HISTOGRAM_BINS
+
+async def read_rollups(db, granularity: str, since: datetime, until: datetime,
+                       categories: Optional[list] = None, source_type: Optional[str] = None) -> list:
+    """
+    Time Series From The Rollups Only: One Point Per Bucket And Category, Source Types Summed
+    Unless One is Selected. `categories` Are Indexes (ALL_CATEGORIES For The Whole Result).
+    """
+    query = (select(ModerationRollup.bucket, ModerationRollup.category,
+                    func.sum(ModerationRollup.results), func.sum(ModerationRollup.flagged),
+                    func.array_agg(ModerationRollup.histogram))
+             .filter(ModerationRollup.granularity == granularity,
+                     ModerationRollup.bucket >= since, ModerationRollup.bucket < until)
+             .group_by(ModerationRollup.bucket, ModerationRollup.category)
+             .order_by(ModerationRollup.bucket, ModerationRollup.category))
+    if categories is not None:
+        query = query.filter(ModerationRollup.category.in_(categories))
+    if source_type is not None:
+        query = query.filter(ModerationRollup.source_type == source_type)
+
+    series = []
+    for bucket, category, results, flagged, histograms in await db.execute(query):
+        series.append({
+            "bucket": bucket,
+            "category": category_label(category),
+            "results": int(results),
+            "flagged": int(flagged),
+            "flagged_rate": flagged / results if results else 0.0,
+            "histogram": merge_histograms(histograms),
+        })
+    return series
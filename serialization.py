@@ -0,0 +1,57 @@
+import datetime
+import decimal
+import json
+import uuid
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, the stdlib json module is used instead
+    orjson = None
+
+# Single JSON Layer For Responses, Redis Values, DLQ Payloads And Log Lines.
+# Backed by orjson When Installed, With an Equivalent (Slower) Stdlib Fallback.
+
+def _default(obj):
+    """Types The Stdlib Encoder Does Not Handle (orjson Serializes These Natively)."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if hasattr(obj, "tolist"):  # NumPy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of Type {type(obj).__name__} is Not JSON Serializable")
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS | orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode("utf-8")
+
+    def loads(data):
+        return orjson.loads(data)
+
+else:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def dumps_pretty(obj) -> str:
+        return json.dumps(obj, default=_default, indent=2, sort_keys=True)
+
+    def loads(data):
+        return json.loads(data)
+
+def dumps_str(obj) -> str:
+    """Compact JSON as str (For Redis Clients With decode_responses And Log Renderers)."""
+    return dumps(obj).decode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON Response Rendered Through The Shared Serialization Layer."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
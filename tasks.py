@@ -1,5 +1,5 @@
 import asyncio
-import json
+import serialization
 from typing import Optional
 import httpx
 import logging
@@ -13,8 +13,16 @@ import os
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from database import get_db
-from database import get_sessionmaker
-from models import ModerationResult
+from database import get_sessionmaker, get_engine
+from models import ModerationResult, result_columns, id_filter, text_id_created_at
+from payload_store import fetch_payload
+from http_cache import completed_body, encode_result_record
+from bloom import get_bloom_filter
+from partitions import maintain_partitions
+from rollups import roll_up, prune_rollups
+from policy import get_policies
+from redecide import redecide, JobRunning, REDECIDE_DAYS, REDECIDE_CHUNK_SIZE, REDECIDE_LOCK_TTL
+from metrics import UPSTREAM_LATENCY, STORE_LATENCY
 from datetime import datetime, timezone
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -35,6 +43,10 @@ async def get_redis():
         encoding="utf-8",
         decode_responses=True)
 
+# Binary Redis Connection For Codec-Encoded Result Values
+async def get_binary_redis():
+    return redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
 # Global ThreadPoolExecutor
 executor = concurrent.futures.ThreadPoolExecutor(max_workers=5)
 
@@ -45,19 +57,23 @@ def shutdown_executor(*args, **kwargs):
     executor.shutdown(wait=True)
     logging.info("Shutdown Complete.")
 
-from celery_worker import celery
+from celery_worker import celery, RETRY_QUEUE, TASK_PRIORITIES
+
+# Bloom Filter of Known IDs, Updated Whenever a Result is Stored
+known_ids = get_bloom_filter()
 
 def run_async_in_executor(async_func, *args):
     return executor.submit(lambda: asyncio.run(async_func(*args)))
 
 @celery.task(name="celery_worker.moderate_text_task", bind=True, max_retries=3)
-def moderate_text_task(self, text_id: str, text: str)-> dict:
+def moderate_text_task(self, text_id: str, text: Optional[str] = None, payload_ref: Optional[str] = None)-> dict:
     """
     Processes (Celery Task) Text Moderation.
     Calls OpenAI or Mock API.
+    Large Texts Arrive as a Claim-Check `payload_ref` And Are Fetched Lazily.
     """
     try:
-        result = async_to_sync(moderate_text)(text_id, text)
+        result = async_to_sync(moderate_text)(text_id, text, payload_ref)
         return result
     
     except Exception as e:
@@ -70,59 +86,77 @@ def moderate_text_task(self, text_id: str, text: str)-> dict:
         # If max retries exceeded, don't retry again
         if self.request.retries >= 3:
             logging.warning(f"Task {text_id} Moved To DLQ After Max Retries.")
-            run_async_in_executor(push_to_dlq, text_id, text, str(e))
+            run_async_in_executor(push_to_dlq, text_id, text, str(e), payload_ref)
 
             return {"status": "failed", "reason": str(e)}
 
-        # Retry task with exponential backoff
-        raise self.retry(exc=e, countdown=5 ** self.request.retries)
+        # Retry task with exponential backoff on the retry lane
+        raise self.retry(exc=e, countdown=5 ** self.request.retries, queue=RETRY_QUEUE)
 
-async def push_to_dlq(text_id, text, error)-> None:
+async def push_to_dlq(text_id, text, error, payload_ref=None)-> None:
     """
     Push Failed Tasks to Dead Letter Queue (DLQ) in Redis.
+    Claim-Checked Texts Are Stored by Reference Only.
     """
     redis_client = await get_redis()
     try:
-        failed_task = {"text_id": text_id, "text": text, "error": error}
-        await redis_client.rpush("dlq:moderation_failed", json.dumps(failed_task))
+        if payload_ref:
+            failed_task = {"text_id": text_id, "payload_ref": payload_ref, "error": error}
+        else:
+            failed_task = {"text_id": text_id, "text": text, "error": error}
+        await redis_client.rpush("dlq:moderation_failed", serialization.dumps_str(failed_task))
         logging.warning(f"Task {text_id} Added to DLQ: {failed_task}")
     except Exception as e:
         logging.error(f"Failed to push {text_id} to DLQ: {e}")
     finally:
         await redis_client.aclose()
 
-async def moderate_text(text_id: str, text: str)-> dict:
+async def moderate_text(text_id: str, text: Optional[str], payload_ref: Optional[str] = None)-> dict:
     """Handles Text Moderation by Calling OpenAI or a Mock API, Storing Results in PostgreSQL and Caching in Redis."""
-    redis_client = await get_redis()
+    if payload_ref:
+        text = await fetch_payload(payload_ref)
+
+    redis_client = await get_binary_redis()
     try:
         if use_mock_server:
             # Call Mock API
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.post("http://127.0.0.1:8080/v1/moderations", json={"input": text})
-                moderation_data = response.json()
+            with UPSTREAM_LATENCY.labels(kind="text", backend="mock").time():
+                async with httpx.AsyncClient(timeout=10) as client:
+                    response = await client.post("http://127.0.0.1:8080/v1/moderations", json={"input": text})
+                    moderation_data = response.json()
         else:
             try:
                 # Call OpenAI's API
                 model = "omni-moderation-latest"
-                moderation_response = await asyncio.to_thread(openai_client.moderations.create, model=model, input=text)
+                with UPSTREAM_LATENCY.labels(kind="text", backend="openai").time():
+                    moderation_response = await asyncio.to_thread(openai_client.moderations.create, model=model, input=text)
                 moderation_data = moderation_response.model_dump()
             except Exception as e:
                 logging.error(f"OpenAI API Error: {e}. Falling Back To Mock Server.")
 
                 # Fallback: Call the Mock API instead
-                async with httpx.AsyncClient(timeout=10) as client:
-                    response = await client.post("http://127.0.0.1:8080/v1/moderations", json={"input": text})
-                    moderation_data = response.json()
+                with UPSTREAM_LATENCY.labels(kind="text", backend="mock").time():
+                    async with httpx.AsyncClient(timeout=10) as client:
+                        response = await client.post("http://127.0.0.1:8080/v1/moderations", json={"input": text})
+                        moderation_data = response.json()
         
         # Store result in PostgreSQL
-        await store_moderation_result(
-            text_id=text_id,
-            text=text,
-            status="completed",
-            moderation_data=moderation_data)
+        with STORE_LATENCY.labels(store="postgres", operation="upsert_result").time():
+            stored = await store_moderation_result(
+                text_id=text_id,
+                text=text,
+                status="completed",
+                moderation_data=moderation_data)
         
-        # Store result in Redis (for caching)
-        await redis_client.set(text_id, json.dumps(moderation_data), ex=3600)
+        # Store result in Redis (for caching), with the body and ETag the database tier would render
+        created_at = stored.created_at if stored is not None else text_id_created_at(text_id) or datetime.now()
+        body = completed_body(text_id, text, created_at, moderation_data)
+        with STORE_LATENCY.labels(store="redis", operation="set_result").time():
+            await redis_client.set(text_id, encode_result_record(body), ex=3600)
+
+        # A rebuild only sees IDs in status records and PostgreSQL, so one that waited in a queue
+        # or the DLQ past its status TTL can be missing from the filter; adding it here fixes that
+        await known_ids.add(redis_client, text_id)
 
         logging.info(f"Moderation Result Stored For {text_id} in PostgreSQL and Redis")
         return moderation_data
@@ -160,47 +194,59 @@ def moderate_image_task(self, image_id: str, image_url: str)-> dict:
             run_async_in_executor(push_to_dlq, image_id, image_url, str(e))
             return {"status": "failed", "reason": str(e)}
 
-        # Retry task with exponential backoff
-        raise self.retry(exc=e, countdown=5 ** self.request.retries)
+        # Retry task with exponential backoff on the retry lane
+        raise self.retry(exc=e, countdown=5 ** self.request.retries, queue=RETRY_QUEUE)
 
 async def moderate_image(image_id: str, image_url: str)-> dict:
     """Handles Image Moderation by Calling OpenAI or a Mock API, Storing Results in PostgreSQL and Caching in Redis."""
-    redis_client = await get_redis()
+    redis_client = await get_binary_redis()
     try:
         if use_mock_server:
             # Call Mock API
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.post("http://127.0.0.1:8080/v1/moderations/image", json={
-                    "image_url": image_url
-                })
-                moderation_data = response.json()
+            with UPSTREAM_LATENCY.labels(kind="image", backend="mock").time():
+                async with httpx.AsyncClient(timeout=10) as client:
+                    response = await client.post("http://127.0.0.1:8080/v1/moderations/image", json={
+                        "image_url": image_url
+                    })
+                    moderation_data = response.json()
         else:
             try:
                 # Call OpenAI's API
                 model = "omni-moderation-latest"
-                moderation_response = await asyncio.to_thread(openai_client.moderations.create, model=model, input=[
-                    {"type": "image_url", "image_url": {"url": image_url}}
-                ])
+                with UPSTREAM_LATENCY.labels(kind="image", backend="openai").time():
+                    moderation_response = await asyncio.to_thread(openai_client.moderations.create, model=model, input=[
+                        {"type": "image_url", "image_url": {"url": image_url}}
+                    ])
                 moderation_data = moderation_response.model_dump()
             except Exception as e:
                 logging.error(f"OpenAI API Error: {e}. Falling Back To Mock Server.")
 
                 # Fallback: Call the Mock API instead
-                async with httpx.AsyncClient(timeout=10) as client:
-                    response = await client.post("http://127.0.0.1:8080/v1/moderations/image", json={
-                    "image_url": image_url
-                })
-                moderation_data = response.json()
+                with UPSTREAM_LATENCY.labels(kind="image", backend="mock").time():
+                    async with httpx.AsyncClient(timeout=10) as client:
+                        response = await client.post("http://127.0.0.1:8080/v1/moderations/image", json={
+                        "image_url": image_url
+                    })
+                    moderation_data = response.json()
         
         # Store result in PostgreSQL
-        await store_moderation_result(
-            text_id=image_id,
-            text=image_url,
-            status="completed",
-            moderation_data=moderation_data)
+        with STORE_LATENCY.labels(store="postgres", operation="upsert_result").time():
+            stored = await store_moderation_result(
+                text_id=image_id,
+                text=image_url,
+                status="completed",
+                moderation_data=moderation_data,
+                source_type="image")
         
-        # Store result in Redis (for caching)
-        await redis_client.set(image_id, json.dumps(moderation_data), ex=3600)
+        # Store result in Redis (for caching), with the body and ETag the database tier would render
+        created_at = stored.created_at if stored is not None else text_id_created_at(image_id) or datetime.now()
+        body = completed_body(image_id, image_url, created_at, moderation_data)
+        with STORE_LATENCY.labels(store="redis", operation="set_result").time():
+            await redis_client.set(image_id, encode_result_record(body), ex=3600)
+
+        # A rebuild only sees IDs in status records and PostgreSQL, so one that waited in a queue
+        # or the DLQ past its status TTL can be missing from the filter; adding it here fixes that
+        await known_ids.add(redis_client, image_id)
 
         logging.info(f"Image Moderation Result Stored For {image_id} in PostgreSQL and Redis")
         return moderation_data
@@ -230,7 +276,7 @@ async def _async_retry_failed_moderation() -> None:
             failed_task = await redis_client.lpop("dlq:moderation_failed")
             if not failed_task:
                 break  
-            tasks_to_retry.append(json.loads(failed_task))
+            tasks_to_retry.append(serialization.loads(failed_task))
 
         await redis_client.aclose()  # Close Redis before processing tasks
 
@@ -241,12 +287,19 @@ async def _async_retry_failed_moderation() -> None:
             if "text" in task_data:
                 text = task_data["text"]
                 logging.info(f"Retrying Failed Text Moderation Task {text_id}")
-                moderate_text_task.delay(text_id, text)  # Reschedule text task
+                # Reschedule text task on the retry lane
+                moderate_text_task.apply_async(args=[text_id, text], queue=RETRY_QUEUE, priority=TASK_PRIORITIES["low"])
             
+            elif "payload_ref" in task_data:
+                logging.info(f"Retrying Failed Claim-Checked Text Moderation Task {text_id}")
+                moderate_text_task.apply_async(args=[text_id], kwargs={"payload_ref": task_data["payload_ref"]},
+                                               queue=RETRY_QUEUE, priority=TASK_PRIORITIES["low"])
+
             elif "image_url" in task_data:
                 image_url = task_data["image_url"]
                 logging.info(f"Retrying Failed Image Moderation Task {text_id}")
-                moderate_image_task.delay(text_id, image_url)  # Reschedule image task
+                # Reschedule image task on the retry lane
+                moderate_image_task.apply_async(args=[text_id, image_url], queue=RETRY_QUEUE, priority=TASK_PRIORITIES["low"])
 
             else:
                 logging.warning(f"Unknown Moderation Type for Task {text_id}, Skipping.")
@@ -255,16 +308,24 @@ async def _async_retry_failed_moderation() -> None:
         await redis_client.delete("dlq:retry_lock")  # Release lock
         await redis_client.aclose()
 
-async def store_moderation_result(text_id: str, text: str, status: str, moderation_data: dict) -> Optional[ModerationResult]:
+async def store_moderation_result(text_id: str, text: str, status: str, moderation_data: dict,
+                                  source_type: str = "text") -> Optional[ModerationResult]:
     """
     Stores or Updates The Moderation Result in PostgreSQL Inside Celery.
     If text_id Exists, Update The Record. Otherwise, Insert a New One.
+    Hot Fields of The Response (flagged, model, max_score) Are Also Stored in Typed Columns.
+    created_at Comes From The Time-Ordered ID, so The Row Lands in The Partition Lookups Probe.
+    stored_at is Only Set on Insert, so a Redelivered Task is Never Counted Twice by The Rollups.
+    The Decision of The Surface's Policy (policy.py) is Stored Alongside The Result.
     """
+    columns = result_columns(moderation_data)
+    policy = get_policies().for_surface(source_type)
+    columns.update(decision=policy.decide_one(columns["category_scores"]), policy=policy.id)
     SessionLocal = get_sessionmaker()  # This creates an engine on the current loop.
     async with SessionLocal() as db: 
         try:
             # Check if the text_id already exists
-            result = await db.execute(select(ModerationResult).filter(ModerationResult.text_id == text_id))
+            result = await db.execute(select(ModerationResult).filter(*id_filter(text_id)))
             existing_entry = result.scalars().first()
 
             if existing_entry:
@@ -272,7 +333,14 @@ async def store_moderation_result(text_id: str, text: str, status: str, moderati
                 existing_entry.text = text
                 existing_entry.status = status
                 existing_entry.result = moderation_data
-                existing_entry.created_at = datetime.now()
+                existing_entry.source_type = source_type
+                existing_entry.flagged = columns["flagged"]
+                existing_entry.model = columns["model"]
+                existing_entry.max_score = columns["max_score"]
+                existing_entry.category_mask = columns["category_mask"]
+                existing_entry.category_scores = columns["category_scores"]
+                existing_entry.decision = columns["decision"]
+                existing_entry.policy = columns["policy"]
                 logging.info(f"Updated Existing Moderation Result For text_id: {text_id}")
             else:
                 # Insert new record
@@ -281,7 +349,10 @@ async def store_moderation_result(text_id: str, text: str, status: str, moderati
                     text=text,
                     status=status,
                     result=moderation_data,
-                    created_at=datetime.now()
+                    source_type=source_type,
+                    **columns,
+                    created_at=text_id_created_at(text_id) or datetime.now(),
+                    stored_at=datetime.now()
                 )
                 db.add(new_entry)
                 logging.info(f"Inserted New Moderation Result For text_id: {text_id}")
@@ -293,3 +364,105 @@ async def store_moderation_result(text_id: str, text: str, status: str, moderati
             logging.error(f"Database error: {e}")
             await db.rollback()
             return None
+
+@celery.task(name="celery_worker.rebuild_bloom_filter")
+def rebuild_bloom_filter()-> dict:
+    """
+    Celery Task to Rebuild The Bloom Filter of Known Moderation IDs.
+    """
+    return async_to_sync(_async_rebuild_bloom_filter)()
+
+async def _known_ids(redis_client):
+    """
+    Yields Every ID The Result Lookup Path Can Find: Pending Status Records First, Then PostgreSQL.
+    """
+    async for key in redis_client.scan_iter(match="status:*", count=1000):
+        yield key.split(":", 1)[1]
+
+    SessionLocal = get_sessionmaker()
+    async with SessionLocal() as db:
+        result = await db.stream_scalars(select(ModerationResult.text_id).execution_options(yield_per=10000))
+        async for text_id in result:
+            yield text_id
+
+async def _async_rebuild_bloom_filter() -> dict:
+    """
+    Async Function to Rebuild The Bloom Filter And Swap it in Atomically.
+    """
+    redis_client = await get_redis()
+    try:
+        stats = await get_bloom_filter().rebuild(redis_client, _known_ids(redis_client))
+        logging.info(f"Bloom Filter Rebuilt: {stats}")
+        return stats
+    finally:
+        await redis_client.aclose()
+
+@celery.task(name="celery_worker.maintain_result_partitions")
+def maintain_result_partitions()-> dict:
+    """
+    Celery Task to Pre-Create Upcoming Daily Partitions of moderation_results And Drop Expired Ones,
+    Along With The Analytics Rollup Buckets of Those Days.
+    """
+    return async_to_sync(_async_maintain_result_partitions)()
+
+async def _async_maintain_result_partitions() -> dict:
+    engine = get_engine()
+    try:
+        async with engine.begin() as connection:
+            stats = await maintain_partitions(connection)
+        async with engine.begin() as connection:
+            stats["rollup_buckets_pruned"] = await prune_rollups(connection)
+        logging.info(f"Result Partitions Maintained: {stats}")
+        return stats
+    finally:
+        await engine.dispose()
+
+@celery.task(name="celery_worker.roll_up_results")
+def roll_up_results()-> dict:
+    """
+    Celery Task to Fold Newly Stored Results Into The Analytics Rollups.
+    """
+    return async_to_sync(_async_roll_up_results)()
+
+async def _async_roll_up_results() -> dict:
+    engine = get_engine()
+    try:
+        async with engine.begin() as connection:
+            stats = await roll_up(connection)
+        logging.info(f"Results Rolled Up: {stats}")
+        return stats
+    finally:
+        await engine.dispose()
+
+@celery.task(name="celery_worker.redecide_results", bind=True, acks_late=True, reject_on_worker_lost=True)
+def redecide_results(self, job_id: Optional[str] = None, days: int = REDECIDE_DAYS,
+                     chunk_size: int = REDECIDE_CHUNK_SIZE)-> dict:
+    """
+    Celery Task to Re-Decide The Results of The Last `days` Days Under The Current Policies.
+    Acknowledged Only When Finished, so a Lost Worker's Job is Redelivered And Resumes From
+    Its Checkpoint (Keyed by job_id, Which Defaults to The Task ID). Progress is Reported as
+    The PROGRESS State.
+
+    The Redis Broker Also Redelivers Unacknowledged Messages After Its visibility_timeout
+    (One Hour), Even While The Job is Still Running. Such a Copy Finds The Job's Lease Taken
+    And Retries Later Instead of Running Alongside; Once The Job is Done it Returns at Once.
+    """
+    def report(progress: dict) -> None:
+        self.update_state(state="PROGRESS", meta=progress)
+        logging.info(f"Re-Decision Progress: {progress['scanned']} Scanned, {progress['changed']} Changed, "
+                     f"{progress['rows_per_second']:.0f} Rows/s")
+
+    try:
+        return async_to_sync(_async_redecide_results)(job_id or self.request.id, days, chunk_size, report)
+    except JobRunning as e:
+        logging.info(f"{e}, Retrying in {REDECIDE_LOCK_TTL}s")
+        raise self.retry(countdown=REDECIDE_LOCK_TTL, max_retries=None)
+
+async def _async_redecide_results(job_id: str, days: int, chunk_size: int, report) -> dict:
+    engine = get_engine()
+    redis_client = await get_redis()
+    try:
+        return await redecide(engine, redis_client, job_id, get_policies(), days, chunk_size, report)
+    finally:
+        await redis_client.aclose()
+        await engine.dispose()
@@ -0,0 +1,84 @@
+import math
+import os
+from typing import Dict, NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Submissions Without an API Key Belong to This Tenant (Unless an API Key is Required)
+DEFAULT_TENANT = "default"
+
+# Per-Tenant Sub-Queue Holding Submissions For One Lane Until The Dispatcher Forwards Them to Celery
+TENANT_QUEUE_KEY = "tenant:{tenant}:{lane}"
+# Messages The Dispatcher Took From a Sub-Queue But Has Not Published to Celery Yet
+TENANT_PROCESSING_KEY = "tenant:{tenant}:{lane}:processing"
+
+# When Enabled, Submissions Go to Per-Tenant Sub-Queues And `dispatcher.py` Feeds The Workers
+TENANT_FAIR_QUEUING = os.getenv("TENANT_FAIR_QUEUING", "false").strip().lower() == "true"
+TENANT_REQUIRE_API_KEY = os.getenv("TENANT_REQUIRE_API_KEY", "false").strip().lower() == "true"
+
+class Tenant(NamedTuple):
+    name: str
+    api_key: Optional[str]
+    weight: float
+
+class UnknownTenant(Exception):
+    """Raised When a Request Carries no Valid API Key And Anonymous Access is Disabled."""
+
+def tenant_queue_key(tenant: str, lane: str) -> str:
+    return TENANT_QUEUE_KEY.format(tenant=tenant, lane=lane)
+
+def tenant_processing_key(tenant: str, lane: str) -> str:
+    return TENANT_PROCESSING_KEY.format(tenant=tenant, lane=lane)
+
+def tenant_weight(value: str) -> float:
+    """Weights Must be Positive And Finite: a Zero Weight Never Earns Credit in Deficit Round Robin."""
+    weight = float(value)
+    if not math.isfinite(weight) or weight <= 0:
+        raise ValueError(f"Tenant Weight Must be a Positive Number, Got {value!r}")
+    return weight
+
+def parse_tenants(value: str) -> Dict[str, Tenant]:
+    """
+    Parses TENANTS, e.g. "acme=key-123:3;globex=key-456" (Name=API Key[:Weight]), Keyed by API Key.
+    Raises ValueError For a Weight That is Not a Positive Number.
+    """
+    tenants = {}
+    for item in value.split(";"):
+        if "=" not in item:
+            continue
+        name, spec = item.split("=", 1)
+        api_key, _, weight = spec.partition(":")
+        tenants[api_key.strip()] = Tenant(name.strip(), api_key.strip(), tenant_weight(weight) if weight else 1.0)
+    return tenants
+
+class TenantRegistry:
+    """Resolves API Keys to Tenants And Lists Every Tenant For The Dispatcher."""
+
+    def __init__(self, tenants: Dict[str, Tenant], require_api_key: bool = False, default_weight: float = 1.0):
+        self.by_api_key = tenants
+        self.require_api_key = require_api_key
+        self.default = Tenant(DEFAULT_TENANT, None, default_weight)
+
+    def resolve(self, api_key: Optional[str]) -> Tenant:
+        if api_key:
+            tenant = self.by_api_key.get(api_key)
+            if tenant is None:
+                raise UnknownTenant("Invalid API Key")
+            return tenant
+        if self.require_api_key:
+            raise UnknownTenant("Missing API Key")
+        return self.default
+
+    def all(self) -> list:
+        tenants = list(self.by_api_key.values())
+        if not self.require_api_key:
+            tenants.append(self.default)
+        return tenants
+
+def get_tenant_registry() -> TenantRegistry:
+    """Tenant Registry Configured From The Environment (Shared by The API And The Dispatcher)."""
+    return TenantRegistry(parse_tenants(os.getenv("TENANTS", "")),
+                          require_api_key=TENANT_REQUIRE_API_KEY,
+                          default_weight=tenant_weight(os.getenv("DEFAULT_TENANT_WEIGHT", "1")))
@@ -1,3 +1,7 @@
+import asyncio
+from typing import Optional
+
+import fakeredis
 import pytest
 import redis.asyncio as redis
 
@@ -10,3 +14,60 @@ async def mock_redis():
         async def delete(self, *args, **kwargs): return True
 
     return FakeRedis()
+
+
+class RedisConnections:
+    """
+    Stands in For The App's `get_redis` Factories: Hands Out New Clients of One In-Memory
+    Redis Server (fakeredis, With Lua Scripts Run by lupa), Counting Them. It Can be Made to
+    Fail The Next `fail` Calls or to Wait For `gate` First.
+    """
+
+    def __init__(self, server: fakeredis.FakeServer, decode_responses: bool = False):
+        self.server = server
+        self.decode_responses = decode_responses
+        self.opened = 0
+        self.fail = 0
+        self.gate: Optional[asyncio.Event] = None
+
+    async def __call__(self):
+        self.opened += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("Redis unavailable")
+        return fakeredis.FakeAsyncRedis(server=self.server, decode_responses=self.decode_responses)
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    """One Empty Redis Server Per Test."""
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def get_redis(redis_server) -> RedisConnections:
+    """Binary Clients, Like `get_binary_redis`."""
+    return RedisConnections(redis_server)
+
+@pytest.fixture
+def get_str_redis(redis_server) -> RedisConnections:
+    """Clients With decode_responses, Like `get_redis`."""
+    return RedisConnections(redis_server, decode_responses=True)
+
+@pytest.fixture
+def redis_client(redis_server) -> fakeredis.FakeAsyncRedis:
+    """Async Client For Seeding And Checking The Server (str Values)."""
+    return fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+
+@pytest.fixture
+def sync_redis(redis_server) -> fakeredis.FakeRedis:
+    """Blocking Client For Synchronous Code And Callbacks (str Values)."""
+    return fakeredis.FakeRedis(server=redis_server, decode_responses=True)
+
+@pytest.fixture
+def text_task():
+    """Stands in For The Celery Text Task Wherever Only Its Name is Read."""
+    class TextTask:
+        name = "celery_worker.moderate_text_task"
+    return TextTask()
@@ -0,0 +1,93 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import pytest
+from admission import AdmissionController, AdmissionRejected
+from celery_worker import TEXT_QUEUE, BULK_QUEUE, queue_keys, COMPLETED_COUNTER_KEY
+
+
+def make_controller(get_redis, **kwargs) -> AdmissionController:
+    return AdmissionController(get_redis, max_wait={"high": 100, "normal": 20, "low": 5},
+                               default_throughput=10, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_admits_when_queue_is_empty(get_str_redis)-> None:
+    """Submissions are admitted when there is no backlog."""
+    controller = make_controller(get_str_redis)
+    await controller.admit(TEXT_QUEUE, "low")
+
+
+@pytest.mark.asyncio
+async def test_sheds_low_priority_first(get_str_redis, redis_client)-> None:
+    """With the same backlog, low priority is rejected while high priority is admitted."""
+    keys = queue_keys(BULK_QUEUE)
+    await redis_client.rpush(keys[0], *["m"] * 100)  # 100 tasks at 10/s = 10s wait
+    controller = make_controller(get_str_redis)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.admit(BULK_QUEUE, "low")
+    assert rejected.value.retry_after == 5
+
+    await controller.admit(BULK_QUEUE, "normal")
+    await controller.admit(BULK_QUEUE, "high")
+
+
+@pytest.mark.asyncio
+async def test_lower_priority_backlog_does_not_delay_high_priority(get_str_redis, redis_client)-> None:
+    """Only messages at the same or a higher broker priority count towards the wait."""
+    keys = queue_keys(TEXT_QUEUE)
+    await redis_client.rpush(keys[6], *["m"] * 10_000)
+    controller = make_controller(get_str_redis)
+
+    await controller.admit(TEXT_QUEUE, "high")
+    with pytest.raises(AdmissionRejected):
+        await controller.admit(TEXT_QUEUE, "low")
+
+
+@pytest.mark.asyncio
+async def test_throughput_from_completion_counters(get_str_redis, redis_client)-> None:
+    """Worker completion counters are turned into a per-lane throughput estimate."""
+    await redis_client.set(COMPLETED_COUNTER_KEY.format(queue=TEXT_QUEUE), 0)
+    controller = make_controller(get_str_redis, refresh_interval=0)
+    await controller.refresh()
+
+    await redis_client.set(COMPLETED_COUNTER_KEY.format(queue=TEXT_QUEUE), 1000)
+    await controller.refresh()
+    assert controller.throughput[TEXT_QUEUE] > 0
+
+
+@pytest.mark.asyncio
+async def test_idle_lane_keeps_its_throughput_estimate(get_str_redis, redis_client)-> None:
+    """Samples taken while a lane is idle leave the estimate alone, so the next burst is admitted."""
+    counter = COMPLETED_COUNTER_KEY.format(queue=TEXT_QUEUE)
+    await redis_client.set(counter, 0)
+    controller = make_controller(get_str_redis, refresh_interval=0)
+    await controller.refresh()
+    await redis_client.set(counter, 1000)
+    await controller.refresh()
+    measured = controller.throughput[TEXT_QUEUE]
+
+    for _ in range(50):
+        await controller.refresh()
+    assert controller.throughput[TEXT_QUEUE] == measured
+
+    await redis_client.rpush(queue_keys(TEXT_QUEUE)[3], "m", "m")
+    await controller.admit(TEXT_QUEUE, "normal")
+
+
+@pytest.mark.asyncio
+async def test_stalled_lane_wait_and_retry_after_are_bounded(get_str_redis, redis_client)-> None:
+    """A near-zero throughput estimate is floored and Retry-After is capped."""
+    await redis_client.rpush(queue_keys(TEXT_QUEUE)[3], *["m"] * 1000)
+    controller = make_controller(get_str_redis, max_retry_after=60)
+    await controller.refresh()
+    controller.throughput[TEXT_QUEUE] = 2.5e-8
+
+    assert controller.estimated_wait(TEXT_QUEUE, "normal") == 1000 / 1.0
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.admit(TEXT_QUEUE, "normal")
+    assert rejected.value.retry_after == 60
@@ -0,0 +1,55 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import pytest
+from bloom import BloomFilter
+
+
+async def ids(values):
+    for value in values:
+        yield value
+
+
+def test_sizing_matches_error_rate()-> None:
+    """The filter is sized from capacity and target error rate."""
+    bloom = BloomFilter(capacity=1_000_000, error_rate=0.01)
+    assert 9_000_000 < bloom.size < 10_000_000
+    assert bloom.hashes == 7
+    assert len(set(bloom.positions("abc"))) == bloom.hashes
+
+
+@pytest.mark.asyncio
+async def test_unbuilt_filter_does_not_reject(redis_client)-> None:
+    """Before the first rebuild, lookups are not gated and adds are ignored."""
+    bloom = BloomFilter(capacity=1000)
+    await bloom.add(redis_client, "id-1")
+
+    assert await bloom.might_contain(redis_client, "id-2") is None
+
+
+@pytest.mark.asyncio
+async def test_rebuild_then_add_and_check(redis_client)-> None:
+    """Rebuilt and newly added IDs pass the gate; unknown IDs are rejected."""
+    bloom = BloomFilter(capacity=1000)
+    stats = await bloom.rebuild(redis_client, ids(["id-1", "id-2"]))
+    await bloom.add(redis_client, "id-3")
+
+    assert stats["items"] == 2
+    assert stats["false_positive_rate"] < bloom.error_rate
+    for known in ("id-1", "id-2", "id-3"):
+        assert await bloom.might_contain(redis_client, known) is True
+    assert await bloom.might_contain(redis_client, "never-issued") is False
+
+
+@pytest.mark.asyncio
+async def test_rebuild_drops_deleted_ids(redis_client)-> None:
+    """IDs missing from the rebuild source no longer pass the gate."""
+    bloom = BloomFilter(capacity=1000)
+    await bloom.rebuild(redis_client, ids(["deleted-id"]))
+    await bloom.rebuild(redis_client, ids(["kept-id"]))
+
+    assert await bloom.might_contain(redis_client, "deleted-id") is False
+    assert await bloom.might_contain(redis_client, "kept-id") is True
@@ -0,0 +1,27 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import pytest
+from categories import CATEGORIES, category_bits, category_mask, category_vector, mask_categories
+
+
+def test_category_bits_round_trip()-> None:
+    """Filter bitmasks use the same bit layout as the stored category_mask."""
+    bits = category_bits(["hate/threatening", "violence"])
+
+    assert bits == category_mask({"hate/threatening": True, "violence": True, "sexual": False})
+    assert mask_categories(bits) == ["hate/threatening", "violence"]
+    with pytest.raises(ValueError):
+        category_bits(["not-a-category"])
+
+
+def test_category_vector_is_fixed_length()-> None:
+    """Scores are stored in CATEGORIES order, with None for categories the response lacks."""
+    vector = category_vector({"sexual": 0.5, "violence/graphic": 0.25})
+
+    assert len(vector) == len(CATEGORIES)
+    assert vector[0] == 0.5 and vector[-1] == 0.25
+    assert vector[1] is None
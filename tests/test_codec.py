@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import json
+import pytest
+from codec import encode_value, decode_value, CodecError, MAGIC, FORMAT_PACKED, FORMAT_MSGPACK
+from categories import CATEGORIES
+
+
+def moderation_response(score: float = 0.1234567) -> dict:
+    """A moderation response shaped like the upstream API."""
+    return {
+        "id": "modr-123",
+        "model": "omni-moderation-latest",
+        "results": [{
+            "flagged": True,
+            "categories": {name: index % 2 == 0 for index, name in enumerate(CATEGORIES)},
+            "category_scores": {name: score for name in CATEGORIES},
+            "category_applied_input_types": {name: ["text"] if index % 3 else [] for index, name in enumerate(CATEGORIES)},
+        }],
+    }
+
+
+def test_packed_round_trip_is_smaller_than_json()-> None:
+    """Moderation responses round-trip through the packed layout at a fraction of the JSON size."""
+    value = moderation_response()
+    encoded = encode_value(value, "packed")
+
+    assert encoded[:2] == MAGIC + FORMAT_PACKED
+    assert decode_value(encoded) == value
+    assert len(encoded) * 4 < len(json.dumps(value))
+
+
+def test_unknown_categories_fall_back_to_msgpack()-> None:
+    """Responses with categories outside the fixed layout are stored without loss."""
+    value = moderation_response()
+    value["results"][0]["categories"]["new-category"] = False
+    value["results"][0]["category_scores"]["new-category"] = 0.5
+    encoded = encode_value(value, "packed")
+
+    assert encoded[:2] == MAGIC + FORMAT_MSGPACK
+    assert decode_value(encoded) == value
+
+
+def test_large_values_are_compressed()-> None:
+    """Values above the compression threshold are compressed."""
+    value = {"status": "Processing", "text": "repeated text " * 500}
+    encoded = encode_value(value, "msgpack")
+
+    assert len(encoded) < len(value["text"])
+    assert decode_value(encoded) == value
+
+
+def test_reads_legacy_json_values()-> None:
+    """Values written before the codec rollout are still readable."""
+    value = moderation_response()
+    assert decode_value(json.dumps(value)) == value
+    assert decode_value(json.dumps(value).encode("utf-8")) == value
+
+
+def test_corrupt_value_raises_codec_error()-> None:
+    """Corrupt values raise CodecError instead of returning garbage."""
+    with pytest.raises(CodecError):
+        decode_value(MAGIC + b"mz" + b"not zlib")
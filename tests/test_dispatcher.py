@@ -0,0 +1,124 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import time
+from contextlib import contextmanager
+import serialization
+from dispatcher import DeficitRoundRobin, Dispatcher, DISPATCH_LANES, DISPATCH_DEAD_LETTER_KEY
+from tenants import TenantRegistry, Tenant, tenant_queue_key, tenant_processing_key
+from celery_worker import TEXT_QUEUE, queue_keys
+
+
+def test_drr_shares_budget_by_weight()-> None:
+    """Backlogged tenants receive throughput in proportion to their weights over many rounds."""
+    scheduler = DeficitRoundRobin(quantum=1)
+    weights = {"bulk": 1.0, "interactive": 3.0}
+    totals = {"bulk": 0, "interactive": 0}
+    for _ in range(100):
+        plan = scheduler.plan(weights, {"bulk": 1_000_000, "interactive": 1_000_000}, budget=8)
+        for name, count in plan.items():
+            totals[name] += count
+
+    assert sum(totals.values()) == 800
+    assert totals["interactive"] == 3 * totals["bulk"]
+
+
+def test_drr_gives_idle_share_to_backlogged_tenants()-> None:
+    """A tenant with little work only takes what it has; the rest of the budget goes to others."""
+    scheduler = DeficitRoundRobin(quantum=10)
+    plan = scheduler.plan({"a": 1.0, "b": 1.0}, {"a": 2, "b": 500}, budget=50)
+
+    assert plan == {"a": 2, "b": 48}
+    assert scheduler.deficits["a"] == 0
+
+
+class FakeApp:
+    def __init__(self, fail_on=None):
+        self.sent = []
+        self.fail_on = fail_on
+
+    @contextmanager
+    def producer_or_acquire(self):
+        yield None
+
+    def send_task(self, name, args, kwargs, task_id, queue, priority, producer):
+        if task_id == self.fail_on:
+            raise ConnectionError("Broker unavailable")
+        self.sent.append((name, task_id, queue, priority))
+
+
+REGISTRY = TenantRegistry({"k1": Tenant("acme", "k1", 1.0), "k2": Tenant("globex", "k2", 1.0)}, require_api_key=True)
+
+
+def seed(redis_client, lists: dict):
+    for key, values in lists.items():
+        redis_client.rpush(key, *values)
+    return redis_client
+
+
+def message(tenant: str, index: int) -> str:
+    return serialization.dumps_str({"task": "celery_worker.moderate_text_task", "args": [f"{tenant}-{index}", "text"],
+                                    "kwargs": {}, "task_id": f"{tenant}-{index}", "queue": TEXT_QUEUE,
+                                    "priority": 3, "tenant": tenant, "enqueued_at": time.time()})
+
+
+def test_dispatcher_fills_lane_up_to_backlog_in_fair_order(sync_redis)-> None:
+    """One round forwards at most the free broker backlog, shared between tenants."""
+    redis_client = seed(sync_redis, {
+        tenant_queue_key("acme", TEXT_QUEUE): [message("acme", i) for i in range(100)],
+        tenant_queue_key("globex", TEXT_QUEUE): [message("globex", i) for i in range(100)],
+        queue_keys(TEXT_QUEUE)[0]: ["already-queued"] * 2,
+    })
+    app = FakeApp()
+    dispatcher = Dispatcher(app, redis_client, REGISTRY, max_backlog=10, quantum=4)
+
+    assert dispatcher.run_once() == 8
+    sent_tenants = [task_id.split("-")[0] for _, task_id, _, _ in app.sent]
+    assert sent_tenants.count("acme") == 4 and sent_tenants.count("globex") == 4
+    assert all(queue == TEXT_QUEUE and priority == 3 for _, _, queue, priority in app.sent)
+    assert redis_client.llen(tenant_queue_key("acme", TEXT_QUEUE)) == 96
+    assert not redis_client.exists(tenant_processing_key("acme", TEXT_QUEUE))
+
+
+def test_failed_publish_returns_unsent_messages_in_order(sync_redis)-> None:
+    """Messages after a broker error go back to the head of their sub-queue; none are lost."""
+    redis_client = seed(sync_redis, {tenant_queue_key("acme", TEXT_QUEUE): [message("acme", i) for i in range(10)]})
+    app = FakeApp(fail_on="acme-2")
+    dispatcher = Dispatcher(app, redis_client, REGISTRY, max_backlog=10, quantum=5)
+
+    assert dispatcher.run_once() == 2
+    assert [task_id for _, task_id, _, _ in app.sent] == ["acme-0", "acme-1"]
+    remaining = redis_client.lrange(tenant_queue_key("acme", TEXT_QUEUE), 0, -1)
+    assert [serialization.loads(raw)["task_id"] for raw in remaining] == [f"acme-{i}" for i in range(2, 10)]
+    assert not redis_client.exists(tenant_processing_key("acme", TEXT_QUEUE))
+
+
+def test_malformed_messages_are_dead_lettered(sync_redis)-> None:
+    """Undecodable messages leave the sub-queue for the dead-letter list; the rest are sent or requeued in order."""
+    redis_client = seed(sync_redis, {tenant_queue_key("acme", TEXT_QUEUE): [
+        message("acme", 0), "{not json", serialization.dumps_str(["no", "fields"]), message("acme", 1), message("acme", 2)]})
+    app = FakeApp(fail_on="acme-2")
+    dispatcher = Dispatcher(app, redis_client, REGISTRY, max_backlog=10, quantum=5)
+
+    assert dispatcher.run_once() == 2
+    assert [task_id for _, task_id, _, _ in app.sent] == ["acme-0", "acme-1"]
+    assert redis_client.lrange(DISPATCH_DEAD_LETTER_KEY, 0, -1) == ["{not json", '["no","fields"]']
+    remaining = redis_client.lrange(tenant_queue_key("acme", TEXT_QUEUE), 0, -1)
+    assert [serialization.loads(raw)["task_id"] for raw in remaining] == ["acme-2"]
+    assert not redis_client.exists(tenant_processing_key("acme", TEXT_QUEUE))
+
+
+def test_recover_requeues_messages_of_a_stopped_dispatcher(sync_redis)-> None:
+    """Messages moved to the processing list but never settled are queued again, ahead of newer ones."""
+    redis_client = seed(sync_redis, {
+        tenant_processing_key("acme", TEXT_QUEUE): [message("acme", 0), message("acme", 1)],
+        tenant_queue_key("acme", TEXT_QUEUE): [message("acme", 2)],
+    })
+    dispatcher = Dispatcher(FakeApp(), redis_client, REGISTRY)
+
+    assert dispatcher.recover() == 2
+    remaining = redis_client.lrange(tenant_queue_key("acme", TEXT_QUEUE), 0, -1)
+    assert [serialization.loads(raw)["task_id"] for raw in remaining] == ["acme-0", "acme-1", "acme-2"]
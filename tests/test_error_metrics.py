@@ -0,0 +1,47 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import asyncio
+from fastapi import HTTPException
+from prometheus_client import CollectorRegistry, Counter
+from redis.exceptions import ConnectionError as RedisConnectionError
+from error_metrics import classify_error, record_error
+from metrics import LabelGuard, OVERFLOW_LABEL, ERROR_COUNT
+from publisher import PublisherOverloaded
+
+
+def test_classify_error_uses_type_and_code_not_message()-> None:
+    """Errors map to a bounded (type, code) pair regardless of their message."""
+    assert classify_error(PublisherOverloaded("Task Publish Buffer is Full")) == ("PublisherOverloaded", "overloaded")
+    assert classify_error(RedisConnectionError("Error 111 connecting to 10.0.0.7:6379")) == ("ConnectionError", "redis_unavailable")
+    assert classify_error(HTTPException(status_code=404, detail="Moderation Result With ID abc Not Found.")) == ("HTTPException", "http_404")
+    assert classify_error(asyncio.TimeoutError()) == ("TimeoutError", "timeout")
+    assert classify_error(RuntimeError("boom")) == ("RuntimeError", "internal")
+
+
+def test_record_error_distinct_messages_share_one_series()-> None:
+    """Errors that differ only by message increment the same series."""
+    labels = dict(method="GET", endpoint="/test", exception="RuntimeError", code="internal")
+    before = ERROR_COUNT.labels(**labels)._value.get()
+
+    record_error("GET", "/test", RuntimeError("failed for id 1"))
+    record_error("GET", "/test", RuntimeError("failed for id 2"))
+
+    assert ERROR_COUNT.labels(**labels)._value.get() == before + 2
+
+
+def test_label_guard_folds_overflow_into_one_series()-> None:
+    """Label combinations beyond the cap are recorded under the overflow series."""
+    registry = CollectorRegistry()
+    counter = Counter("guarded_test_total", "Test Counter", ["key"], registry=registry)
+    guard = LabelGuard(counter, max_series=2)
+
+    for key in ("a", "b", "c", "d", "a"):
+        guard.labels(key=key).inc()
+
+    assert registry.get_sample_value("guarded_test_total", {"key": "a"}) == 2
+    assert registry.get_sample_value("guarded_test_total", {"key": OVERFLOW_LABEL}) == 2
+    assert registry.get_sample_value("guarded_test_total", {"key": "c"}) is None
@@ -0,0 +1,61 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import asyncio
+import time
+import pytest
+from health import HealthChecker, check_workers
+
+
+@pytest.mark.asyncio
+async def test_checks_run_concurrently_with_timeouts()-> None:
+    """A hanging check times out without delaying the others; the report is an error."""
+    async def ok():
+        return {"status": "ok"}
+
+    async def hangs():
+        await asyncio.sleep(10)
+
+    async def fails():
+        raise ConnectionError("refused")
+
+    checker = HealthChecker({"a": ok, "b": hangs, "c": fails}, timeout=0.1, cache_ttl=5)
+    started = time.perf_counter()
+    report = await checker.report()
+
+    assert time.perf_counter() - started < 1
+    assert report["status"] == "error"
+    assert report["checks"]["a"]["status"] == "ok"
+    assert "Timed Out" in report["checks"]["b"]["details"]
+    assert report["checks"]["c"]["details"] == "refused"
+
+
+@pytest.mark.asyncio
+async def test_report_is_cached()-> None:
+    """Probes within the cache TTL reuse the last report."""
+    calls = []
+
+    async def counted():
+        calls.append(1)
+        return {"status": "ok"}
+
+    checker = HealthChecker({"a": counted}, timeout=1, cache_ttl=60)
+    await asyncio.gather(checker.report(), checker.report())
+    await checker.report()
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_check_requires_recent_heartbeat()-> None:
+    """Workers count as alive only with a heartbeat inside the max age."""
+    class FakeRedis:
+        def __init__(self, alive): self.alive = alive
+        async def zcount(self, *args): return self.alive
+
+    assert (await check_workers(FakeRedis(2)))["workers"] == 2
+    with pytest.raises(RuntimeError):
+        await check_workers(FakeRedis(0))
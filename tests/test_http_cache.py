@@ -0,0 +1,53 @@
+import sys
+import os
+from datetime import datetime
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from http_cache import (completed_body, result_etag, encode_result_record, record_etag, decode_result_record,
+                        weak_etag, etag_matches)
+from codec import encode_value
+
+
+def test_result_etag_covers_the_whole_body()-> None:
+    """The strong ETag follows every response field but the tier message, in any key order."""
+    created_at = datetime(2026, 10, 19, 12)
+    body = {"id": "a", "status": "Completed", "text": "hi", "created_at": created_at, "result": {"flagged": False}}
+    etag = result_etag(body)
+    assert etag == result_etag({"message": "Moderation Result Found in Cache", **dict(reversed(body.items()))})
+    assert etag != result_etag({**body, "text": ""})
+    assert etag != result_etag({**body, "created_at": datetime(2026, 10, 19, 13)})
+    assert etag != result_etag({**body, "result": {"flagged": True}})
+    assert etag.startswith('"')
+
+
+def test_redis_record_renders_the_database_body()-> None:
+    """A result record holds the body and ETag the database tier renders, full-precision scores included."""
+    created_at = datetime(2026, 10, 19, 12, 0, 0, 123456)
+    response = {"model": "m", "results": [{"flagged": False, "categories": {"hate": False},
+                                           "category_scores": {"hate": 0.123456789012}}]}
+    from_database = completed_body("a", "hi", created_at, dict(reversed(response.items())))  # JSONB key order
+    raw = encode_result_record(completed_body("a", "hi", created_at, response))
+
+    assert record_etag(raw) == result_etag(from_database)
+    assert decode_result_record(raw) == from_database
+    assert list(decode_result_record(raw)["result"]) == list(from_database["result"])
+    assert record_etag(encode_value(response)) is None  # Bare upstream responses of older workers
+
+
+def test_weak_etag_depends_on_records()-> None:
+    """Listing ETags change when any returned record changes."""
+    assert weak_etag(2, ("a", "completed")) == weak_etag(2, ("a", "completed"))
+    assert weak_etag(2, ("a", "completed")) != weak_etag(2, ("a", "pending"))
+    assert weak_etag(1).startswith('W/"')
+
+
+def test_etag_matches_if_none_match_lists()-> None:
+    """If-None-Match matches any listed tag, weak or strong, and the wildcard."""
+    etag = '"0123abcd"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
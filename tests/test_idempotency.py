@@ -0,0 +1,80 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import asyncio
+import pytest
+from celery_worker import queue_keys, TEXT_QUEUE
+from idempotency import IdempotencyClaim, DuplicateSubmission
+from publisher import SubmitScriptPublisher, TenantQueuePublisher
+from tenants import tenant_queue_key
+
+
+def claim(key: str, text: str = "hello", text_id: str = "id-1") -> IdempotencyClaim:
+    return IdempotencyClaim("acme", key, "/api/v1/moderate/text", {"text": text},
+                            {"message": "Text Moderation Task Queued", "id": text_id})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retries_are_published_once(get_redis, redis_client, text_task)-> None:
+    """Retries with one key are enqueued once; the others get the first response back."""
+    publisher = SubmitScriptPublisher(get_redis)
+    options = {"queue": TEXT_QUEUE}
+    results = await asyncio.gather(*(publisher.publish(text_task, [f"id-{i}"], options,
+                                                       idempotency=claim("retry-key", text_id=f"id-{i}"))
+                                     for i in range(5)), return_exceptions=True)
+    await publisher.stop()
+
+    assert await redis_client.llen(queue_keys(TEXT_QUEUE)[0]) == 1
+    duplicates = [result for result in results if isinstance(result, DuplicateSubmission)]
+    assert len(duplicates) == 4
+    assert all(duplicate.response["id"] == "id-0" and duplicate.matches(claim("retry-key")) for duplicate in duplicates)
+    assert not duplicates[0].matches(claim("retry-key", text="something else"))
+
+
+@pytest.mark.asyncio
+async def test_failed_submit_does_not_claim_the_key(get_redis, redis_client, text_task)-> None:
+    """The key is claimed by the script that enqueues, so a submit that never ran does not block its retry."""
+    get_redis.fail = 1
+    publisher = SubmitScriptPublisher(get_redis)
+    with pytest.raises(ConnectionError):
+        await publisher.publish(text_task, ["id-1"], {"queue": TEXT_QUEUE}, idempotency=claim("flaky"))
+
+    await publisher.publish(text_task, ["id-1"], {"queue": TEXT_QUEUE}, idempotency=claim("flaky"))
+    await publisher.stop()
+
+    assert await redis_client.llen(queue_keys(TEXT_QUEUE)[0]) == 1
+
+
+@pytest.mark.asyncio
+async def test_tenant_queue_claim_and_enqueue_are_one_script(get_redis, redis_client, text_task)-> None:
+    """With fair queuing, the key is claimed in the same script that appends the message."""
+    publisher = TenantQueuePublisher(get_redis)
+    options = {"queue": "moderation.text", "priority": 3}
+    await publisher.publish(text_task, ["id-1", "hello"], options, tenant="acme", idempotency=claim("k"))
+    with pytest.raises(DuplicateSubmission):
+        await publisher.publish(text_task, ["id-2", "hello"], options, tenant="acme", idempotency=claim("k", text_id="id-2"))
+    await publisher.stop()
+
+    assert await redis_client.llen(tenant_queue_key("acme", "moderation.text")) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_leaves_no_claim(get_redis, redis_client, text_task)-> None:
+    """A script that fails on the push claims nothing, and fails only its own submission in the batch."""
+    await redis_client.set(tenant_queue_key("broken", "moderation.text"), "not a list")
+
+    publisher = TenantQueuePublisher(get_redis)
+    options = {"queue": "moderation.text"}
+    results = await asyncio.gather(
+        publisher.publish(text_task, ["id-1"], options, tenant="broken", idempotency=claim("a")),
+        publisher.publish(text_task, ["id-2"], options, tenant="acme", idempotency=claim("b", text_id="id-2")),
+        return_exceptions=True)
+    await publisher.stop()
+
+    assert isinstance(results[0], Exception) and isinstance(results[1], str)
+    assert not await redis_client.exists(claim("a").redis_key)
+    assert await redis_client.exists(claim("b").redis_key)
+    assert await redis_client.llen(tenant_queue_key("acme", "moderation.text")) == 1
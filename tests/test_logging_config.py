@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import logging
+import queue
+import pytest
+import structlog
+from logging_config import EventSampler, FieldTruncator, DroppingQueueHandler, parse_sample_rates
+from metrics import LOG_EVENTS_DROPPED
+
+
+def dropped(reason: str) -> float:
+    return LOG_EVENTS_DROPPED.labels(reason=reason)._value.get()
+
+
+def test_sampler_drops_sampled_info_events_but_keeps_errors()-> None:
+    """A zero rate drops info events and counts them; warnings and errors always pass."""
+    sampler = EventSampler({"Text Moderation Task Queued": 0.0})
+    before = dropped("sampled")
+
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "info", {"event": "Text Moderation Task Queued"})
+    assert dropped("sampled") == before + 1
+
+    event = {"event": "Text Moderation Task Queued"}
+    assert sampler(None, "error", event) is event
+    assert sampler(None, "info", {"event": "Other Event"}) == {"event": "Other Event"}
+
+
+def test_truncator_caps_large_fields()-> None:
+    """Submitted text and URLs are cut down to the configured size."""
+    truncator = FieldTruncator(fields=("text",), max_length=10)
+    event = truncator(None, "info", {"event": "Queued", "text": "x" * 25, "text_id": "y" * 25})
+
+    assert event["text"] == "x" * 10 + "...[15 more]"
+    assert event["text_id"] == "y" * 25
+
+
+def test_queue_handler_drops_when_full()-> None:
+    """A full log queue drops and counts records instead of blocking the caller."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("moderation", logging.INFO, __file__, 1, "{}", None, None)
+    before = dropped("queue_full")
+
+    handler.emit(record)
+    handler.emit(record)
+
+    assert handler.queue.qsize() == 1
+    assert dropped("queue_full") == before + 1
+
+
+def test_parse_sample_rates()-> None:
+    """Rates are parsed per event name and clamped to [0, 1]."""
+    assert parse_sample_rates("A Event=0.5; B Event=2") == {"A Event": 0.5, "B Event": 1.0}
+    assert parse_sample_rates("") == {}
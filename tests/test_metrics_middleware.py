@@ -0,0 +1,48 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from metrics import REQUEST_COUNT, REQUESTS_IN_PROGRESS
+from metrics_middleware import PrometheusMiddleware, UNMATCHED_ENDPOINT
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str) -> dict:
+        return {"id": item_id}
+
+    app.add_middleware(PrometheusMiddleware)
+    return TestClient(app)
+
+
+def count(endpoint: str) -> float:
+    return REQUEST_COUNT.labels(method="GET", endpoint=endpoint)._value.get()
+
+
+def test_endpoint_label_is_route_template()-> None:
+    """Dynamic paths are recorded under the matched route's template."""
+    client = build_client()
+    before = count("/items/{item_id}")
+
+    client.get("/items/a")
+    client.get("/items/b")
+
+    assert count("/items/{item_id}") == before + 2
+    assert REQUESTS_IN_PROGRESS.labels(method="GET")._value.get() == 0
+
+
+def test_unmatched_paths_share_one_label()-> None:
+    """Unknown paths do not create a series per raw path."""
+    client = build_client()
+    before = count(UNMATCHED_ENDPOINT)
+
+    assert client.get("/no/such/path").status_code == 404
+
+    assert count(UNMATCHED_ENDPOINT) == before + 1
+    assert count("/no/such/path") == 0
@@ -0,0 +1,47 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__) + "/..")
+
+
+def run_python(code: str, multiproc_dir: str) -> str:
+    """Runs code in a fresh interpreter (multi-process mode is chosen at import time)."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": multiproc_dir}
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, timeout=60, check=True)
+    return result.stdout.strip()
+
+
+def test_metrics_are_merged_across_processes(tmp_path)-> None:
+    """Counters and histograms from separate processes are summed in the exposed registry."""
+    record = ("from metrics import TASK_DURATION, LOG_EVENTS_DROPPED\n"
+              "TASK_DURATION.labels(task='t', state='SUCCESS').observe(0.2)\n"
+              "LOG_EVENTS_DROPPED.labels(reason='sampled').inc(3)\n")
+    run_python(record, str(tmp_path))
+    run_python(record, str(tmp_path))
+
+    merged = run_python(
+        "from metrics import metrics_registry\n"
+        "registry = metrics_registry()\n"
+        "print(registry.get_sample_value('log_events_dropped_total', {'reason': 'sampled'}),\n"
+        "      registry.get_sample_value('celery_task_duration_seconds_count', {'task': 't', 'state': 'SUCCESS'}))\n",
+        str(tmp_path))
+
+    assert merged == "6.0 2.0"
+
+
+def test_dead_process_live_gauges_are_dropped(tmp_path)-> None:
+    """Live gauges of a process that marked itself dead no longer count towards the total."""
+    run_python("from metrics import PUBLISH_BUFFER_DEPTH\nPUBLISH_BUFFER_DEPTH.set(5)\n", str(tmp_path))
+    run_python("from metrics import PUBLISH_BUFFER_DEPTH, mark_process_dead\n"
+               "PUBLISH_BUFFER_DEPTH.set(7)\nmark_process_dead()\n", str(tmp_path))
+
+    merged = run_python("from metrics import metrics_registry\n"
+                        "print(metrics_registry().get_sample_value('task_publish_buffer_depth'))\n", str(tmp_path))
+
+    assert merged == "5.0"
@@ -0,0 +1,40 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from metrics import MetricsSnapshot
+
+
+def build_registry():
+    registry = CollectorRegistry()
+    counter = Counter("jobs_total", "Jobs", ["kind"], registry=registry)
+    Histogram("job_seconds", "Job Duration", buckets=(1.0,), registry=registry).observe(0.5)
+    counter.labels(kind="a").inc()
+    return registry, counter
+
+
+def test_snapshot_reads_collectors_directly()-> None:
+    """Families are keyed by name with typed, named samples."""
+    registry, _ = build_registry()
+    families = MetricsSnapshot(lambda: registry, ttl=60).get()
+
+    assert families["jobs"]["type"] == "counter"
+    assert {"name": "jobs_total", "labels": {"kind": "a"}, "value": 1.0} in families["jobs"]["values"]
+    assert {"name": "job_seconds_count", "labels": {}, "value": 1.0} in families["job_seconds"]["values"]
+
+
+def test_snapshot_is_cached_and_filtered()-> None:
+    """Within the TTL the same snapshot is served; prefixes limit the families returned."""
+    registry, counter = build_registry()
+    snapshot = MetricsSnapshot(lambda: registry, ttl=60)
+    snapshot.get()
+    counter.labels(kind="a").inc()
+
+    filtered = snapshot.get(["job_"])
+
+    assert list(filtered) == ["job_seconds"]
+    assert snapshot.get()["jobs"]["values"][0]["value"] == 1.0
+    assert MetricsSnapshot(lambda: registry, ttl=0).get()["jobs"]["values"][0]["value"] == 2.0
@@ -0,0 +1,37 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from models import parse_text_id, result_columns
+from categories import mask_categories
+
+
+def test_parse_text_id_accepts_only_uuids()-> None:
+    """Lookups for IDs that are not UUIDs are answered without querying the UUID column."""
+    assert parse_text_id("6F9619FF-8B86-D011-B42D-00C04FC964FF") == "6f9619ff-8b86-d011-b42d-00c04fc964ff"
+    assert parse_text_id("not-a-uuid") is None
+    assert parse_text_id("") is None
+
+
+def test_result_columns_extracts_hot_fields()-> None:
+    """flagged, model and the highest category score are pulled out of the upstream response."""
+    moderation_data = {"model": "omni-moderation-latest",
+                       "results": [{"flagged": True, "category_scores": {"hate": 0.25, "violence": 0.75}}]}
+
+    columns = result_columns(moderation_data)
+    assert (columns["flagged"], columns["model"], columns["max_score"]) == (True, "omni-moderation-latest", 0.75)
+    assert result_columns({}) == {"flagged": None, "model": None, "max_score": None,
+                                  "category_mask": 0, "category_scores": None}
+
+
+def test_result_columns_packs_categories()-> None:
+    """Known categories become the bitmask and score vector; unknown ones stay in the JSONB result."""
+    moderation_data = {"results": [{"categories": {"sexual": False, "hate": True, "new-category": True},
+                                    "category_scores": {"sexual": 0.1, "hate": 0.9, "new-category": 0.8}}]}
+    columns = result_columns(moderation_data)
+
+    assert mask_categories(columns["category_mask"]) == ["hate"]
+    assert columns["category_scores"][:5] == [0.1, None, None, None, 0.9]
+
@@ -0,0 +1,109 @@
+import sys
+import os
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from sqlalchemy.dialects import postgresql
+from models import new_text_id, text_id_created_at, id_filter
+from partitions import Partition, parse_bound, plan_partitions, maintain_partitions
+
+
+def test_new_text_id_is_time_ordered_uuid7()-> None:
+    """IDs are RFC 9562 version 7 UUIDs whose embedded timestamp is their creation time."""
+    before = datetime.now() - timedelta(seconds=1)
+    ids = [new_text_id() for _ in range(50)]
+    after = datetime.now() + timedelta(seconds=1)
+
+    assert all(uuid.UUID(value).version == 7 and uuid.UUID(value).variant == uuid.RFC_4122 for value in ids)
+    assert len(set(ids)) == 50
+    assert all(before <= text_id_created_at(value) <= after for value in ids)
+    assert text_id_created_at(str(uuid.uuid4())) is None
+    assert text_id_created_at("not-a-uuid") is None
+
+
+def test_id_filter_bounds_created_at_for_uuid7()-> None:
+    """Lookups by a time-ordered ID carry a created_at window, so only nearby partitions are probed."""
+    def columns(clauses):
+        return [str(clause.compile(dialect=postgresql.dialect())) for clause in clauses]
+
+    assert len(id_filter(new_text_id())) == 3
+    assert any("created_at >=" in clause for clause in columns(id_filter(new_text_id())))
+    assert len(id_filter(str(uuid.uuid4()))) == 1
+
+
+def test_parse_bound()-> None:
+    assert parse_bound("FOR VALUES FROM ('2026-10-19 00:00:00') TO ('2026-10-20 00:00:00')") == \
+        (datetime(2026, 10, 19), datetime(2026, 10, 20))
+    assert parse_bound("FOR VALUES FROM (MINVALUE) TO ('2026-10-20 00:00:00')") == (None, datetime(2026, 10, 20))
+
+
+def test_plan_partitions_creates_missing_days_and_drops_expired()-> None:
+    """Uncovered upcoming days are created; partitions entirely past the retention cutoff are dropped."""
+    today = date(2026, 10, 19)
+    existing = [
+        Partition("moderation_results_legacy", None, datetime(2026, 9, 1)),
+        Partition("moderation_results_p20260918", datetime(2026, 9, 18), datetime(2026, 9, 19)),
+        Partition("moderation_results_p20260919", datetime(2026, 9, 19), datetime(2026, 9, 20)),
+        Partition("moderation_results_p20261019", datetime(2026, 10, 19), datetime(2026, 10, 20)),
+        Partition("moderation_results_p20261020", datetime(2026, 10, 20), datetime(2026, 10, 21)),
+        Partition("moderation_results_default", None, None, default=True),
+    ]
+
+    create, drop = plan_partitions(existing, today, retention_days=30, precreate_days=3)
+    assert [name for name, _, _ in create] == ["moderation_results_p20261021", "moderation_results_p20261022"]
+    assert create[0][1:] == (datetime(2026, 10, 21), datetime(2026, 10, 22))
+    assert drop == ["moderation_results_legacy", "moderation_results_p20260918"]
+
+
+class FakeResult(list):
+    pass
+
+class FakeNested:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+class FakeConnection:
+    """Answers The Catalog Query With Fixed Partitions And Records DDL; One Statement Fails."""
+
+    def __init__(self, partitions: list, failing: str):
+        self.partitions = partitions
+        self.failing = failing
+        self.statements = []
+
+    def begin_nested(self):
+        return FakeNested(self)
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        if "pg_inherits" in sql:
+            return FakeResult(self.partitions)
+        if self.failing in sql:
+            raise RuntimeError("updated partition constraint for default partition would be violated")
+        self.statements.append(sql)
+        return FakeResult()
+
+
+def test_maintain_partitions_runs_ddl_and_isolates_failures()-> None:
+    """Each partition is created or dropped on its own; a failing one is reported, not fatal."""
+    connection = FakeConnection([
+        ("moderation_results_p20260901", "FOR VALUES FROM ('2026-09-01 00:00:00') TO ('2026-09-02 00:00:00')"),
+        ("moderation_results_default", "DEFAULT"),
+    ], failing="moderation_results_p20261020")
+
+    stats = asyncio.run(maintain_partitions(connection, today=date(2026, 10, 19), retention_days=30, precreate_days=2))
+    assert stats == {"created": ["moderation_results_p20261019", "moderation_results_p20261021"],
+                     "dropped": ["moderation_results_p20260901"],
+                     "failed": ["moderation_results_p20261020"]}
+    assert connection.statements[0] == ("CREATE TABLE IF NOT EXISTS moderation_results_p20261019 PARTITION OF "
+                                        "moderation_results FOR VALUES FROM ('2026-10-19 00:00:00') TO ('2026-10-20 00:00:00')")
+    assert connection.statements[-1] == "DROP TABLE IF EXISTS moderation_results_p20260901"
@@ -0,0 +1,42 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import pytest
+from unittest.mock import patch
+import payload_store
+from payload_store import needs_claim_check, payload_ref, store_payload, fetch_payload, PayloadNotFound
+
+
+def test_needs_claim_check_uses_encoded_size()-> None:
+    """Texts are claim-checked by UTF-8 size, not character count."""
+    limit = payload_store.CLAIM_CHECK_THRESHOLD
+    assert not needs_claim_check("a" * limit)
+    assert needs_claim_check("a" * (limit + 1))
+    assert needs_claim_check("é" * (limit // 2 + 1))  # 2 bytes per character
+
+
+def test_payload_ref_is_content_addressed()-> None:
+    """Identical payloads share one reference."""
+    assert payload_ref("same text") == payload_ref("same text")
+    assert payload_ref("same text") != payload_ref("other text")
+
+
+@pytest.mark.asyncio
+async def test_store_and_fetch_payload(get_redis, redis_client)-> None:
+    """Payloads are stored compressed and restored unchanged."""
+    text = "long post " * 2000
+    with patch("payload_store.get_payload_redis", new=get_redis):
+        ref = await store_payload(text)
+        assert await redis_client.strlen(ref) < len(text)
+        assert await fetch_payload(ref) == text
+
+
+@pytest.mark.asyncio
+async def test_fetch_missing_payload(get_redis)-> None:
+    """An expired reference raises PayloadNotFound so the task is retried."""
+    with patch("payload_store.get_payload_redis", new=get_redis):
+        with pytest.raises(PayloadNotFound):
+            await fetch_payload("payload:missing")
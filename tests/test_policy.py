@@ -0,0 +1,87 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from categories import CATEGORIES, CATEGORY_INDEX
+from policy import DEFAULT_POLICY, Policy, PolicyError, PolicySet, score_matrix
+
+POLICY = {
+    "name": "strict-text",
+    "thresholds": {"hate": 0.3},
+    "weights": {"harassment": 1.0, "violence": 2.0},
+    "rules": [
+        {"decision": "block", "when": {"any": ["hate", {"score": "violence", "gte": 0.9}]}},
+        {"decision": "review", "when": {"all": [{"weighted": {"gte": 0.5}}, {"not": "sexual"}]}},
+    ],
+    "default": "allow",
+}
+
+
+def vector(**scores) -> list:
+    values = [0.0] * len(CATEGORIES)
+    for name, score in scores.items():
+        values[CATEGORY_INDEX[name.replace("_", "/")]] = score
+    return values
+
+
+def test_rules_apply_in_order_with_thresholds_and_weights()-> None:
+    """The first matching rule decides: per-category thresholds, explicit bounds, weighted sums and negation."""
+    policy = Policy(POLICY)
+    assert policy.decide_one(vector(hate=0.35)) == "block"                       # Policy threshold, below the default
+    assert policy.decide_one(vector(violence=0.95)) == "block"                   # Explicit bound
+    assert policy.decide_one(vector(violence=0.3)) == "review"                   # Weighted: 2 * 0.3 >= 0.5
+    assert policy.decide_one(vector(violence=0.3, sexual=0.6)) == "allow"        # Negated category hit
+    assert policy.decide_one(vector(harassment=0.4)) == "allow"
+    assert policy.decide_one(None) == "allow"                                    # No scores never reach a threshold
+
+
+def test_matrix_evaluation_matches_row_by_row()-> None:
+    """Evaluating a whole score matrix gives the same decisions as deciding each row on its own."""
+    rng = np.random.default_rng(7)
+    scores = rng.random((500, len(CATEGORIES)), dtype=np.float32) * 0.6
+    policy = Policy(POLICY)
+
+    decisions = policy.decide(scores)
+    assert decisions.shape == (500,)
+    assert list(decisions) == [policy.decide_one(list(row)) for row in scores]
+    assert set(decisions) == {"block", "review", "allow"}
+
+
+def test_score_matrix_handles_missing_scores()-> None:
+    matrix = score_matrix([None, vector(hate=0.2), [None] * len(CATEGORIES)])
+    assert matrix.shape == (3, len(CATEGORIES)) and matrix.dtype == np.float32
+    assert np.isnan(matrix[0]).all() and np.isnan(matrix[2]).all()
+    assert matrix[1, CATEGORY_INDEX["hate"]] == pytest.approx(0.2)
+
+
+def test_policy_id_follows_the_spec()-> None:
+    """A changed threshold is a different policy; the same spec always gets the same ID."""
+    changed = {**POLICY, "thresholds": {"hate": 0.4}}
+    assert Policy(POLICY).id == Policy(dict(POLICY)).id
+    assert Policy(POLICY).id != Policy(changed).id
+    assert Policy(POLICY).id.startswith("strict-text@")
+
+
+@pytest.mark.parametrize("spec", [
+    {"rules": []},
+    {"name": "x", "thresholds": {"not-a-category": 0.5}},
+    {"name": "x", "rules": [{"decision": "block", "when": {"any": []}}]},
+    {"name": "x", "rules": [{"decision": "block", "when": {"score": "hate"}}]},
+    {"name": "x", "rules": [{"decision": "block", "when": {"nope": "hate"}}]},
+    {"name": "x", "rules": [{"when": "hate"}]},
+])
+def test_malformed_policies_are_rejected(spec)-> None:
+    with pytest.raises(PolicyError):
+        Policy(spec)
+
+
+def test_policy_set_falls_back_to_default()-> None:
+    policies = PolicySet.from_spec({"text": POLICY})
+    assert policies.for_surface("text").name == "strict-text"
+    assert policies.for_surface("image").name == DEFAULT_POLICY["name"]
+    assert policies.for_surface("image").decide_one(vector(hate=0.5)) == "block"
@@ -0,0 +1,92 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import asyncio
+import pytest
+import serialization
+from celery_worker import queue_keys, TEXT_QUEUE
+from publisher import SubmitScriptPublisher, PublisherOverloaded, PublishTimedOut
+
+
+async def published_ids(redis_client, queue: str = TEXT_QUEUE) -> list:
+    raw = await redis_client.lrange(queue_keys(queue)[0], 0, -1)
+    return [serialization.loads(message)["headers"]["id"] for message in reversed(raw)]
+
+
+@pytest.mark.asyncio
+async def test_publish_returns_task_id(get_redis, redis_client, text_task)-> None:
+    """Published messages carry the returned task ID on the lane's broker list."""
+    publisher = SubmitScriptPublisher(get_redis)
+
+    task_id = await publisher.publish(text_task, ["id-1", "text"], {"queue": TEXT_QUEUE})
+    await publisher.stop()
+
+    assert await published_ids(redis_client) == [task_id]
+
+
+@pytest.mark.asyncio
+async def test_publishes_concurrent_submissions_in_batches(get_redis, redis_client, text_task)-> None:
+    """Concurrent submissions share Redis round trips instead of one per task."""
+    publisher = SubmitScriptPublisher(get_redis, max_batch=50)
+
+    task_ids = await asyncio.gather(*(publisher.publish(text_task, [str(i)], {"queue": TEXT_QUEUE}) for i in range(100)))
+    await publisher.stop()
+
+    assert sorted(await published_ids(redis_client)) == sorted(task_ids)
+    assert get_redis.opened < 100
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_is_raised_to_caller(get_redis, redis_client, text_task)-> None:
+    """A Redis error fails the submissions of that batch; later batches go through."""
+    get_redis.fail = 1
+    publisher = SubmitScriptPublisher(get_redis)
+
+    with pytest.raises(ConnectionError):
+        await publisher.publish(text_task, ["bad"], {"queue": TEXT_QUEUE})
+    task_id = await publisher.publish(text_task, ["good"], {"queue": TEXT_QUEUE})
+    await publisher.stop()
+
+    assert await published_ids(redis_client) == [task_id]
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_rejects_submissions(get_redis, text_task)-> None:
+    """The bounded buffer rejects new submissions instead of growing without limit."""
+    get_redis.gate = asyncio.Event()
+    publisher = SubmitScriptPublisher(get_redis, max_buffer=1, max_batch=1)
+
+    first = asyncio.create_task(publisher.publish(text_task, ["1"], {"queue": TEXT_QUEUE}))
+    await asyncio.sleep(0.05)  # First task is now blocked waiting for Redis
+    second = asyncio.create_task(publisher.publish(text_task, ["2"], {"queue": TEXT_QUEUE}))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PublisherOverloaded):
+        await publisher.publish(text_task, ["3"], {"queue": TEXT_QUEUE})
+
+    get_redis.gate.set()
+    await asyncio.gather(first, second)
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_submission_is_never_sent(get_redis, redis_client, text_task)-> None:
+    """A submission still buffered when its caller times out is dropped; one already being sent is reported as such."""
+    get_redis.gate = asyncio.Event()
+    publisher = SubmitScriptPublisher(get_redis, max_batch=1, publish_timeout=0.05)
+
+    sending = asyncio.create_task(publisher.publish(text_task, ["1"], {"queue": TEXT_QUEUE}, task_id="sending"))
+    await asyncio.sleep(0)  # The first submission is taken and waits for Redis
+    with pytest.raises(PublishTimedOut) as buffered:
+        await publisher.publish(text_task, ["2"], {"queue": TEXT_QUEUE}, task_id="buffered")
+    with pytest.raises(PublishTimedOut) as in_flight:
+        await sending
+
+    get_redis.gate.set()
+    await publisher.stop()
+
+    assert not buffered.value.may_be_published and in_flight.value.may_be_published
+    assert await published_ids(redis_client) == ["sending"]
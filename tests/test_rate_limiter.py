@@ -0,0 +1,77 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import uuid
+
+import pytest
+from rate_limiter import HybridRateLimiter, RateLimit, parse_limits, limit_identity
+
+
+def test_burst_then_reject_with_retry_after(get_str_redis)-> None:
+    """A fresh key gets its burst, then is rejected until tokens refill."""
+    limiter = HybridRateLimiter(get_str_redis, default_limit=RateLimit(rate=1.0, burst=3))
+
+    assert [limiter.acquire("key") for _ in range(3)] == [None, None, None]
+    retry_after = limiter.acquire("key")
+
+    assert retry_after is not None and 0 < retry_after <= 1.0
+
+
+def test_per_key_limits_override_default(get_str_redis)-> None:
+    """Configured API keys get their own rate and burst; other keys use the default."""
+    limits = parse_limits("big-tenant=600:10; small-tenant=60")
+    limiter = HybridRateLimiter(get_str_redis, default_limit=RateLimit.per_minute(1), limits=limits)
+
+    assert limits["small-tenant"].burst == 60
+    assert all(limiter.acquire("big-tenant") is None for _ in range(10))
+    assert limiter.acquire("big-tenant") is not None
+    assert limiter.acquire("anonymous") is None
+    assert limiter.acquire("anonymous") is not None
+
+
+@pytest.mark.asyncio
+async def test_sync_reports_consumption_and_splits_remaining_tokens(get_str_redis, redis_client)-> None:
+    """Local consumption is reported once and each process keeps its share of what is left."""
+    await HybridRateLimiter(get_str_redis, default_limit=RateLimit(rate=0.0, burst=10)).sync()  # A second process
+    limiter = HybridRateLimiter(get_str_redis, default_limit=RateLimit(rate=0.0, burst=10))
+    limiter.acquire("key")
+    limiter.acquire("key")
+
+    await limiter.sync()
+    await limiter.sync()
+
+    assert float(await redis_client.hget("ratelimit:key", "tokens")) == 8
+    assert limiter.instances == 2
+    # Half of the 8 shared tokens are this process's to spend
+    assert [limiter.acquire("key") for _ in range(5)].count(None) == 4
+
+
+@pytest.mark.asyncio
+async def test_exhausted_shared_bucket_rejects_locally(get_str_redis, redis_client)-> None:
+    """Once other processes used up the shared bucket, this process stops admitting."""
+    await redis_client.hset("ratelimit:key", "tokens", -3)
+    limiter = HybridRateLimiter(get_str_redis, default_limit=RateLimit(rate=0.0, burst=10))
+    limiter.acquire("key")
+
+    await limiter.sync()
+
+    assert limiter.acquire("key") is not None
+
+
+def test_unknown_api_keys_share_the_client_ip_bucket(get_str_redis)-> None:
+    """Rotating made-up API keys neither refreshes the burst nor creates a bucket per key."""
+    limiter = HybridRateLimiter(get_str_redis, default_limit=RateLimit(rate=1.0, burst=3))
+    known_keys = {"tenant-key"}
+
+    decisions = []
+    for i in range(5):
+        identity, kind = limit_identity(f"random-key-{uuid.uuid4()}", "203.0.113.7", known_keys)
+        decisions.append(limiter.acquire(identity, kind))
+
+    assert decisions[:3] == [None, None, None] and all(d is not None for d in decisions[3:])
+    assert list(limiter._buckets) == ["203.0.113.7"]
+    assert limit_identity("tenant-key", "203.0.113.7", known_keys) == ("tenant-key", "api_key")
+    assert limit_identity(None, "203.0.113.7", known_keys) == ("203.0.113.7", "client_ip")
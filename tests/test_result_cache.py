@@ -0,0 +1,72 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import time
+from result_cache import ResultCache
+
+
+def test_get_returns_cached_value()-> None:
+    """Cached results are returned until invalidated."""
+    cache = ResultCache()
+    cache.put("id-1", {"status": "Completed"}, 10)
+
+    assert cache.get("id-1") == {"status": "Completed"}
+    cache.invalidate("id-1")
+    assert cache.get("id-1") is None
+
+
+def test_evicts_least_recently_used_entry()-> None:
+    """The entry cap evicts the least recently used result first."""
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1, 1)
+    cache.put("b", 2, 1)
+    cache.get("a")           # "b" is now the least recently used
+    cache.put("c", 3, 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_memory_cap_evicts_entries()-> None:
+    """The size cap bounds the total cached bytes."""
+    cache = ResultCache(max_bytes=100)
+    for i in range(10):
+        cache.put(str(i), i, 30)
+
+    assert cache._bytes <= 100
+    assert cache.get("9") == 9
+    assert cache.get("0") is None
+
+
+def test_entries_expire_after_ttl()-> None:
+    """Entries older than the TTL are treated as misses."""
+    cache = ResultCache(ttl=0.01)
+    cache.put("id-1", 1, 1)
+    time.sleep(0.02)
+
+    assert cache.get("id-1") is None
+
+
+def test_negative_cache()-> None:
+    """Recently 404'd IDs are remembered for the negative TTL and forgotten once a result is cached."""
+    cache = ResultCache(negative_ttl=60)
+    cache.put_missing("id-1")
+    assert cache.is_missing("id-1")
+
+    cache.put("id-1", 1, 1)
+    assert not cache.is_missing("id-1")
+
+
+def test_clear_drops_everything()-> None:
+    """Clearing removes both positive and negative entries."""
+    cache = ResultCache()
+    cache.put("a", 1, 1)
+    cache.put_missing("b")
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert not cache.is_missing("b")
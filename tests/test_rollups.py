@@ -0,0 +1,107 @@
+import sys
+import os
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+from categories import CATEGORIES
+from rollups import (ALL_CATEGORIES, HISTOGRAM_BINS, PRUNE_ROLLUPS_SQL, ROLLUP_SQL, category_indexes,
+                     merge_histograms, prune_rollups, read_rollups, roll_up)
+
+
+class FakeResult:
+    def __init__(self, value=None, rowcount=0):
+        self.value = value
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self.value
+
+class FakeConnection:
+    """Holds The Watermark (None While Another Run Has it Locked) And Records Statements."""
+
+    def __init__(self, watermark):
+        self.watermark = watermark
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if "FOR UPDATE SKIP LOCKED" in sql:
+            return FakeResult(self.watermark)
+        if sql.startswith("UPDATE rollup_watermarks"):
+            self.watermark = params["until"]
+        return FakeResult(rowcount=26)
+
+
+def test_roll_up_processes_rows_since_watermark_up_to_lag()-> None:
+    """New rows are read from the watermark to now minus the lag, then the watermark moves there."""
+    now = datetime(2026, 10, 19, 12, 0, 0)
+    connection = FakeConnection(now - timedelta(minutes=1))
+
+    stats = asyncio.run(roll_up(connection, now=now, lag_seconds=30))
+    assert stats == {"skipped": False, "since": now - timedelta(minutes=1), "until": now - timedelta(seconds=30), "buckets": 26}
+    assert connection.statements[1] == (ROLLUP_SQL, {"since": now - timedelta(minutes=1), "until": now - timedelta(seconds=30)})
+    assert connection.watermark == now - timedelta(seconds=30)
+
+    # Nothing new yet: the watermark is already inside the lag window
+    stats = asyncio.run(roll_up(connection, now=now, lag_seconds=30))
+    assert stats["buckets"] == 0 and len(connection.statements) == 4
+
+
+def test_roll_up_skips_while_another_run_holds_the_watermark()-> None:
+    connection = FakeConnection(None)
+    assert asyncio.run(roll_up(connection)) == {"skipped": True}
+    assert len(connection.statements) == 1
+
+
+def test_prune_rollups_uses_the_partition_retention_cutoff()-> None:
+    """Buckets go once the day they belong to is past retention, like the partition holding their results."""
+    connection = FakeConnection(None)
+    assert asyncio.run(prune_rollups(connection, today=date(2026, 10, 19), retention_days=30)) == 26
+    assert connection.statements == [(PRUNE_ROLLUPS_SQL, {"cutoff": datetime(2026, 9, 19)})]
+
+
+def test_rollup_sql_counts_every_category_and_bin()-> None:
+    assert ROLLUP_SQL.count("width_bucket") == HISTOGRAM_BINS
+    assert "('minute'), ('hour')" in ROLLUP_SQL
+    assert "ON CONFLICT (granularity, bucket, source_type, category)" in ROLLUP_SQL
+
+
+def test_category_indexes()-> None:
+    assert category_indexes(["all", "hate", CATEGORIES[-1]]) == [ALL_CATEGORIES, CATEGORIES.index("hate"), len(CATEGORIES) - 1]
+    with pytest.raises(ValueError):
+        category_indexes(["not-a-category"])
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.query = None
+
+    async def execute(self, query):
+        self.query = query
+        return self.rows
+
+
+def test_read_rollups_sums_source_types()-> None:
+    """Rows come back summed per bucket and category; histograms of the source types are added bin by bin."""
+    bucket = datetime(2026, 10, 19, 12)
+    session = FakeSession([
+        (bucket, ALL_CATEGORIES, 10, 4, [[6, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 2, 2]]),
+        (bucket, 0, 10, 0, [[10] + [0] * 9]),
+    ])
+
+    series = asyncio.run(read_rollups(session, "hour", bucket, bucket + timedelta(hours=1), [ALL_CATEGORIES, 0], "text"))
+    assert series == [
+        {"bucket": bucket, "category": "all", "results": 10, "flagged": 4, "flagged_rate": 0.4,
+         "histogram": [6, 0, 0, 0, 0, 0, 0, 0, 2, 2]},
+        {"bucket": bucket, "category": CATEGORIES[0], "results": 10, "flagged": 0, "flagged_rate": 0.0,
+         "histogram": [10] + [0] * 9},
+    ]
+    assert "moderation_rollups.source_type" in str(session.query)
+    assert merge_histograms([]) == [0] * HISTOGRAM_BINS
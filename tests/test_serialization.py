@@ -0,0 +1,45 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import json
+import uuid
+from datetime import datetime
+import serialization
+from serialization import FastJSONResponse
+
+
+def test_round_trip_matches_stdlib()-> None:
+    """Compact output decodes to the same value as the stdlib encoder would produce."""
+    value = {"id": "abc", "flagged": True, "scores": [0.1, 2.5e-07], "nested": {"text": "héllo"}}
+    encoded = serialization.dumps(value)
+
+    assert isinstance(encoded, bytes)
+    assert serialization.loads(encoded) == value
+    assert json.loads(serialization.dumps_str(value)) == value
+
+
+def test_serializes_datetime_and_uuid()-> None:
+    """Types previously converted by jsonable_encoder are serialized natively."""
+    text_id = uuid.uuid4()
+    created_at = datetime(2025, 1, 2, 3, 4, 5)
+    decoded = serialization.loads(serialization.dumps({"id": text_id, "created_at": created_at}))
+
+    assert decoded == {"id": str(text_id), "created_at": "2025-01-02T03:04:05"}
+
+
+def test_pretty_output_is_sorted_and_indented()-> None:
+    """Log lines stay human readable with stable key order."""
+    rendered = serialization.dumps_pretty({"b": 1, "a": 2})
+
+    assert rendered == '{\n  "a": 2,\n  "b": 1\n}'
+
+
+def test_fast_json_response_renders_body()-> None:
+    """The default response class renders through the shared layer."""
+    response = FastJSONResponse({"status": "Completed", "created_at": datetime(2025, 1, 1)})
+
+    assert response.body == b'{"status":"Completed","created_at":"2025-01-01T00:00:00"}'
+    assert response.headers["content-type"] == "application/json"
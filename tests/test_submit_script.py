@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import base64
+import fakeredis
+import pytest
+import serialization
+from bloom import BloomFilter
+from celery_worker import broker_message, queue_keys, TEXT_QUEUE
+from codec import encode_value, decode_value
+from idempotency import IdempotencyClaim, DuplicateSubmission
+from publisher import SubmitScriptPublisher, StatusRecord
+
+
+TEXT_TASK = "celery_worker.moderate_text_task"
+
+
+def test_broker_message_matches_the_redis_transport_format()-> None:
+    """Script-published messages decode like the ones apply_async sends, on the right priority list."""
+    key, raw = broker_message(TEXT_TASK, ["id-1", "hello"], {}, "task-1", TEXT_QUEUE, 3)
+    message = serialization.loads(raw)
+
+    assert key == queue_keys(TEXT_QUEUE)[3]
+    assert message["headers"]["task"] == TEXT_TASK and message["headers"]["id"] == "task-1"
+    assert message["properties"]["delivery_info"] == {"exchange": "", "routing_key": TEXT_QUEUE}
+    assert message["properties"]["priority"] == 3
+    assert serialization.loads(base64.b64decode(message["body"]))[0] == ["id-1", "hello"]
+
+
+@pytest.mark.asyncio
+async def test_submit_writes_status_message_and_bloom_bits_in_one_round_trip(redis_server, get_redis, text_task)-> None:
+    """The status record, the task message and the Bloom filter bits are written by one script call."""
+    known_ids = BloomFilter(key="bloom:test", capacity=1000)
+    redis_client = fakeredis.FakeAsyncRedis(server=redis_server)  # Binary, the status record is codec-encoded
+    await redis_client.setbit(known_ids.key, known_ids.size - 1, 0)
+
+    publisher = SubmitScriptPublisher(get_redis, known_ids=known_ids)
+    status = StatusRecord("status:id-1", encode_value({"status": "Processing", "celery_task_id": "task-1"}), 600)
+    task_id = await publisher.publish(text_task, ["id-1", "hello"], {"queue": TEXT_QUEUE, "priority": 0},
+                                      task_id="task-1", status=status, known_id="id-1")
+    await publisher.stop()
+
+    assert task_id == "task-1"
+    assert get_redis.opened == 1
+    assert decode_value(await redis_client.get("status:id-1"))["celery_task_id"] == "task-1"
+    assert 0 < await redis_client.ttl("status:id-1") <= 600
+    (raw,) = await redis_client.lrange(TEXT_QUEUE, 0, -1)
+    assert serialization.loads(raw)["headers"]["id"] == "task-1"
+    assert await known_ids.might_contain(redis_client, "id-1") is True
+    assert await known_ids.might_contain(redis_client, "id-2") is False
+
+
+@pytest.mark.asyncio
+async def test_duplicate_submission_writes_nothing(get_redis, redis_client, text_task)-> None:
+    """A claimed idempotency key short-circuits the script before the status or message is written."""
+
+    def claim(text_id):
+        return IdempotencyClaim("acme", "retry-key", "/api/v1/moderate/text", {"text": "hello"}, {"id": text_id})
+
+    publisher = SubmitScriptPublisher(get_redis)
+    options = {"queue": TEXT_QUEUE, "priority": 3}
+    await publisher.publish(text_task, ["id-1", "hello"], options, idempotency=claim("id-1"),
+                            status=StatusRecord("status:id-1", b"pending", 600))
+    with pytest.raises(DuplicateSubmission) as duplicate:
+        await publisher.publish(text_task, ["id-2", "hello"], options, idempotency=claim("id-2"),
+                                status=StatusRecord("status:id-2", b"pending", 600))
+    await publisher.stop()
+
+    assert duplicate.value.response == {"id": "id-1"}
+    assert not await redis_client.exists("status:id-2")
+    assert await redis_client.llen(queue_keys(TEXT_QUEUE)[3]) == 1
@@ -4,10 +4,12 @@ import os
 # Add the project root to sys.path
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch
-from tasks import moderate_text_task, moderate_image_task, retry_failed_moderation, push_to_dlq
-from celery_worker import celery
+from tasks import known_ids, moderate_text_task, moderate_image_task, retry_failed_moderation, push_to_dlq
+from celery_worker import celery, route_submission, TEXT_QUEUE, IMAGE_QUEUE, BULK_QUEUE, TASK_PRIORITIES
 
 # --- Test Celery Task: Text Moderation ---
 def test_moderate_text_task()-> None:
@@ -31,6 +33,33 @@ def test_moderate_image_task()-> None:
     assert "results" in result
 
 
+class FakeUpstream:
+    """Stands in For httpx.AsyncClient Talking to The Mock Moderation API."""
+    def __init__(self, *args, **kwargs): pass
+    async def __aenter__(self): return self
+    async def __aexit__(self, *args): return False
+
+    async def post(self, url, json):
+        class Response:
+            def json(self):
+                return {"id": "modr-1", "model": "omni-moderation-latest", "results": [{"flagged": False}]}
+        return Response()
+
+
+# --- Test Celery Task: Stored Results Are Added to The Bloom Filter ---
+def test_stored_result_is_added_to_bloom_filter(get_redis, sync_redis)-> None:
+    """An ID that dropped out of the filter while queued is known again once its result is stored."""
+    async def might_contain(item):
+        return await known_ids.might_contain(await get_redis(), item)
+
+    sync_redis.setbit(known_ids.key, known_ids.size - 1, 0)  # An empty, built filter
+    with patch("tasks.use_mock_server", True), patch("tasks.httpx.AsyncClient", FakeUpstream), \
+            patch("tasks.store_moderation_result", new=AsyncMock(return_value=None)), patch("tasks.get_binary_redis", get_redis):
+        moderate_text_task("queued-past-status-ttl", "This is a test.")
+
+    assert asyncio.run(might_contain("queued-past-status-ttl")) is True
+
+
 # --- Test Celery Task: Retry Failed Moderation ---
 def test_retry_failed_moderation()-> None:
     """Test Celery retry task for failed moderation tasks."""
@@ -94,3 +123,14 @@ async def test_push_to_dlq_handles_none()-> None:
         await push_to_dlq(None, None, None)  # Passing None values
         
         mock_redis.return_value.rpush.assert_called_once()
+
+def test_route_submission_lanes()-> None:
+    """Ensure submissions are routed to the lane and broker priority for their type."""
+    assert route_submission("text", "high") == {"queue": TEXT_QUEUE, "priority": TASK_PRIORITIES["high"]}
+    assert route_submission("image") == {"queue": IMAGE_QUEUE, "priority": TASK_PRIORITIES["normal"]}
+    assert route_submission("image", "low")["queue"] == BULK_QUEUE
+
+def test_route_submission_unknown_priority()-> None:
+    """Ensure unknown priorities are rejected instead of silently using the default lane."""
+    with pytest.raises(ValueError):
+        route_submission("text", "urgent")
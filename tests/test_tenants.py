@@ -0,0 +1,52 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
+
+import pytest
+import serialization
+from tenants import TenantRegistry, UnknownTenant, DEFAULT_TENANT, parse_tenants, tenant_queue_key
+from publisher import TenantQueuePublisher
+
+
+def test_registry_resolves_api_keys_and_default_tenant()-> None:
+    """Known keys map to their tenant; requests without a key fall back to the default tenant."""
+    registry = TenantRegistry(parse_tenants("acme=key-1:3; globex=key-2"))
+
+    assert registry.resolve("key-1").name == "acme"
+    assert registry.resolve("key-1").weight == 3.0
+    assert registry.resolve(None).name == DEFAULT_TENANT
+    with pytest.raises(UnknownTenant):
+        registry.resolve("wrong-key")
+
+
+def test_registry_can_require_api_key()-> None:
+    """With a required API key, anonymous submissions are refused and no default tenant is scheduled."""
+    registry = TenantRegistry(parse_tenants("acme=key-1"), require_api_key=True)
+
+    with pytest.raises(UnknownTenant):
+        registry.resolve(None)
+    assert [tenant.name for tenant in registry.all()] == ["acme"]
+
+
+@pytest.mark.parametrize("value", ["acme=key-1:0", "acme=key-1:-2", "acme=key-1:nan", "acme=key-1:heavy"])
+def test_non_positive_weights_are_rejected(value)-> None:
+    """A zero weight would never earn dispatch credit, so it is refused at configuration time."""
+    with pytest.raises(ValueError):
+        parse_tenants(value)
+
+
+@pytest.mark.asyncio
+async def test_tenant_publisher_appends_to_tenant_sub_queue(get_redis, redis_client, text_task)-> None:
+    """Submissions land in the tenant's sub-queue for their lane with a pre-generated task ID."""
+    publisher = TenantQueuePublisher(get_redis)
+    task_id = await publisher.publish(text_task, ["id-1", "text"], {"queue": "moderation.text", "priority": 3}, tenant="acme")
+    await publisher.stop()
+
+    (raw,) = await redis_client.lrange(tenant_queue_key("acme", "moderation.text"), 0, -1)
+    envelope = serialization.loads(raw)
+    assert envelope["task_id"] == task_id
+    assert envelope["task"] == text_task.name
+    assert envelope["args"] == ["id-1", "text"]
+    assert envelope["priority"] == 3